@@ -0,0 +1,95 @@
+'''Testes do cache em disco dos estágios (tjgo.cache):
+- Acerto e erro, o que entra na chave (entradas, carga, fontes, parâmetros), o fallback para
+pickle e o despejo LRU por tamanho.'''
+
+# --- BIBLIOTECAS NECESSÁRIAS ---
+import os
+
+import pandas as pd
+import pytest
+
+from tjgo.cache import CacheDisco, memorizar
+
+
+def _contador():
+    """calcular() que conta as chamadas."""
+    chamadas = []
+
+    def calcular():
+        chamadas.append(1)
+        return pd.DataFrame({'a': [1, 2, 3], 'b': ['x', 'y', 'z']})
+    return calcular, chamadas
+
+
+@pytest.fixture
+def entrada(tmp_path):
+    caminho = tmp_path / 'processos_2024.csv'
+    caminho.write_text('processo\n1\n')
+    return caminho
+
+
+def test_memorizar_sem_cache_so_calcula():
+    calcular, chamadas = _contador()
+    memorizar(None, 'estagio', calcular)
+    memorizar(None, 'estagio', calcular)
+    assert len(chamadas) == 2
+
+
+def test_segunda_leitura_vem_do_disco(tmp_path, entrada):
+    cache = CacheDisco(tmp_path / 'cache', entradas=[entrada])
+    calcular, chamadas = _contador()
+    primeira = memorizar(cache, 'estagio', calcular, parametros={'anos': [2022, 2024]})
+    segunda = memorizar(cache, 'estagio', calcular, parametros={'anos': [2022, 2024]})
+    assert len(chamadas) == 1
+    pd.testing.assert_frame_equal(primeira, segunda)
+
+
+def test_chave_muda_com_entradas_carga_fontes_e_parametros(tmp_path, entrada):
+    base = CacheDisco(tmp_path / 'cache', entradas=[entrada])
+    chave = base.chave('estagio', fontes=[_contador], parametros={'anos': [2022, 2024]})
+    assert chave == CacheDisco(tmp_path / 'cache', entradas=[entrada]).chave(
+        'estagio', fontes=[_contador], parametros={'anos': [2022, 2024]})
+
+    assert chave != base.chave('estagio', fontes=[_contador], parametros={'anos': [2023, 2024]})
+    assert chave != base.chave('estagio', fontes=[memorizar], parametros={'anos': [2022, 2024]})
+    deduplicado = CacheDisco(tmp_path / 'cache', entradas=[entrada], carga={'deduplicar': 'ultimo_arquivo'})
+    assert chave != deduplicado.chave('estagio', fontes=[_contador], parametros={'anos': [2022, 2024]})
+
+    # Arquivo de entrada alterado invalida todas as entradas
+    entrada.write_text('processo\n1\n2\n')
+    alterado = CacheDisco(tmp_path / 'cache', entradas=[entrada])
+    assert chave != alterado.chave('estagio', fontes=[_contador], parametros={'anos': [2022, 2024]})
+
+
+def test_tipos_mistos_usam_pickle_e_avisam_no_stderr(tmp_path, capsys):
+    pytest.importorskip('pyarrow')
+    cache = CacheDisco(tmp_path / 'cache')
+    misto = pd.DataFrame({'a': [1, 'x']})
+    resultado = cache.obter('misto', lambda: misto)
+
+    capturado = capsys.readouterr()
+    assert capturado.out == ''
+    assert 'usando pickle' in capturado.err
+    assert [nome.rsplit('.', 1)[1] for nome in os.listdir(tmp_path / 'cache')] == ['pkl']
+    pd.testing.assert_frame_equal(cache.ler(cache.chave('misto')), resultado)
+
+
+def test_despejo_remove_as_menos_usadas(tmp_path):
+    cache = CacheDisco(tmp_path / 'cache')
+    calcular = _contador()[0]
+    primeira, segunda = cache.chave('primeira'), cache.chave('segunda')
+    cache.gravar(primeira, calcular())
+    cache.gravar(segunda, calcular())
+    arquivos = {nome.split('-')[0]: tmp_path / 'cache' / nome for nome in os.listdir(tmp_path / 'cache')}
+    os.utime(arquivos['primeira'], ns=(1, 1))
+    os.utime(arquivos['segunda'], ns=(2, 2))
+
+    # Ler a primeira a renova: a segunda passa a ser a menos usada e sai quando a terceira entra
+    assert cache.ler(primeira) is not None
+    cache.limite_bytes = 2 * os.path.getsize(arquivos['primeira'])
+    cache.gravar(cache.chave('terceira'), calcular())
+    assert sorted(nome.split('-')[0] for nome in os.listdir(tmp_path / 'cache')) == ['primeira', 'terceira']
+
+    cache.limite_bytes = 0
+    cache.despejar()
+    assert os.listdir(tmp_path / 'cache') == []
@@ -0,0 +1,118 @@
+'''Testes do número único CNJ (tjgo.cnj):
+- Dígito verificador (mod 97) comparado ao cálculo direto com inteiros do Python, parser com e
+sem pontuação e a chave int64 (válidos, inválidos, nulos e ida e volta pelo empacotamento).'''
+
+# --- BIBLIOTECAS NECESSÁRIAS ---
+import numpy as np
+import pandas as pd
+import pytest
+
+from tjgo.cnj import (BITS_CHAVE, CHAVE_NULA, chave_processo, desempacotar, digito_verificador, empacotar,
+                      parsear_cnj, validar_cnj)
+
+# Número publicado (TJAL) e um do TJGO, ambos com DV conferido
+PUBLICADO = '0710802-55.2018.8.02.0001'
+TJGO = '0000001-34.2022.8.09.0051'
+
+
+def _dv_referencia(sequencial, ano, segmento, tribunal, origem):
+    """DV pela definição da Res. CNJ 65/2008, com o número inteiro (sem limite de 64 bits)."""
+    return 98 - int(f'{sequencial:07d}{ano:04d}{segmento:01d}{tribunal:02d}{origem:04d}00') % 97
+
+
+def _formatar(sequencial, ano, segmento, tribunal, origem):
+    dv = _dv_referencia(sequencial, ano, segmento, tribunal, origem)
+    return f'{sequencial:07d}-{dv:02d}.{ano:04d}.{segmento}.{tribunal:02d}.{origem:04d}'
+
+
+# --- DÍGITO VERIFICADOR ---
+def test_digito_verificador_igual_a_definicao():
+    rng = np.random.default_rng(0)
+    campos = {'sequencial': rng.integers(0, 10**7, 2000), 'ano': rng.integers(1900, 2100, 2000),
+              'segmento': rng.integers(1, 10, 2000), 'tribunal': rng.integers(0, 100, 2000),
+              'origem': rng.integers(0, 10**4, 2000)}
+    esperado = [_dv_referencia(*valores) for valores in zip(*campos.values())]
+    assert digito_verificador(**campos).tolist() == esperado
+    # Extremos: maior número possível e número nulo
+    assert digito_verificador(9999999, 9999, 9, 99, 9999) == _dv_referencia(9999999, 9999, 9, 99, 9999)
+    assert digito_verificador(0, 0, 0, 0, 0) == 98
+
+
+def test_validar_cnj_com_e_sem_pontuacao():
+    serie = pd.Series([PUBLICADO, PUBLICADO.replace('-', '').replace('.', ''), f' {TJGO} ',
+                       '0710802-56.2018.8.02.0001',  # DV errado
+                       '0710802-55/2018.8.02.0001',  # separador errado
+                       '07108025520188020001X', 'abc', None])
+    assert validar_cnj(serie).tolist() == [True, True, True, False, False, False, False, False]
+
+
+def test_parsear_cnj_campos():
+    campos = parsear_cnj(pd.Series([PUBLICADO, 'abc']))
+    assert campos.iloc[0][['sequencial', 'dv', 'ano', 'segmento', 'tribunal', 'origem']].tolist() == \
+        [710802, 55, 2018, 8, 2, 1]
+    assert campos.iloc[1]['sequencial'] == -1 and not campos.iloc[1]['formato_valido']
+
+
+# --- CHAVE ---
+def test_chave_mesma_para_grafias_do_mesmo_processo():
+    chaves = chave_processo(pd.Series([PUBLICADO, PUBLICADO.replace('-', '').replace('.', ''), TJGO]))
+    assert chaves[0] == chaves[1] >= 0
+    assert chaves[2] >= 0 and chaves[2] != chaves[0]
+
+
+def test_chave_de_invalidos_e_nulos():
+    serie = pd.Series(['abc', TJGO, 'xyz', None, 'abc', np.nan, '0000001-35.2022.8.09.0051'])
+    chaves = chave_processo(serie).tolist()
+    # Inválidos: -1, -2, ... por valor distinto, na ordem de aparição; nulos: CHAVE_NULA
+    assert chaves[0] == chaves[4] == -1
+    assert chaves[2] == -2
+    assert chaves[6] == -3  # DV errado também é inválido
+    assert chaves[3] == chaves[5] == CHAVE_NULA
+    assert chaves[1] >= 0
+
+
+def test_chave_categorica_igual_a_texto():
+    serie = pd.Series([TJGO, 'abc', None, PUBLICADO, TJGO])
+    pd.testing.assert_series_equal(chave_processo(serie.astype('category')), chave_processo(serie))
+
+
+def test_chave_ida_e_volta_e_unicidade():
+    rng = np.random.default_rng(1)
+    n = 5000
+    campos = {'sequencial': rng.integers(0, 10**7, n), 'ano': rng.integers(1900, 10**4, n),
+              'segmento': rng.integers(0, 10, n), 'tribunal': rng.integers(0, 100, n),
+              'origem': rng.integers(0, 10**4, n)}
+    # Extremos de cada campo
+    for campo, maximo in [('sequencial', 10**7 - 1), ('ano', 9999), ('segmento', 9), ('tribunal', 99),
+                          ('origem', 9999)]:
+        campos[campo][0] = maximo
+    chaves = empacotar(campos)
+    assert (chaves >= 0).all()
+
+    volta = desempacotar(chaves)
+    for campo in campos:
+        np.testing.assert_array_equal(volta[campo], campos[campo])
+    np.testing.assert_array_equal(volta['dv'], digito_verificador(**campos))
+
+    # Números distintos -> chaves distintas (e vice-versa), também a partir do texto
+    numeros = pd.Series([_formatar(*valores) for valores in zip(*campos.values())])
+    chaves_texto = chave_processo(numeros).to_numpy()
+    np.testing.assert_array_equal(chaves_texto, chaves)
+    assert len(np.unique(chaves_texto)) == numeros.nunique()
+
+
+def test_bits_da_chave_cabem_em_63():
+    assert sum(bits for _, bits in BITS_CHAVE) == 63
+    for campo, bits in BITS_CHAVE:
+        maximo = {'sequencial': 10**7, 'origem': 10**4, 'tribunal': 100, 'segmento': 10, 'ano': 10**4}[campo]
+        assert maximo <= 1 << bits, campo
+
+
+@pytest.mark.parametrize('tamanho_bloco', [1, 3])
+def test_parser_em_blocos(monkeypatch, tamanho_bloco):
+    import tjgo.cnj
+
+    serie = pd.Series([TJGO, 'abc', PUBLICADO, None, 'xyz', TJGO])
+    esperado = chave_processo(serie)
+    monkeypatch.setattr(tjgo.cnj, 'TAMANHO_BLOCO', tamanho_bloco)
+    pd.testing.assert_series_equal(chave_processo(serie), esperado)
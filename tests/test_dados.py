@@ -0,0 +1,77 @@
+'''Testes da carga de tjgo.dados:
+- Interpretação de --years e deduplicação de processos repetidos entre CSVs anuais (políticas
+e números nulos/inválidos).'''
+
+# --- BIBLIOTECAS NECESSÁRIAS ---
+import pandas as pd
+import pytest
+
+from tjgo.cnj import chave_processo
+from tjgo.dados import deduplicar_processos, parse_anos
+
+# Números CNJ válidos (DV conferido) e um fora do formato
+NUMERO_A = '0000001-34.2022.8.09.0051'
+NUMERO_B = '0000002-19.2022.8.09.0051'
+INVALIDO = '123'
+
+
+def _base(linhas):
+    """Quadro mínimo da deduplicação: (processo, ano_arquivo, data_distribuicao, sigilo) por linha."""
+    df = pd.DataFrame(linhas, columns=['processo', 'ano_arquivo', 'data_distribuicao', 'is_segredo_justica'])
+    df['data_distribuicao'] = pd.to_datetime(df['data_distribuicao'])
+    df['chave_processo'] = chave_processo(df['processo'])
+    return df
+
+
+# --- DEDUPLICAÇÃO ---
+def test_processo_repetido_fica_no_arquivo_da_politica():
+    df = _base([(NUMERO_A, 2022, '2022-03-01', False), (NUMERO_A, 2022, '2022-03-01', False),
+                (NUMERO_A, 2023, '2023-01-10', True), (NUMERO_B, 2023, '2023-05-05', False)])
+
+    ultimo, conflitos = deduplicar_processos(df, 'ultimo_arquivo')
+    assert ultimo['ano_arquivo'].tolist() == [2023, 2023]
+    assert conflitos[['processo', 'arquivos', 'arquivo_mantido', 'linhas_removidas']].values.tolist() == \
+        [[NUMERO_A, '2022;2023', 2023, 2]]
+    assert conflitos['conflito_data'].item() and conflitos['conflito_sigilo'].item()
+
+    # As duas linhas do mesmo arquivo (um registro por advogado) são preservadas
+    primeira, _ = deduplicar_processos(df, 'primeira_distribuicao')
+    assert primeira['ano_arquivo'].tolist() == [2022, 2022, 2023]
+
+
+def test_numeros_nulos_e_invalidos_nao_sao_deduplicados():
+    df = _base([(None, 2022, '2022-02-01', False), (None, 2022, '2022-02-02', True),
+                (None, 2023, '2023-02-01', False), (None, 2023, '2023-02-02', False),
+                (INVALIDO, 2022, '2022-04-01', False), (INVALIDO, 2023, '2023-04-01', False),
+                (NUMERO_A, 2022, '2022-03-01', False), (NUMERO_A, 2023, '2023-03-01', False)])
+
+    for politica in ('ultimo_arquivo', 'primeira_distribuicao'):
+        resultado, conflitos = deduplicar_processos(df, politica)
+        assert len(resultado) == len(df) - 1
+        assert conflitos['processo'].tolist() == [NUMERO_A]
+
+
+def test_sem_chave_usa_numero_nao_nulo():
+    df = _base([(None, 2022, '2022-02-01', False), (None, 2023, '2023-02-01', False),
+                (NUMERO_B, 2022, '2022-03-01', False), (NUMERO_B, 2023, '2023-03-01', False)])
+    resultado, conflitos = deduplicar_processos(df.drop(columns='chave_processo'))
+    assert resultado['processo'].isna().sum() == 2
+    assert conflitos['processo'].tolist() == [NUMERO_B]
+
+
+def test_politica_desconhecida():
+    with pytest.raises(ValueError):
+        deduplicar_processos(_base([(NUMERO_A, 2022, '2022-01-01', False)]), 'aleatoria')
+
+
+# --- ANOS ---
+def test_parse_anos_intervalos_e_listas():
+    assert parse_anos('2022-2024') == [2022, 2023, 2024]
+    assert parse_anos('2024, 2022,2022') == [2022, 2024]
+    assert parse_anos('2024') == [2024]
+
+
+@pytest.mark.parametrize('texto', ['2024', '2024,2024', '2024-2022', ','])
+def test_parse_anos_rejeita_periodo_sem_comparacao(texto):
+    with pytest.raises(ValueError):
+        parse_anos(texto, minimo=2)
@@ -0,0 +1,143 @@
+'''Testes do núcleo numérico de tjgo.estatisticas:
+- As versões vetorizadas (Fisher exato, qui-quadrado, Benjamini–Hochberg) são comparadas às
+referências do scipy; a priori beta-binomial por momentos e o bootstrap, a valores fixos.'''
+
+# --- BIBLIOTECAS NECESSÁRIAS ---
+import numpy as np
+import pandas as pd
+import pytest
+from scipy import stats
+
+from tjgo import estatisticas  # testes_2x2 pelo módulo: o nome 'test...' seria coletado pelo pytest
+from tjgo.estatisticas import (_fisher_exato_2x2, _qui_quadrado_2x2, ajustar_beta_binomial,
+                               benjamini_hochberg, bootstrap_metricas, encolher_proporcoes)
+
+# Tabelas 2x2 [[a, b], [c, d]]: pequenas, desbalanceadas, com zeros e com suporte largo
+TABELAS = np.array([
+    [3, 1, 1, 3], [8, 2, 1, 5], [0, 5, 4, 1], [1, 9, 11, 3], [12, 0, 3, 7],
+    [2, 2, 2, 2], [20, 15, 10, 25], [0, 1, 1, 0], [7, 30, 2, 44], [150, 120, 90, 160],
+])
+
+# Contagens (sigilosos, totais) de um nível de entidade, com volumes heterogêneos
+SIGILOSOS = np.array([2, 0, 15, 4, 40, 1, 9, 0, 30, 3])
+TOTAIS = np.array([10, 3, 50, 8, 100, 12, 20, 0, 60, 5])
+
+
+# --- TESTES 2x2 ---
+def test_fisher_exato_igual_ao_scipy():
+    a, b, c, d = TABELAS.T
+    esperado = [stats.fisher_exact([[ai, bi], [ci, di]])[1] for ai, bi, ci, di in TABELAS]
+    np.testing.assert_allclose(_fisher_exato_2x2(a, b, c, d), esperado, rtol=1e-9)
+
+
+def test_fisher_exato_independe_do_bloco():
+    a, b, c, d = TABELAS.T
+    np.testing.assert_allclose(_fisher_exato_2x2(a, b, c, d, tamanho_bloco=7),
+                               _fisher_exato_2x2(a, b, c, d), rtol=1e-12)
+
+
+def test_qui_quadrado_igual_ao_scipy():
+    # Só tabelas sem margem nula (chi2_contingency exige frequências esperadas positivas)
+    tabelas = TABELAS[(TABELAS[:, :2].sum(1) > 0) & (TABELAS[:, 2:].sum(1) > 0)
+                      & (TABELAS[:, [0, 2]].sum(1) > 0) & (TABELAS[:, [1, 3]].sum(1) > 0)]
+    a, b, c, d = tabelas.astype(float).T
+    esperado = [stats.chi2_contingency([[ai, bi], [ci, di]])[1] for ai, bi, ci, di in tabelas]
+    np.testing.assert_allclose(_qui_quadrado_2x2(a, b, c, d), esperado, rtol=1e-9)
+
+
+def test_testes_2x2_casos_degenerados():
+    p, exato = estatisticas.testes_2x2([0, 3, 5], [0, 0, 5], [4, 2, 5], [6, 0, 5])
+    assert np.isnan(p[0])  # linha vazia
+    assert p[1] == 1.0  # coluna vazia
+    assert exato.tolist() == [False, False, False]
+    np.testing.assert_allclose(p[2], stats.chi2_contingency([[5, 5], [5, 5]])[1])
+
+
+# --- BENJAMINI–HOCHBERG ---
+def test_benjamini_hochberg_igual_ao_scipy():
+    p = np.random.default_rng(0).uniform(size=200) ** 3
+    np.testing.assert_allclose(benjamini_hochberg(p), stats.false_discovery_control(p), rtol=1e-12)
+
+
+def test_benjamini_hochberg_ignora_nan_e_mantem_formato():
+    p = np.array([[0.01, np.nan, 0.04], [0.03, 0.2, np.nan]])
+    ajustado = benjamini_hochberg(p)
+    assert ajustado.shape == p.shape
+    assert np.isnan(ajustado[np.isnan(p)]).all()
+    validos = ~np.isnan(p)
+    np.testing.assert_allclose(ajustado[validos], stats.false_discovery_control(p[validos]), rtol=1e-12)
+
+
+# --- ENCOLHIMENTO BETA-BINOMIAL ---
+def test_priori_momentos_em_tabela_fixa():
+    alfa, beta = ajustar_beta_binomial(SIGILOSOS, TOTAIS)
+
+    # Estimador de momentos ponderado, escrito por extenso (entidades com total zero fora)
+    k, n = SIGILOSOS[TOTAIS > 0].astype(float), TOTAIS[TOTAIS > 0].astype(float)
+    N, m = n.sum(), len(n)
+    mu = k.sum() / N
+    S = sum(ni * (ki / ni - mu) ** 2 for ki, ni in zip(k, n))
+    rho = (S / (mu * (1 - mu)) - (m - 1)) / (N - m + 1 - (n ** 2).sum() / N)
+    assert alfa == pytest.approx(mu * (1 - rho) / rho, rel=1e-12)
+    assert beta == pytest.approx((1 - mu) * (1 - rho) / rho, rel=1e-12)
+    assert (alfa, beta) == pytest.approx((11.144755, 17.574421), rel=1e-6)
+
+
+def test_priori_sem_variacao_e_fraca():
+    assert ajustar_beta_binomial([0, 0], [5, 7]) == pytest.approx((2 * 0.5 / 12, 2 * (1 - 0.5 / 12)))
+    assert ajustar_beta_binomial([], []) == (1.0, 1.0)
+
+
+def test_encolher_proporcoes_usa_posteriori_beta():
+    eb = encolher_proporcoes(SIGILOSOS, TOTAIS)
+    alfa, beta = eb.attrs['alfa_priori'], eb.attrs['beta_priori']
+    assert (alfa, beta) == pytest.approx(ajustar_beta_binomial(SIGILOSOS, TOTAIS))
+
+    a_post, b_post = alfa + SIGILOSOS, beta + TOTAIS - SIGILOSOS
+    np.testing.assert_allclose(eb['proporcao_eb'], 100 * a_post / (a_post + b_post))
+    np.testing.assert_allclose(eb['ic_inf_eb'], 100 * stats.beta.ppf(0.025, a_post, b_post))
+    np.testing.assert_allclose(eb['ic_sup_eb'], 100 * stats.beta.ppf(0.975, a_post, b_post))
+    # Entidade sem processos fica na média da priori
+    assert eb['proporcao_eb'].iloc[7] == pytest.approx(100 * alfa / (alfa + beta))
+    assert eb['peso_dados'].iloc[7] == 0
+
+
+# --- BOOTSTRAP ---
+@pytest.fixture
+def base_bootstrap():
+    rng = np.random.default_rng(1)
+    n = 600
+    return pd.DataFrame({
+        'comarca': rng.choice(['A', 'B', 'C'], size=n),
+        'processo': np.arange(n).astype(str),
+        'ano_distribuicao': rng.choice([2022, 2023, 2024], size=n),
+        'is_segredo_justica': rng.random(n) < 0.3,
+    })
+
+
+@pytest.mark.parametrize('metodo', ['poisson', 'multinomial'])
+def test_bootstrap_reprodutivel_e_ordenado(base_bootstrap, metodo):
+    anos = [2022, 2023, 2024]
+    ics = bootstrap_metricas(base_bootstrap, 'comarca', anos, n_replicas=200, metodo=metodo)
+    assert ics['comarca'].tolist() == ['A', 'B', 'C']
+    for m in ['variacao_total_sigilosos', 'crescimento_percentual_volume', 'cagr_volume']:
+        assert (ics[f'{m}_ic_inf'] <= ics[f'{m}_ic_sup']).all()
+
+    # Mesma semente, mesmo resultado
+    pd.testing.assert_frame_equal(ics, bootstrap_metricas(base_bootstrap, 'comarca', anos,
+                                                          n_replicas=200, metodo=metodo))
+
+
+def test_bootstrap_ic_contem_estimativa(base_bootstrap):
+    anos = [2022, 2024]
+    ics = bootstrap_metricas(base_bootstrap, 'comarca', anos, n_replicas=500).set_index('comarca')
+    base = base_bootstrap[base_bootstrap['ano_distribuicao'].isin(anos)]
+    prop = base.groupby(['comarca', 'ano_distribuicao'])['is_segredo_justica'].mean().unstack() * 100
+    variacao = prop[2024] - prop[2022]
+    assert (ics['variacao_total_sigilosos_ic_inf'] <= variacao).all()
+    assert (variacao <= ics['variacao_total_sigilosos_ic_sup']).all()
+
+
+def test_bootstrap_metodo_desconhecido(base_bootstrap):
+    with pytest.raises(ValueError):
+        bootstrap_metricas(base_bootstrap, 'comarca', [2022, 2024], metodo='jackknife')
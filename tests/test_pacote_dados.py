@@ -0,0 +1,73 @@
+'''Testes do pacote colunar de tjgo.pacote_dados:
+- Vetores das figuras (inclusive os que o plotly entrega em base64) viram referências a colunas
+únicas por conteúdo; datas ficam para o PlotlyJSONEncoder.'''
+
+# --- BIBLIOTECAS NECESSÁRIAS ---
+import numpy as np
+import pandas as pd
+import plotly.graph_objects as go
+
+from tjgo.pacote_dados import PacoteColunas, compactar_numeros, decodificar_vetor_tipado, pagina_html
+
+N = 500
+
+
+def _figura(x, y):
+    return go.Figure(go.Scatter(x=x, y=y, mode='markers', customdata=np.column_stack([x, y]),
+                                hovertext=[f'entidade {i}' for i in range(len(x))]))
+
+
+# --- CODIFICAÇÃO ---
+def test_compactar_numeros_menor_tipo_sem_perda():
+    assert compactar_numeros(np.array([0, 200])).dtype == np.uint8
+    assert compactar_numeros(np.array([-1.0, 300.0])).dtype == np.int16
+    assert compactar_numeros(np.array([0.5, 1.0])).dtype == np.float64
+    assert compactar_numeros(np.array([True, False])).dtype == np.uint8
+
+
+def test_decodificar_vetor_tipado_do_plotly():
+    x = np.linspace(0, 1, N)
+    dados = _figura(x, np.arange(N)).to_plotly_json()['data'][0]
+    np.testing.assert_array_equal(decodificar_vetor_tipado(dados['x']), x)
+    np.testing.assert_array_equal(decodificar_vetor_tipado(dados['y']), np.arange(N))
+    np.testing.assert_array_equal(decodificar_vetor_tipado(dados['customdata']),
+                                  np.column_stack([x, np.arange(N)]))
+
+
+# --- DEDUPLICAÇÃO ---
+def test_vetores_numericos_viram_referencias():
+    x = np.random.default_rng(0).normal(size=N)
+    pacote = PacoteColunas()
+    dados = pacote.substituir(_figura(x, x * 2).to_plotly_json())['data'][0]
+    assert dados['x'] == {'$col': 0} and dados['y'] == {'$col': 1}
+    # customdata repete x e y: as mesmas colunas
+    assert dados['customdata'] == {'$linhas': [{'$col': 0}, {'$col': 1}]}
+    assert 'hovertext' in dados and len(pacote.colunas) == 3
+
+
+def test_figuras_com_mesmos_vetores_compartilham_colunas():
+    rng = np.random.default_rng(1)
+    x, y = rng.normal(size=N), rng.normal(size=N)
+    uma, duas = PacoteColunas(), PacoteColunas()
+    uma.substituir(_figura(x, y).to_plotly_json())
+    for _ in range(2):
+        duas.substituir(_figura(x, y).to_plotly_json())
+    assert len(duas.colunas) == len(uma.colunas) == 3
+    assert duas.serializar() == uma.serializar()
+
+
+def test_pagina_com_figuras_repetidas_nao_repete_dados():
+    rng = np.random.default_rng(2)
+    x, y = rng.normal(size=5000), rng.normal(size=5000)
+    uma = pagina_html({'a': _figura(x, y)}, 't')
+    duas = pagina_html({'a': _figura(x, y), 'b': _figura(x, y)}, 't')
+    # Só a segunda especificação (layout, modelo de cores) se soma: os vetores vão uma vez
+    assert len(duas) - len(uma) < 0.1 * len(uma)
+
+
+def test_vetores_curtos_e_datas_ficam_na_figura():
+    pacote = PacoteColunas()
+    datas = pd.date_range('2024-01-01', periods=N).to_numpy()
+    assert pacote.substituir(np.arange(3)) == [0, 1, 2]
+    assert pacote.substituir(datas) is datas
+    assert pacote.colunas == []
@@ -0,0 +1,83 @@
+'''Testes da rede de coatuação (tjgo.rede):
+- Incidência a partir de campos com várias OABs, pesos das arestas comparados à contagem direta
+dos pares de cada processo, PageRank e componentes conexas.'''
+
+# --- BIBLIOTECAS NECESSÁRIAS ---
+from itertools import combinations
+
+import numpy as np
+import pandas as pd
+import pytest
+
+from tjgo.rede import construir_rede, incidencia, pagerank
+
+ANOS = [2022, 2024]
+
+
+@pytest.fixture
+def base():
+    """Processos com um ou vários advogados (';'), OAB inválida e o mesmo advogado repetido."""
+    return pd.DataFrame({
+        'processo': ['1', '1', '2', '3', '4', '5', '6'],
+        'oab': ['100A GO; 200A GO', '300A GO', '100A GO;200A GO; XX', '100A GO; 100A GO',
+                '400A DF;500A DF', '200A GO; 300A GO', '600A GO;700A GO'],
+        'ano_distribuicao': [2022, 2022, 2024, 2022, 2024, 2024, 2023],
+        'is_segredo_justica': [False, True, False, True, True, False, True],
+    })
+
+
+def _pares_por_contagem(df, sigilosos=False, ano=None):
+    """Processos em comum por par de advogados, processo a processo (referência)."""
+    oabs = df.assign(oab=df['oab'].str.split(';')).explode('oab')
+    oabs['oab'] = oabs['oab'].str.strip()
+    oabs = oabs[oabs['oab'].str.match(r'^\d+A (GO|DF)$') & oabs['ano_distribuicao'].isin(ANOS)]
+    contagem = {}
+    for _, processo in oabs.groupby('processo'):
+        if sigilosos and not processo['is_segredo_justica'].any():
+            continue
+        if ano is not None and processo['ano_distribuicao'].min() != ano:
+            continue
+        for par in combinations(sorted(processo['oab'].unique()), 2):
+            contagem[par] = contagem.get(par, 0) + 1
+    return contagem
+
+
+# --- INCIDÊNCIA ---
+def test_incidencia_separa_e_valida_cada_oab(base):
+    matriz, oabs, processos = incidencia(base, ANOS)
+    # O processo 6 (2023) fica fora do período; XX não é OAB válida
+    assert oabs.tolist() == ['100A GO', '200A GO', '300A GO', '400A DF', '500A DF']
+    assert matriz.shape == (5, 5) and set(matriz.data) == {1.0}
+    assert matriz.sum(axis=1).A1.tolist() == [3, 2, 1, 2, 2]  # 100A GO repetido no processo 3 conta uma vez
+    assert processos['is_segredo_justica'].tolist() == [True, False, True, True, False]
+
+
+# --- ARESTAS E MÉTRICAS ---
+def test_arestas_iguais_a_contagem_direta(base):
+    arestas, advogados, componentes = construir_rede(base, ANOS)
+    pesos = {(a, b): linha for a, b, linha in zip(arestas['oab_a'], arestas['oab_b'],
+                                                    arestas.to_dict('records'))}
+    assert {par: linha['processos'] for par, linha in pesos.items()} == _pares_por_contagem(base)
+    assert {par: linha['sigilosos'] for par, linha in pesos.items() if linha['sigilosos']} == \
+        _pares_por_contagem(base, sigilosos=True)
+    for ano in ANOS:
+        assert {par: linha[f'processos_{ano}'] for par, linha in pesos.items() if linha[f'processos_{ano}']} == \
+            _pares_por_contagem(base, ano=ano)
+
+    por_oab = advogados.set_index('oab')
+    assert por_oab.loc['100A GO', ['grau', 'forca', 'processos']].tolist() == [2, 3, 3]
+    assert por_oab['tamanho_componente'].tolist() == [3, 3, 3, 2, 2]
+    assert componentes['advogados'].tolist() == [3, 2]
+
+
+def test_pagerank_soma_um_e_simetria():
+    from scipy import sparse
+
+    # Estrela: o centro tem o maior PageRank e as pontas, valores iguais; nó 4 isolado
+    adjacencia = sparse.csr_matrix(np.array([[0, 1, 1, 1, 0], [1, 0, 0, 0, 0], [1, 0, 0, 0, 0],
+                                             [1, 0, 0, 0, 0], [0, 0, 0, 0, 0]], dtype=float))
+    rank = pagerank(adjacencia)
+    assert rank.sum() == pytest.approx(1.0)
+    assert rank[0] == rank.max()
+    np.testing.assert_allclose(rank[1:4], rank[1])
+    assert pagerank(sparse.csr_matrix((0, 0))).size == 0
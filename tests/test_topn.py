@@ -0,0 +1,73 @@
+'''Testes da seleção top-N (tjgo.topn):
+- indices_top igual à ordenação completa, e a linha "Outros" recontada a partir dos processos
+distintos das entidades restantes (não a soma das linhas).'''
+
+# --- BIBLIOTECAS NECESSÁRIAS ---
+import numpy as np
+import pandas as pd
+import pytest
+
+from tjgo.agregacao import montar_tabela_final, montar_tabela_proporcoes
+from tjgo.topn import indices_top, top_n_com_outros
+
+ANOS = [2022, 2024]
+
+
+@pytest.fixture
+def base():
+    """Serventias com um processo (3) compartilhado por B e C."""
+    return pd.DataFrame({
+        'serventia': ['A', 'A', 'B', 'C', 'C', 'D'],
+        'processo': ['1', '2', '3', '4', '3', '5'],
+        'ano_distribuicao': [2022, 2024, 2022, 2024, 2022, 2024],
+        'is_segredo_justica': [True, False, False, True, False, True],
+    })
+
+
+def _proporcoes(df):
+    return montar_tabela_proporcoes(montar_tabela_final(df, ['serventia'], ANOS), ['serventia'], ANOS)
+
+
+# --- SELEÇÃO ---
+@pytest.mark.parametrize('maiores', [True, False])
+def test_indices_top_igual_a_ordenacao_completa(maiores):
+    valores = np.random.default_rng(0).integers(0, 50, 1000).astype(float)
+    valores[::97] = np.nan
+    ordem = np.argsort(np.where(np.isnan(valores), np.inf, -valores if maiores else valores), kind='stable')
+    for n in (1, 10, 999, 1000, 2000):
+        top = indices_top(valores, n, maiores)
+        assert len(top) == min(n, len(valores))
+        # Mesmos valores na mesma ordem (empates podem trocar de posição entre si)
+        np.testing.assert_array_equal(valores[top], valores[ordem[:len(top)]])
+
+
+def test_indices_top_nan_por_ultimo():
+    assert indices_top([np.nan, 1.0, 3.0, 2.0], 4).tolist() == [2, 3, 1, 0]
+    assert indices_top([np.nan, 1.0, 3.0, 2.0], 4, maiores=False).tolist() == [1, 3, 2, 0]
+
+
+# --- LINHA "OUTROS" ---
+def test_outros_reconta_processos_distintos(base):
+    tabela, k = top_n_com_outros(_proporcoes(base), base, ['serventia'], ANOS, n=1)
+    assert k == 3
+    assert tabela['serventia'].tolist() == ['A', 'Outros (3)']
+
+    outros = tabela.iloc[-1]
+    # B, C e D somam 4 linhas, mas o processo 3 é o mesmo: 3 processos distintos
+    assert outros['total_processos'] == 3
+    assert (outros['total_2022'], outros['total_2024']) == (1, 2)
+    assert (outros['sigilosos_2022'], outros['sigilosos_2024']) == (0, 2)
+    assert outros['variacao_total_sigilosos'] == pytest.approx(100.0)
+
+
+def test_sem_corte_tabela_inteira(base):
+    proporcoes = _proporcoes(base)
+    tabela, k = top_n_com_outros(proporcoes, base, ['serventia'], ANOS, n=len(proporcoes))
+    assert k == 0
+    assert tabela is proporcoes
+
+
+def test_outros_com_bootstrap_tem_ics(base):
+    tabela, _ = top_n_com_outros(_proporcoes(base), base, ['serventia'], ANOS, n=1, bootstrap=50)
+    ics = [c for c in tabela.columns if c.endswith(('_ic_inf', '_ic_sup'))]
+    assert ics and tabela.iloc[-1][ics].notna().all()
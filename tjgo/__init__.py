@@ -0,0 +1,6 @@
+'''Análises de processos judiciais sigilosos do TJGO.
+- Pacote importável: nenhum módulo executa análises ou importa bibliotecas pesadas (plotly,
+scipy, statsmodels, matplotlib) ao ser importado. Use a linha de comando `tjgo` ou
+tjgo.cli.executar_analise.'''
+
+__version__ = '0.1.0'
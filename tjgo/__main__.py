@@ -0,0 +1,5 @@
+import sys
+
+from tjgo.cli import main
+
+sys.exit(main())
@@ -0,0 +1,229 @@
+'''Agregações Compartilhadas:
+- Contagem de processos únicos sigilosos/não sigilosos por entidade e ano, e montagem das
+tabelas de proporções (variação total, médias e totais) usadas pelas análises.'''
+
+# --- BIBLIOTECAS NECESSÁRIAS ---
+import numpy as np
+import pandas as pd
+
+from tjgo.cache import memorizar
+from tjgo.cnj import coluna_processo
+from tjgo.dados import ETAPAS_CARGA
+from tjgo.instrumentacao import etapa
+
+
+def base_entidades(df, chaves):
+    """Recorte de df com as chaves da entidade preenchidas e ano de distribuição válido."""
+    mascara = np.ones(len(df), dtype=bool)
+    for chave in chaves:
+        mascara &= df[chave].ne('').to_numpy()
+    return (df.loc[mascara, list(chaves) + [coluna_processo(df), 'ano_distribuicao', 'is_segredo_justica']]
+              .dropna(subset=['ano_distribuicao'])
+              .copy())
+
+
+def _indice_vazio(chaves):
+    if len(chaves) == 1:
+        return pd.Index([], name=chaves[0])
+    return pd.MultiIndex.from_arrays([[]] * len(chaves), names=chaves)
+
+
+# Processar dados por ano
+def processar_dados(df_base, ano, chaves):
+    """Contagem de processos únicos por entidade (chaves) e tipo, com proporções, para um ano."""
+    chaves = list(chaves)
+    processo = coluna_processo(df_base)
+    cols_need = chaves + [processo, 'is_segredo_justica', 'ano_distribuicao']
+    missing = [c for c in cols_need if c not in df_base.columns]
+    if missing:
+        raise KeyError(f"Colunas ausentes em df_base: {missing}")
+
+    df_ano = df_base.loc[df_base['ano_distribuicao'] == ano,
+                         chaves + [processo, 'is_segredo_justica']].copy()
+
+    if df_ano.empty:
+        # retorna DF vazio com o mesmo índice para não quebrar concat
+        out = pd.DataFrame(index=_indice_vazio(chaves))
+        out[f'sigilosos_{ano}'] = []
+        out[f'nao_sigilosos_{ano}'] = []
+        out[f'total_{ano}'] = []
+        out[f'proporcao_sigilosos_{ano}'] = []
+        out[f'proporcao_nao_sigilosos_{ano}'] = []
+        return out
+
+    # Define tipo (sigiloso / nao_sigiloso) e evita dupla contagem do mesmo processo/tipo
+    df_ano['tipo'] = np.where(df_ano['is_segredo_justica'], 'sigilosos', 'nao_sigilosos')
+    df_ano = df_ano.drop_duplicates(subset=chaves + [processo, 'tipo'])
+
+    # Conta processos únicos por (entidade, tipo)
+    grp = (df_ano
+           .groupby(chaves + ['tipo'], as_index=False, observed=True)[processo]
+           .nunique())
+
+    # Pivot para colunas 'sigilosos' e 'nao_sigilosos'
+    pv = grp.pivot_table(index=chaves,
+                         columns='tipo',
+                         values=processo,
+                         aggfunc='sum',
+                         fill_value=0,
+                         observed=True)
+
+    # Monta saída com sufixos do ano
+    out = pd.DataFrame(index=pv.index)
+    out[f'sigilosos_{ano}'] = pv['sigilosos'] if 'sigilosos' in pv.columns else pd.Series(0, index=pv.index)
+    out[f'nao_sigilosos_{ano}'] = pv['nao_sigilosos'] if 'nao_sigilosos' in pv.columns else pd.Series(0, index=pv.index)
+    out[f'total_{ano}'] = out[f'sigilosos_{ano}'] + out[f'nao_sigilosos_{ano}']
+
+    denom = out[f'total_{ano}'].replace(0, np.nan)
+    out[f'proporcao_sigilosos_{ano}'] = ((out[f'sigilosos_{ano}'] / denom) * 100).fillna(0.0).round(4)
+    out[f'proporcao_nao_sigilosos_{ano}'] = ((out[f'nao_sigilosos_{ano}'] / denom) * 100).fillna(0.0).round(4)
+
+    return out
+
+
+def montar_tabela_final(df_base, chaves, anos):
+    """Concatena processar_dados de cada ano, com contagens inteiras."""
+    tabela_final = pd.concat([processar_dados(df_base, ano, chaves) for ano in anos], axis=1).fillna(0)
+    tabela_final = tabela_final.reset_index()
+    # Chaves categóricas (modo de economia) voltam a texto: a tabela é pequena e vai para exibição
+    for chave in chaves:
+        if isinstance(tabela_final[chave].dtype, pd.CategoricalDtype):
+            tabela_final[chave] = tabela_final[chave].astype(object)
+
+    # Formatar valores inteiros para exibição
+    for ano in anos:
+        for col in [f'sigilosos_{ano}', f'nao_sigilosos_{ano}', f'total_{ano}']:
+            tabela_final[col] = tabela_final[col].astype(int)
+    return tabela_final
+
+
+# --- TABELA DE PROPORÇÕES COM VARIAÇÃO TOTAL E MÉDIA ---
+def montar_tabela_proporcoes(tabela_final, chaves, anos):
+    """Adiciona variação total, proporções médias e totais do período à tabela final."""
+    anos = list(anos)
+    tabela_proporcoes = tabela_final[list(chaves) +
+                            [f'sigilosos_{ano}' for ano in anos] +
+                            [f'nao_sigilosos_{ano}' for ano in anos] +
+                            [f'total_{ano}' for ano in anos] +
+                            [f'proporcao_sigilosos_{ano}' for ano in anos] +
+                            [f'proporcao_nao_sigilosos_{ano}' for ano in anos]].copy()
+
+    for ano in anos:
+        tabela_proporcoes[f'proporcao_sigilosos_{ano}'] = tabela_proporcoes[f'proporcao_sigilosos_{ano}'].astype(float)
+        tabela_proporcoes[f'proporcao_nao_sigilosos_{ano}'] = tabela_proporcoes[f'proporcao_nao_sigilosos_{ano}'].astype(float)
+
+    # Variação total (soma das variações anuais = último ano - primeiro ano)
+    tabela_proporcoes['variacao_total_sigilosos'] = (
+        tabela_proporcoes[f'proporcao_sigilosos_{anos[-1]}'] - tabela_proporcoes[f'proporcao_sigilosos_{anos[0]}']
+    )
+    tabela_proporcoes['variacao_total_nao_sigilosos'] = (
+        tabela_proporcoes[f'proporcao_nao_sigilosos_{anos[-1]}'] - tabela_proporcoes[f'proporcao_nao_sigilosos_{anos[0]}']
+    )
+
+    # Proporções médias do período
+    tabela_proporcoes['proporcao_media_sigilosos'] = tabela_proporcoes[
+        [f'proporcao_sigilosos_{ano}' for ano in anos]
+    ].mean(axis=1)
+    tabela_proporcoes['proporcao_media_nao_sigilosos'] = tabela_proporcoes[
+        [f'proporcao_nao_sigilosos_{ano}' for ano in anos]
+    ].mean(axis=1)
+
+    # Totais do período
+    tabela_proporcoes['total_sigilosos'] = tabela_proporcoes[[f'sigilosos_{ano}' for ano in anos]].sum(axis=1)
+    tabela_proporcoes['total_nao_sigilosos'] = tabela_proporcoes[[f'nao_sigilosos_{ano}' for ano in anos]].sum(axis=1)
+    tabela_proporcoes['total_processos'] = (
+        tabela_proporcoes['total_sigilosos'] +
+        tabela_proporcoes['total_nao_sigilosos']
+    )
+    return tabela_proporcoes
+
+
+# --- FORMATAÇÃO (PADRÃO BRASILEIRO) ---
+def fmt_pct(x):
+    return f"{x:.2f}%".replace('.', ',')
+
+
+def fmt_pct_sinal(x):
+    return f"{x:+.2f}%".replace('.', ',')
+
+
+def fmt_int(x):
+    # separador de milhar estilo pt-BR
+    return f"{x:,}".replace(",", ".")
+
+
+def formatar_tabela_proporcoes(tabela_proporcoes, anos):
+    """Cópia da tabela de proporções com percentuais formatados para exibição."""
+    tabela_formatada = tabela_proporcoes.fillna(0).copy()
+    colunas_pct = ([f'proporcao_sigilosos_{ano}' for ano in anos] +
+                   [f'proporcao_nao_sigilosos_{ano}' for ano in anos] +
+                   ['proporcao_media_sigilosos', 'proporcao_media_nao_sigilosos'])
+    for col in colunas_pct:
+        tabela_formatada[col] = tabela_formatada[col].apply(fmt_pct)
+    for col in ['variacao_total_sigilosos', 'variacao_total_nao_sigilosos']:
+        tabela_formatada[col] = tabela_formatada[col].apply(fmt_pct_sinal)
+    return tabela_formatada
+
+
+# Código que define tabela_final (chave do cache)
+FONTES_CONTAGENS = ETAPAS_CARGA + (base_entidades, processar_dados, montar_tabela_final)
+
+
+def contagens_anuais(df, chaves, anos, cache=None, economizar=False):
+    """
+    Recorte por entidade e contagens anuais: (df_base, tabela_final).
+    Com cache (tjgo.cache.CacheDisco), df deve ser o quadro tratado completo das entradas do cache.
+    economizar: contagens da tabela_final no menor tipo inteiro que as comporta.
+    """
+    from tjgo.memoria import reduzir_inteiros
+
+    chaves, anos = list(chaves), list(anos)
+    with etapa(f"tabela_final[{','.join(chaves)}]", df) as e:
+        df_base = base_entidades(df, chaves)
+        tabela_final = e.saida(memorizar(
+            cache, 'tabela_final', lambda: montar_tabela_final(df_base, chaves, anos),
+            parametros={'chaves': chaves, 'anos': anos},
+            fontes=FONTES_CONTAGENS,
+        ))
+    if economizar:
+        tabela_final = reduzir_inteiros(tabela_final)
+    return df_base, tabela_final
+
+
+def _tabela_proporcoes(df_base, tabela_final, chaves, anos, bootstrap):
+    tabela_proporcoes = montar_tabela_proporcoes(tabela_final, chaves, anos)
+
+    # Intervalos de confiança bootstrap (reamostragem de processos dentro de cada entidade)
+    if bootstrap:
+        from tjgo.estatisticas import bootstrap_metricas
+        ics_bootstrap = bootstrap_metricas(df_base, chaves, anos=anos, n_replicas=bootstrap)
+        tabela_proporcoes = tabela_proporcoes.merge(ics_bootstrap, on=chaves, how='left')
+    return tabela_proporcoes
+
+
+def analisar_proporcoes(df, chaves, anos, bootstrap=0, contagens=None, cache=None):
+    """
+    Fluxo comum das análises por entidade: recorte, contagem anual e tabela de proporções.
+    bootstrap > 0 anexa ICs bootstrap (com esse número de réplicas) à tabela de proporções.
+    contagens: resultado já calculado de contagens_anuais(df, chaves, anos) (pipeline).
+    cache: tjgo.cache.CacheDisco para tabela_final e tabela_proporcoes (opcional).
+    Retorna (df_base, tabela_final, tabela_proporcoes).
+    """
+    chaves, anos = list(chaves), list(anos)
+    if contagens is None:
+        contagens = contagens_anuais(df, chaves, anos, cache=cache)
+    df_base, tabela_final = contagens
+
+    fontes = FONTES_CONTAGENS + (montar_tabela_proporcoes, _tabela_proporcoes)
+    if bootstrap:
+        from tjgo import estatisticas
+        fontes += (estatisticas.bootstrap_metricas, estatisticas._metricas_bootstrap,
+                   estatisticas.calcular_crescimento)
+    with etapa(f"tabela_proporcoes[{','.join(chaves)}]", tabela_final) as e:
+        tabela_proporcoes = e.saida(memorizar(
+            cache, 'tabela_proporcoes',
+            lambda: _tabela_proporcoes(df_base, tabela_final, chaves, anos, bootstrap),
+            parametros={'chaves': chaves, 'anos': anos, 'bootstrap': bootstrap},
+            fontes=fontes,
+        ))
+    return df_base, tabela_final, tabela_proporcoes
@@ -0,0 +1,27 @@
+'''Análises disponíveis na linha de comando.
+- Cada módulo expõe executar(df, anos, ...) e devolve {'tabelas': {...}, 'figuras': {...}}.
+Os módulos são importados apenas quando a análise é executada.'''
+
+import importlib
+
+ANALISES = {
+    'analise1': 'tjgo.analises.analise1',
+    'analise2': 'tjgo.analises.analise2',
+    'analise3': 'tjgo.analises.analise3',
+    'analise4': 'tjgo.analises.analise4',
+    'analise5': 'tjgo.analises.analise5',
+    'analise6': 'tjgo.analises.analise6',
+    'teste_analise2': 'tjgo.analises.teste_analise2',
+    'melhorias': 'tjgo.analises.melhorias',
+    'ml_regressao': 'tjgo.analises.ml_regressao',
+    'hierarquia': 'tjgo.analises.hierarquia',
+    'rede': 'tjgo.analises.rede',
+    'clusters': 'tjgo.analises.clusters',
+}
+
+
+def carregar_analise(nome):
+    """Importa o módulo da análise pelo nome usado na linha de comando."""
+    if nome not in ANALISES:
+        raise KeyError(f"Análise desconhecida: {nome}. Opções: {', '.join(ANALISES)}")
+    return importlib.import_module(ANALISES[nome])
@@ -0,0 +1,123 @@
+'''
+Análise de Processos Judiciais Sigilosos e Não Sigilosos:
+- Este script analisa dados de processos judiciais, comparando a quantidade de processos sigilosos
+e não sigilosos ao longo dos anos. Ele gera tabelas e gráficos para visualização dos dados.
+'''
+
+# --- BIBLIOTECAS NECESSÁRIAS ---
+from tjgo import graficos
+from tjgo.cnj import coluna_processo
+from tjgo.dados import ANOS_PADRAO, filtrar_anos
+
+# Cores das barras por ano (repetidas se houver mais anos)
+CORES_ANOS = ["#4375D3", "#494D94", "#203864"]
+
+
+def analisar_sigilo(df, anos=ANOS_PADRAO):
+    """Contagem anual de processos únicos sigilosos e não sigilosos, com a proporção de sigilosos."""
+    df = filtrar_anos(df, anos)
+
+    # Agrupar contando os processos únicos
+    processo = coluna_processo(df)
+    contagem_sigilo = df.groupby(['ano_distribuicao', 'is_segredo_justica'])[processo].nunique().reset_index()
+
+    # Pivotar a tabela
+    analise_sigilo = contagem_sigilo.pivot(
+        index='ano_distribuicao',
+        columns='is_segredo_justica',
+        values=processo
+    ).reindex(columns=[False, True]).reset_index()
+
+    # Renomear colunas e preencher possíveis valores nulos
+    analise_sigilo.columns = ['Ano', 'Nao_Sigilosos', 'Sigilosos']
+    analise_sigilo = analise_sigilo.fillna(0)
+
+    # Calcular totais e proporção de processos sigilosos
+    analise_sigilo['Total_Processos'] = analise_sigilo['Nao_Sigilosos'] + analise_sigilo['Sigilosos']
+    analise_sigilo['Proporcao_Sigilosos'] = analise_sigilo['Sigilosos'] / analise_sigilo['Total_Processos'] * 100
+
+    # converter ano para texto (eixo categórico)
+    analise_sigilo['Ano'] = analise_sigilo['Ano'].astype(int).astype(str)
+    return analise_sigilo
+
+
+def criar_graficos(analise_sigilo):
+    """Gráfico comparativo de quantidades e gráfico da proporção de sigilosos por ano."""
+    import plotly.express as px
+
+    # Plotar gráfico em barras de comparação entre processos sigilosos e não sigilosos
+    with graficos.TRAVA_PLOTLY:
+        fig1 = px.bar(
+            analise_sigilo,
+            x='Ano',
+            y=['Nao_Sigilosos', 'Sigilosos'],
+            title='<b>Comparativo Anual do Número de Casos Novos Sigilosos e Casos Novos Não Sigilosos</b>',
+            labels={'value': 'Total de Processos', 'variable': 'Tipo de Processo'},
+            color_discrete_sequence=["#4375D3", '#203864'],  # Cores para os tipos de processo
+            barmode='group'
+            )
+
+    # Adicionar valores formatados separadamente para cada barra
+    fig1.data[0].text = [f"{x:,.0f}".replace(",", ".") for x in analise_sigilo['Nao_Sigilosos']]
+    fig1.data[1].text = [f"{x:,.0f}".replace(",", ".") for x in analise_sigilo['Sigilosos']]
+
+    fig1.update_traces(
+        hovertemplate=None,  # Remove tooltips
+        hoverinfo='skip',    # Desativa informações ao passar o mouse
+        textfont_size=12,
+        textposition='outside'
+    )
+
+    fig1.update_layout(
+        separators=',.', # Formatar separador de milhar brasileiro
+        title_x=0.5,
+        legend_title_text='Tipo de Processo',
+        xaxis_title='Ano',
+        yaxis_title='Total de Processos',
+    )
+
+    # Ajustar legenda
+    fig1.data[0].name = 'Não Sigilosos'
+    fig1.data[1].name = 'Sigilosos'
+
+    # Gráfico de proporção de processos sigilosos
+    with graficos.TRAVA_PLOTLY:
+        fig2 = px.bar(
+            analise_sigilo,
+            x='Ano',
+            y='Proporcao_Sigilosos',
+            title='<b>Proporção de Processos Sigilosos</b>',
+            text='Proporcao_Sigilosos',
+            labels={'Proporcao_Sigilosos': 'Proporção de Sigilosos (%)', 'Ano': 'Ano'}
+        )
+
+    fig2.update_traces(
+        marker_color=[CORES_ANOS[i % len(CORES_ANOS)] for i in range(len(analise_sigilo))],
+        texttemplate='%{text:.2f}%',
+        textposition='outside',
+        hovertemplate=None,
+        hoverinfo='skip'
+    )
+
+    fig2.update_layout(
+        legend_title_text='Ano',
+        xaxis_title='Ano',
+        yaxis_title='Proporção de Processos Sigilosos (%)',
+        title_x=0.5
+        )
+
+    fig2.update_xaxes(
+        tickmode='array',
+        tickvals=analise_sigilo['Ano'].unique(),
+        ticktext=analise_sigilo['Ano'].astype(str)
+        ) # Valor do ano, em inteiro, no eixo x
+    return fig1, fig2
+
+
+def executar(df, anos=ANOS_PADRAO):
+    analise_sigilo = analisar_sigilo(df, anos)
+    fig1, fig2 = criar_graficos(analise_sigilo)
+    return {
+        'tabelas': {'analise_sigilo': analise_sigilo},
+        'figuras': {'comparativo_anual': fig1, 'proporcao_sigilosos': fig2},
+    }
@@ -0,0 +1,134 @@
+'''Análise de Processos Judiciais - Advogados e Sigilos:
+- Este script analisa dados de processos judiciais, focando na validação de números de OAB
+e na proporção de processos sigilosos por advogado. Ele gera tabelas e gráficos para visualização dos dados.'''
+
+# --- BIBLIOTECAS NECESSÁRIAS ---
+from tjgo.cnj import coluna_processo
+from tjgo.dados import ANOS_PADRAO, filtrar_anos, filtrar_oabs_validas
+
+
+def relatar_oabs_invalidas(df):
+    """Contar e exibir a quantidade de OABs inválidas."""
+    registros_invalidos = df[~df['oab_valida']]
+    qtd_invalidos = len(registros_invalidos)
+
+    print("--- Validação de Registros de OAB ---")
+    print(f"Total de registros com OAB em formato inválido ou nulo: {qtd_invalidos}")
+
+    if qtd_invalidos > 0:
+        exemplos_invalidos = registros_invalidos['oab'].unique()
+        print(f"Exemplos de OABs inválidas: {exemplos_invalidos}")
+    print("\n" + "="*80 + "\n")
+
+
+def analisar_advogados(df_validos):
+    """Proporção de processos sigilosos por advogado ao ano."""
+    analise_advogados = (df_validos.groupby(['ano_distribuicao', 'oab', 'is_segredo_justica'], observed=True)[coluna_processo(df_validos)]
+                                   .nunique()
+                                   .unstack(fill_value=0)
+                                   .reindex(columns=[False, True], fill_value=0))
+    analise_advogados.columns = ['Nao_Sigilosos', 'Sigilosos']
+    analise_advogados['Total_Processos'] = analise_advogados['Nao_Sigilosos'] + analise_advogados['Sigilosos']
+    analise_advogados['Proporcao_Sigilosos'] = (analise_advogados['Sigilosos'] / analise_advogados['Total_Processos'] * 100)
+    return analise_advogados
+
+
+def top_advogados_sigilosos(analise_advogados, n=10):
+    """Análise 1: Top N advogados com mais casos sigilosos, por ano."""
+    total_sigilosos_adv = analise_advogados.groupby('oab', observed=True)['Sigilosos'].sum()
+    top_advogados = total_sigilosos_adv.nlargest(n).index
+    analise_top_advogados = analise_advogados[analise_advogados.index.get_level_values('oab').isin(top_advogados)]
+
+    # Tabela resumo
+    tabela_resumo = analise_top_advogados.reset_index()
+    tabela_resumo.rename(columns={'ano_distribuicao': 'Ano',
+                                'oab': 'OAB',
+                                'Nao_Sigilosos': 'Não Sigilosos',
+                                'Total_Processos': 'Total de Processos',
+                                'Proporcao_Sigilosos': 'Proporção de Sigilosos'},
+                                inplace=True)
+    # Ordenar primeiro por Ano (crescente) e depois pela Proporção (decrescente)
+    tabela_resumo = tabela_resumo.sort_values(
+        by=['Ano', 'Proporção de Sigilosos'],
+        ascending=[True, False]
+    )
+    # Formatar a coluna de proporção
+    tabela_resumo['Proporção de Sigilosos'] = tabela_resumo['Proporção de Sigilosos'].map('{:,.2f}%'.format)
+    return tabela_resumo
+
+
+def advogados_acima_media_geral(analise_advogados, n=10):
+    """Análise 2: Advogados acima da média GERAL de processos sigilosos."""
+    total_sigilosos_adv = analise_advogados.groupby('oab', observed=True)['Sigilosos'].sum()
+    media_geral_sigilosos = total_sigilosos_adv.mean()
+    adv_acima_media_geral = total_sigilosos_adv[total_sigilosos_adv > media_geral_sigilosos].reset_index()
+    adv_acima_media_geral.columns = ['oab', 'Sigilosos']
+    # top N advogados acima da média
+    adv_acima_media_geral = adv_acima_media_geral.nlargest(n, 'Sigilosos').reset_index(drop=True)
+    adv_acima_media_geral = adv_acima_media_geral.rename(columns={'oab': 'OAB', 'Sigilosos': 'Total de Casos Sigilosos'})
+    return media_geral_sigilosos, adv_acima_media_geral
+
+
+def advogados_acima_media_anual(analise_advogados):
+    """Análise 3: Advogados acima da média ANUAL de processos sigilosos."""
+    media_anual_sigilosos = analise_advogados.groupby('ano_distribuicao')['Sigilosos'].mean()
+
+    # Mantém a lógica de encontrar TODOS os advogados acima da média
+    df_analise = analise_advogados.reset_index()
+    df_analise['Media_Anual'] = df_analise['ano_distribuicao'].map(media_anual_sigilosos)
+    adv_acima_media_anual = df_analise[df_analise['Sigilosos'] > df_analise['Media_Anual']]
+    return media_anual_sigilosos, adv_acima_media_anual
+
+
+def executar(df, anos=ANOS_PADRAO, df_validos=None):
+    """df_validos: registros com OAB válida já filtrados (pipeline); nesse caso df já traz oab_valida."""
+    df = filtrar_anos(df, anos)
+    if df_validos is None:
+        df = df.copy()
+        df_validos = filtrar_oabs_validas(df)
+    else:
+        df_validos = filtrar_anos(df_validos, anos)
+    relatar_oabs_invalidas(df)
+
+    tabelas = {}
+    if df_validos.empty:
+        return {'tabelas': tabelas, 'figuras': {}}
+
+    analise_advogados = analisar_advogados(df_validos)
+    tabelas['analise_advogados'] = analise_advogados
+
+    # Análise 1: Top 10 por ano
+    tabela_resumo = top_advogados_sigilosos(analise_advogados)
+    tabelas['top_advogados'] = tabela_resumo
+    print("--- Tabela de Análise: Top 10 Advogados com Mais Casos Sigilosos por Ano ---")
+    print(tabela_resumo.to_string(index=False))
+    print("\n" + "="*80 + "\n")
+
+    # Análise 2: Acima da média geral
+    print('--- Análise: Advogados Acima da Média Geral de Processos Sigilosos ---')
+    media_geral_sigilosos, adv_acima_media_geral = advogados_acima_media_geral(analise_advogados)
+    tabelas['acima_media_geral'] = adv_acima_media_geral
+    print(f"Média geral de casos sigilosos por advogado no período: {media_geral_sigilosos:.2f}")
+    print("Advogados com atuação acima da média geral:")
+    print(adv_acima_media_geral.sort_values(by='Total de Casos Sigilosos', ascending=False).to_string(index=False))
+    print("\n" + "="*80 + "\n")
+
+    # Análise 3: Top 10 acima da média anual
+    print("--- Análise: Advogados Acima da Média Anual de Casos Sigilosos ---")
+    media_anual_sigilosos, adv_acima_media_anual = advogados_acima_media_anual(analise_advogados)
+    tabelas['acima_media_anual'] = adv_acima_media_anual
+
+    # Filtrar e pegar apenas o Top 10 de cada ano
+    for ano, media in media_anual_sigilosos.items():
+        print(f"Ano: {int(ano)} (Média Anual de Casos Sigilosos: {media:.2f})")
+
+        tabela_ano = adv_acima_media_anual[adv_acima_media_anual['ano_distribuicao'] == ano][['oab', 'Sigilosos']]
+        if not tabela_ano.empty:
+            top_10_ano = tabela_ano.sort_values(by='Sigilosos', ascending=False).head(10)
+            print(top_10_ano.to_string(index=False))
+        else:
+            print("  Nenhum advogado acima da média neste ano.")
+        print("-" * 50)
+    print("\n" + "="*80 + "\n")
+
+    return {'tabelas': tabelas, 'figuras': {}}
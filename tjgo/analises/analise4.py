@@ -0,0 +1,74 @@
+'''Análise de Processos Judiciais Sigilosos - Área de Ação agrupadas por Comarcas:
+- Este script analisa dados de processos judiciais, focando no número de processos e
+na proporção de processos sigilosos por Área de Ação agrupadas por Comarcas. Ele gera 
+tabelas e gráficos para visualização dos dados.'''
+
+# --- BIBLIOTECAS NECESSÁRIAS ---
+from tjgo import agregacao, detalhamento, graficos, topn
+from tjgo.dados import ANOS_PADRAO
+
+CHAVES = ['comarca', 'nome_area_acao']
+
+
+def executar(df, anos=ANOS_PADRAO, bootstrap=0, contagens=None, cache=None, top=None,
+             top_metrica=topn.METRICA_PADRAO):
+    df_base, tabela_final, tabela_proporcoes = agregacao.analisar_proporcoes(
+        df, CHAVES, anos, bootstrap=bootstrap, contagens=contagens, cache=cache
+    )
+    # top: tabela e dispersão só com as maiores entidades e a linha "Outros" (exata)
+    tabela_exibicao = tabela_proporcoes
+    if top:
+        tabela_exibicao, _ = topn.top_n_com_outros(tabela_proporcoes, df_base, CHAVES, anos, top, top_metrica,
+                                                   bootstrap)
+    tabela_proporcoes_formatada = agregacao.formatar_tabela_proporcoes(tabela_exibicao, anos)
+
+    # Tabela Plotly das Proporções com Variação e Média
+    fig_proporcoes = graficos.figura_tabela(
+        tabela_proporcoes_formatada,
+        graficos.colunas_tabela_proporcoes([('nome_area_acao', 'Área de Ação'), ('comarca', 'Comarca')], anos),
+        titulo='<b>Proporção de Casos Sigilosos por Área de Ação ({}-{})</b><br>'
+               '<i>Ordenado por Variação Total</i>'.format(anos[0], anos[-1])
+    )
+
+    # --- GRÁFICO DE DISPERSÃO ESTRATÉGICO (SIGILOSOS vs. NÃO SIGILOSOS) ---
+    tabela_dispersao = tabela_exibicao.copy()
+
+    # Rótulo único por ponto
+    tabela_dispersao['rotulo'] = (
+        tabela_dispersao['nome_area_acao'].astype(str).str.strip()
+        + " - "
+        + tabela_dispersao['comarca'].astype(str).str.strip()
+    )
+
+    colunas_hover = (['variacao_total_sigilosos'] +
+                     [f'sigilosos_{ano}' for ano in anos] +
+                     [f'nao_sigilosos_{ano}' for ano in anos])
+    hovertemplate = (
+        ["<b>%{hovertext}</b>",
+         "<b>Variação Total de Sigilosos:</b> %{customdata[0]:.2f}%",
+         "<b>--- <b>Contagem de Casos</b> ---"] +
+        [f"<b>Sigilosos {ano}:</b> %{{customdata[{i + 1}]}}" for i, ano in enumerate(anos)] +
+        [f"<b>Não Sigilosos {ano}:</b> %{{customdata[{i + 1 + len(anos)}]}}" for i, ano in enumerate(anos)]
+    )
+    fig_dispersao = graficos.dispersao_estrategica(tabela_dispersao, 'rotulo', colunas_hover, hovertemplate, anos)
+
+    # Detalhamento por comarca: fatias da tabela ordenada por comarca, escolhidas no navegador
+    fig_detalhamento = detalhamento.DetalhamentoHTML(
+        tabela_proporcoes, 'comarca', 'nome_area_acao',
+        graficos.colunas_tabela_proporcoes([('nome_area_acao', 'Área de Ação')], anos), anos,
+        titulo='<b>Áreas de Ação por Comarca: Casos Sigilosos ({}-{})</b>'.format(anos[0], anos[-1])
+    )
+
+    tabelas = {
+        'tabela_final': tabela_final,
+        'tabela_proporcoes': tabela_proporcoes,
+        'tabela_proporcoes_formatada': tabela_proporcoes_formatada,
+    }
+    # Com top, a tabela formatada é a das n maiores + "Outros", não a completa
+    if top:
+        tabelas['tabela_top'] = tabela_exibicao
+
+    return {
+        'tabelas': tabelas,
+        'figuras': {'proporcoes': fig_proporcoes, 'dispersao': fig_dispersao, 'detalhamento': fig_detalhamento},
+    }
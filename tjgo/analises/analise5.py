@@ -0,0 +1,51 @@
+'''Análise de Processos Judiciais Sigilosos - Área de Ação Geral:
+- Este script analisa dados de processos judiciais, focando no número de processos e
+na proporção de processos sigilosos por Área de Ação. Ele gera tabelas e gráficos para visualização dos dados.'''
+
+# --- BIBLIOTECAS NECESSÁRIAS ---
+from tjgo import agregacao, graficos
+from tjgo.dados import ANOS_PADRAO
+
+CHAVES = ['nome_area_acao']
+
+
+def executar(df, anos=ANOS_PADRAO, bootstrap=0, contagens=None, cache=None):
+    df_base, tabela_final, tabela_proporcoes = agregacao.analisar_proporcoes(
+        df, CHAVES, anos, bootstrap=bootstrap, contagens=contagens, cache=cache
+    )
+    tabela_proporcoes_formatada = agregacao.formatar_tabela_proporcoes(tabela_proporcoes, anos)
+
+    # Tabela Plotly das Proporções com Variação e Média
+    fig_proporcoes = graficos.figura_tabela(
+        tabela_proporcoes_formatada,
+        graficos.colunas_tabela_proporcoes([('nome_area_acao', 'Área de Ação')], anos),
+        titulo='<b>Proporção de Casos Sigilosos por Área de Ação ({}-{})</b><br>'
+               '<i>Ordenado por Variação Total</i>'.format(anos[0], anos[-1])
+    )
+
+    # --- GRÁFICO DE DISPERSÃO ESTRATÉGICO (SIGILOSOS vs. NÃO SIGILOSOS) ---
+    tabela_dispersao = tabela_proporcoes.copy()
+
+    # Rótulo único por ponto
+    tabela_dispersao['rotulo'] = tabela_dispersao['nome_area_acao'].astype(str).str.strip()
+
+    colunas_hover = (['variacao_total_sigilosos'] +
+                     [f'sigilosos_{ano}' for ano in anos] +
+                     [f'nao_sigilosos_{ano}' for ano in anos])
+    hovertemplate = (
+        ["<b>%{hovertext}</b>",
+         "<b>Variação Total de Sigilosos:</b> %{customdata[0]:.2f}%",
+         "<b>--- <b>Contagem de Casos</b> ---"] +
+        [f"<b>Sigilosos {ano}:</b> %{{customdata[{i + 1}]}}" for i, ano in enumerate(anos)] +
+        [f"<b>Não Sigilosos {ano}:</b> %{{customdata[{i + 1 + len(anos)}]}}" for i, ano in enumerate(anos)]
+    )
+    fig_dispersao = graficos.dispersao_estrategica(tabela_dispersao, 'rotulo', colunas_hover, hovertemplate, anos)
+
+    return {
+        'tabelas': {
+            'tabela_final': tabela_final,
+            'tabela_proporcoes': tabela_proporcoes,
+            'tabela_proporcoes_formatada': tabela_proporcoes_formatada,
+        },
+        'figuras': {'proporcoes': fig_proporcoes, 'dispersao': fig_dispersao},
+    }
@@ -0,0 +1,137 @@
+'''Análise de Processos Judiciais Sigilosos - Área de Ação Geral (Crescimento de Entradas):
+- Este script analisa dados de processos judiciais, focando no número de processos e
+na proporção de processos sigilosos por Área de Ação, relacionando o nível de sigilo ao
+crescimento das entradas (crescimento total e CAGR). Ele gera tabelas e gráficos para visualização dos dados.'''
+
+# --- BIBLIOTECAS NECESSÁRIAS ---
+from tjgo import agregacao, graficos, topn
+from tjgo.dados import ANOS_PADRAO
+from tjgo.estatisticas import calcular_crescimento
+
+CHAVES = ['nome_area_acao']
+
+# Escolha do eixo Y: 'cagr_volume' (recomendado, %/ano) ou 'crescimento_percentual_volume'
+Y_METRIC = 'cagr_volume'
+
+
+def adicionar_crescimento(tabela_proporcoes, anos):
+    """Crescimento Total (%) e CAGR (%/ano) usando o primeiro ano com base > 0."""
+    (
+        tabela_proporcoes['crescimento_percentual_volume'],
+        tabela_proporcoes['cagr_volume'],
+        tabela_proporcoes['ano_base'],
+    ) = calcular_crescimento(tabela_proporcoes[[f'total_{ano}' for ano in anos]], anos)
+    return tabela_proporcoes
+
+
+def criar_dispersao(tabela_proporcoes, anos, y_metric=Y_METRIC):
+    """Sigilo médio (x) vs crescimento de entradas (y), com bolhas proporcionais ao volume."""
+    import plotly.express as px
+
+    tabela_dispersao = tabela_proporcoes.copy()
+    tabela_dispersao['rotulo'] = tabela_dispersao['nome_area_acao'].astype(str).str.strip()
+
+    # Tamanho da bolha ~ volume total do período
+    tabela_dispersao['volume_total'] = tabela_dispersao['total_processos'].astype(float)
+
+    # Informações no hover
+    colunas_hover = (['cagr_volume', 'crescimento_percentual_volume'] +
+                     [f'total_{ano}' for ano in anos] +
+                     ['proporcao_media_sigilosos'])
+
+    with graficos.TRAVA_PLOTLY:
+        fig_dispersao = px.scatter(
+            tabela_dispersao,
+            x='proporcao_media_sigilosos',
+            y=y_metric,
+            size='volume_total',
+            size_max=28,
+            title='<b>Análise Estratégica: Sigilo (média) vs Crescimento de Entradas</b>',
+            labels={
+                'proporcao_media_sigilosos': 'Proporção Média de Casos Sigilosos (%)',
+                'cagr_volume': 'Crescimento Médio Anual de Entradas (CAGR, %/ano)',
+                'crescimento_percentual_volume': f'Crescimento Total de Entradas ({anos[-1]} vs 1º ano base, %)'
+            },
+            hover_name='rotulo',
+            custom_data=colunas_hover
+        )
+
+    # Linhas de referência e anotações dos quadrantes
+    media_proporcao_sigilosos = tabela_proporcoes['proporcao_media_sigilosos'].mean()
+    graficos.adicionar_quadrantes(
+        fig_dispersao,
+        x_ref=media_proporcao_sigilosos,
+        y_min=min(0, tabela_dispersao[y_metric].min()),
+        y_max=max(0, tabela_dispersao[y_metric].max()),
+        rotulos=['Alta Demanda & Alto Sigilo', 'Crescimento com Baixo Sigilo',
+                 'Baixa Demanda & Baixo Sigilo', 'Alto Sigilo em Queda'],
+        rotulo_x=f"Média Sigilo: {media_proporcao_sigilosos:.2f}%".replace('.', ','),
+        rotulo_y="Crescimento = 0",
+    )
+
+    # Eixos
+    fig_dispersao.update_xaxes(title_text="Proporção Média de Casos Sigilosos (%)", ticksuffix="%")
+    fig_dispersao.update_yaxes(
+        title_text="Crescimento de Entradas (%/ano)" if y_metric == 'cagr_volume' else "Crescimento Total de Entradas (%)",
+        ticksuffix="%"
+    )
+
+    # Hover customizado
+    n = len(anos)
+    fig_dispersao.update_traces(
+        marker=dict(color='#203864'),
+        hovertemplate="<br>".join(
+            ["<b>Área de Ação:</b> %{hovertext}",
+             "<b>CAGR de Entradas:</b> %{customdata[0]:.2f}%",
+             "<b>Crescimento Total:</b> %{customdata[1]:.2f}%",
+             "<b>--- <b>Totais</b> ---"] +
+            [f"<b>Total {ano}:</b> %{{customdata[{i + 2}]}}" for i, ano in enumerate(anos)] +
+            [f"<b>Sigilo (média {anos[0]}–{anos[-1]}):</b> %{{customdata[{n + 2}]:.2f}}%",
+             "<extra></extra>"]
+        )
+    )
+
+    fig_dispersao.update_layout(
+        title_text='<b>Análise Estratégica: Foco em Crescimento de Entradas vs Nível de Sigilo</b>',
+        title_x=0.5,
+        height=900,
+        showlegend=False
+    )
+    return fig_dispersao
+
+
+def executar(df, anos=ANOS_PADRAO, bootstrap=0, contagens=None, cache=None, top=None,
+             top_metrica=topn.METRICA_PADRAO):
+    df_base, tabela_final, tabela_proporcoes = agregacao.analisar_proporcoes(
+        df, CHAVES, anos, bootstrap=bootstrap, contagens=contagens, cache=cache
+    )
+    # top: tabela e dispersão só com as maiores entidades e a linha "Outros" (exata)
+    tabela_exibicao = tabela_proporcoes
+    if top:
+        tabela_exibicao, _ = topn.top_n_com_outros(tabela_proporcoes, df_base, CHAVES, anos, top, top_metrica,
+                                                   bootstrap)
+        tabela_exibicao = adicionar_crescimento(tabela_exibicao, anos)
+    tabela_proporcoes = adicionar_crescimento(tabela_proporcoes, anos)
+    tabela_proporcoes_formatada = agregacao.formatar_tabela_proporcoes(tabela_exibicao, anos)
+
+    fig_proporcoes = graficos.figura_tabela(
+        tabela_proporcoes_formatada,
+        graficos.colunas_tabela_proporcoes([('nome_area_acao', 'Área de Ação')], anos),
+        titulo=f'<b>Proporção de Casos Sigilosos por Área de Ação ({anos[0]}-{anos[-1]})</b><br>'
+               '<i>Ordenado por Variação Total</i>'
+    )
+    fig_dispersao = criar_dispersao(tabela_exibicao, anos)
+
+    tabelas = {
+        'tabela_final': tabela_final,
+        'tabela_proporcoes': tabela_proporcoes,
+        'tabela_proporcoes_formatada': tabela_proporcoes_formatada,
+    }
+    # Com top, a tabela formatada é a das n maiores + "Outros", não a completa
+    if top:
+        tabelas['tabela_top'] = tabela_exibicao
+
+    return {
+        'tabelas': tabelas,
+        'figuras': {'proporcoes': fig_proporcoes, 'dispersao': fig_dispersao},
+    }
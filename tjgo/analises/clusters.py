@@ -0,0 +1,58 @@
+'''Agrupamento de Advogados por Perfil de Atuação:
+- Este script agrupa todos os advogados pelos volumes anuais, proporções de sigilosos, tendências
+e composição por área de ação (MiniBatchKMeans sobre atributos padronizados), em vez dos cortes
+fixos dos quadrantes. Gera a tabela de perfis dos grupos e um mapa de calor dos perfis.'''
+
+# --- BIBLIOTECAS NECESSÁRIAS ---
+from tjgo import clusters, graficos
+from tjgo.agregacao import montar_tabela_final, montar_tabela_proporcoes
+from tjgo.cache import memorizar
+from tjgo.dados import ANOS_PADRAO, ETAPAS_CARGA, explodir_oabs_validas, oabs_por_linha
+
+FONTES = ETAPAS_CARGA + (oabs_por_linha, explodir_oabs_validas, montar_tabela_final, montar_tabela_proporcoes,
+                         clusters.composicao_areas, clusters.atributos_advogados)
+
+
+def executar(df, anos=ANOS_PADRAO, df_oabs=None, cache=None, grupos=None):
+    """
+    df_oabs: um registro por OAB válida de cada campo, inclusive os campos com vários
+    advogados (pipeline; dados.explodir_oabs_validas).
+    grupos: número de grupos (padrão: clusters.K_PADRAO).
+    """
+    if df_oabs is None:
+        df_oabs = explodir_oabs_validas(df)
+
+    # Os atributos ficam no cache; o agrupamento leva segundos e é refeito a cada execução
+    atributos = memorizar(
+        cache, 'clusters_atributos', lambda: clusters.atributos_advogados(df_oabs, anos),
+        parametros={'anos': list(anos), 'areas': clusters.AREAS_ATRIBUTOS},
+        fontes=FONTES,
+    )
+    if atributos.empty:
+        print("Nenhum advogado com OAB válida no período.")
+        return {'tabelas': {}, 'figuras': {}}
+
+    advogados, perfis = clusters.agrupar_advogados(atributos, grupos or clusters.K_PADRAO, anos)
+    print(f"Agrupamento de advogados: {len(advogados):,} advogados em {len(perfis)} grupos "
+          f"({len(clusters.colunas_atributos(atributos))} atributos)")
+    for linha in perfis.itertuples():
+        print(f"  Grupo {linha.cluster}: {linha.advogados:,} advogados, "
+              f"sigilosos {linha.proporcao_media_sigilosos:.2f}%, "
+              f"tendência {linha.tendencia_sigilosos:+.2f} p.p./ano, área: {linha.area_predominante}")
+
+    fig_perfis = clusters.figura_perfis(
+        perfis, advogados,
+        titulo=f'<b>Perfis dos Grupos de Advogados ({anos[0]}-{anos[-1]})</b><br>'
+               '<i>Atributo médio do grupo em desvios-padrão em relação a todos os advogados</i>'
+    )
+    colunas_tabela = [('cluster', 'Grupo'), ('advogados', 'Advogados'), ('mediana_processos', 'Mediana de Processos'),
+                      ('proporcao_media_sigilosos', 'Sigilosos Médio (%)'),
+                      ('tendencia_volume', 'Tendência do Volume (log/ano)'),
+                      ('tendencia_sigilosos', 'Tendência de Sigilosos (p.p./ano)'),
+                      ('area_predominante', 'Área Predominante')]
+    fig_tabela = graficos.figura_tabela(perfis, colunas_tabela, titulo='<b>Perfis dos Grupos de Advogados</b>')
+
+    return {
+        'tabelas': {'advogados': advogados, 'perfis': perfis},
+        'figuras': {'perfis': fig_perfis, 'tabela_perfis': fig_tabela},
+    }
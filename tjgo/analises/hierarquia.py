@@ -0,0 +1,27 @@
+'''Hierarquia de Volumes e Sigilo - Comarca → Serventia → Área de Ação:
+- Este script gera uma visão hierárquica do número de processos e da proporção de processos
+sigilosos, da comarca até a área de ação, com contagens exatas de processos distintos em cada
+nível. O estado inteiro é desenhado numa única figura (sunburst e treemap).'''
+
+# --- BIBLIOTECAS NECESSÁRIAS ---
+from tjgo import hierarquia
+from tjgo.cache import memorizar
+from tjgo.dados import ANOS_PADRAO, ETAPAS_CARGA
+
+
+def executar(df, anos=ANOS_PADRAO, cache=None):
+    tabela_hierarquia = memorizar(
+        cache, 'hierarquia', lambda: hierarquia.agregar_hierarquia(df, hierarquia.NIVEIS_PADRAO, anos),
+        parametros={'niveis': hierarquia.NIVEIS_PADRAO, 'anos': list(anos)},
+        fontes=ETAPAS_CARGA + (hierarquia.contar_niveis, hierarquia.montar_hierarquia),
+    )
+
+    titulo = ('<b>Processos por Comarca, Serventia e Área de Ação ({}-{})</b><br>'
+              '<i>Área: processos distintos; cor: proporção de sigilosos</i>'.format(anos[0], anos[-1]))
+    return {
+        'tabelas': {'hierarquia': tabela_hierarquia},
+        'figuras': {
+            'sunburst': hierarquia.figura_hierarquia(tabela_hierarquia, 'sunburst', titulo),
+            'treemap': hierarquia.figura_hierarquia(tabela_hierarquia, 'treemap', titulo),
+        },
+    }
@@ -0,0 +1,226 @@
+'''Regressão de Tendência de Processos Sigilosos por Advogado:
+- Ajusta uma regressão linear (OLS) do volume de processos sigilosos do último ano sobre os anos
+anteriores, verifica os pressupostos do modelo e gera gráficos e tabela por advogado.
+statsmodels, matplotlib e seaborn são importados apenas pelas etapas que os utilizam.'''
+
+# --- BIBLIOTECAS NECESSÁRIAS ---
+import pandas as pd
+
+from tjgo import graficos
+from tjgo.cnj import coluna_processo
+from tjgo.dados import ANOS_PADRAO, explodir_advogados, filtrar_oabs_validas
+
+# pyplot não é thread-safe: no pipeline, esta análise roda na thread principal
+THREAD_PRINCIPAL = True
+
+
+# 1) Pré-processamento
+def preprocessar(df, df_validos=None):
+    """Mantém apenas registros com OAB válida e sob sigilo."""
+    if df_validos is None:
+        df_validos = filtrar_oabs_validas(df.copy())
+    return df_validos[df_validos['is_segredo_justica']].copy()
+
+
+# 2) Preparar dados para análise temporal
+def preparar_serie_temporal(df, anos=ANOS_PADRAO):
+    """Prepara série temporal de processos sigilosos por advogado"""
+    df_exp = explodir_advogados(df)
+
+    # Agregar por advogado e ano
+    df_agg = df_exp.groupby(['oab', 'ano_distribuicao'], observed=True).agg(
+        processos_sigilosos=(coluna_processo(df_exp), 'nunique')
+    ).reset_index()
+
+    # Verificar anos necessários
+    anos_necessarios = set(anos)
+    anos_presentes = set(df_agg['ano_distribuicao'].unique())
+
+    if not anos_necessarios.issubset(anos_presentes):
+        faltantes = anos_necessarios - anos_presentes
+        raise ValueError(f"Anos necessários não encontrados nos dados: {faltantes}")
+
+    # Pivotar para formato wide
+    df_pivot = df_agg[df_agg['ano_distribuicao'].isin(anos)].pivot(
+        index='oab',
+        columns='ano_distribuicao',
+        values='processos_sigilosos'
+    ).fillna(0)
+
+    # Renomear colunas para facilitar acesso
+    df_pivot.columns = [f"sigilosos_{int(col)}" for col in df_pivot.columns]
+
+    return df_pivot
+
+
+# 3) Análise de Regressão
+def analisar_tendencia(df, anos=ANOS_PADRAO):
+    """Regressão linear do último ano sobre os anos anteriores"""
+    import statsmodels.api as sm
+
+    X = sm.add_constant(df[[f'sigilosos_{ano}' for ano in anos[:-1]]])
+    y = df[f'sigilosos_{anos[-1]}']
+    return sm.OLS(y, X).fit()
+
+
+# 4) Verificação de pressupostos
+def verificar_pressupostos(modelo, anos=ANOS_PADRAO):
+    """Verifica os pressupostos da regressão linear"""
+    import matplotlib.pyplot as plt
+    import seaborn as sns
+    import statsmodels.api as sm
+    from scipy import stats
+    from statsmodels.graphics.gofplots import qqplot
+    from statsmodels.stats.diagnostic import het_breuschpagan
+    from statsmodels.stats.outliers_influence import variance_inflation_factor
+
+    plt.style.use('ggplot')
+    print("\n=== VERIFICAÇÃO DOS PRESSUPOSTOS ===")
+
+    # 1. Linearidade
+    print("\n1. LINEARIDADE:")
+    preditores = anos[:-1]
+    fig, ax = plt.subplots(1, len(preditores), figsize=(6 * len(preditores), 5), squeeze=False)
+    for i, ano in enumerate(preditores):
+        sns.scatterplot(x=modelo.model.exog[:, i + 1], y=modelo.model.endog, ax=ax[0, i])
+        ax[0, i].set_title(f'{ano} vs {anos[-1]}')
+    plt.tight_layout()
+    plt.show()
+
+    # 2. Independência dos erros
+    print("\n2. INDEPENDÊNCIA DOS ERROS (Durbin-Watson):")
+    dw = sm.stats.durbin_watson(modelo.resid)
+    print(f"Valor: {dw:.2f} (próximo de 2 indica independência)")
+
+    # 3. Homocedasticidade
+    print("\n3. HOMOCEDASTICIDADE (Breusch-Pagan):")
+    _, pval, _, _ = het_breuschpagan(modelo.resid, modelo.model.exog)
+    print(f"p-valor: {pval:.4f} (p > 0.05 indica homocedasticidade)")
+
+    # Gráfico de resíduos vs fitted
+    plt.figure(figsize=(8, 6))
+    sns.residplot(x=modelo.fittedvalues, y=modelo.resid, lowess=True)
+    plt.title('Resíduos vs Valores Ajustados')
+    plt.xlabel('Valores Ajustados')
+    plt.ylabel('Resíduos')
+    plt.show()
+
+    # 4. Normalidade dos resíduos
+    print("\n4. NORMALIDADE DOS RESÍDUOS (Shapiro-Wilk):")
+    shapiro_test = stats.shapiro(modelo.resid)
+    print(f"p-valor: {shapiro_test[1]:.4f} (p > 0.05 indica normalidade)")
+
+    # QQ Plot
+    plt.figure(figsize=(8, 6))
+    qqplot(modelo.resid, line='s')
+    plt.title('QQ Plot dos Resíduos')
+    plt.show()
+
+    # 5. Multicolinearidade
+    print("\n5. MULTICOLINEARIDADE (VIF):")
+    vif = pd.DataFrame()
+    vif["Variável"] = modelo.model.exog_names
+    vif["VIF"] = [variance_inflation_factor(modelo.model.exog, i)
+                 for i in range(modelo.model.exog.shape[1])]
+    print(vif)
+    print("VIF < 5 indica baixa multicolinearidade")
+
+
+# 5) Resultados e visualização
+def visualizar_resultados(df, modelo, anos=ANOS_PADRAO):
+    """Gera visualizações dos resultados"""
+    import plotly.graph_objects as go
+    import statsmodels.api as sm
+
+    ano_final, ano_anterior = anos[-1], anos[-2]
+    col_final, col_anterior = f'sigilosos_{ano_final}', f'sigilosos_{ano_anterior}'
+    col_previsao = f'previsao_{ano_final}'
+
+    # Adicionar previsões e métricas ao DataFrame
+    df[col_previsao] = modelo.predict(sm.add_constant(df[[f'sigilosos_{ano}' for ano in anos[:-1]]]))
+    df['crescimento_abs'] = df[col_final] - df[col_anterior]
+    df['crescimento_rel'] = (df['crescimento_abs'] / df[col_anterior].replace(0, 1)) * 100
+
+    # Corrigir valores negativos para tamanho (usar valor absoluto e adicionar um mínimo)
+    df['tamanho_marcador'] = df['crescimento_abs'].abs() + 1  # +1 para evitar tamanho zero
+
+    # Gráfico de dispersão com tendência (WebGL ou densidade com muitos advogados; a reta OLS
+    # usa sempre todos os pontos)
+    fig = graficos.dispersao(
+        df.reset_index(),
+        x=col_anterior,
+        y=col_final,
+        peso=col_final,
+        size='tamanho_marcador',
+        color='crescimento_rel',
+        hover_name='oab',
+        trendline='ols',
+        title=f'Relação entre Processos Sigilosos ({ano_anterior} vs {ano_final})',
+        labels={
+            col_anterior: f'Processos Sigilosos em {ano_anterior}',
+            col_final: f'Processos Sigilosos em {ano_final}',
+            'crescimento_rel': 'Crescimento (%)',
+            'tamanho_marcador': 'Magnitude do Crescimento'
+        },
+        size_max=20  # Limitar o tamanho máximo dos marcadores
+    )
+
+    # Personalizar a legenda de cores
+    fig.update_layout(
+        coloraxis_colorbar=dict(
+            title="Crescimento (%)",
+            tickvals=[-100, -50, 0, 50, 100, 150, 200],
+            ticktext=["-100%", "-50%", "0%", "50%", "100%", "150%", "200%"]
+        )
+    )
+
+    # Tabela de resultados
+    resultados = df.reset_index()[
+        ['oab'] + [f'sigilosos_{ano}' for ano in anos] + ['crescimento_rel', col_previsao]
+    ].sort_values('crescimento_rel', ascending=False)
+
+    fig_tabela = go.Figure(data=[go.Table(
+        header=dict(
+            values=['OAB'] + [str(ano) for ano in anos] + ['Crescimento (%)', f'Previsão {ano_final}'],
+            fill_color='#203864',
+            font=dict(color='white', size=12),
+            align='left'
+        ),
+        cells=dict(
+            values=[resultados['oab']] +
+                   [resultados[f'sigilosos_{ano}'] for ano in anos] +
+                   [resultados['crescimento_rel'].round(2), resultados[col_previsao].round(2)],
+            fill_color='lavender',
+            align='left'
+        )
+    )])
+    fig_tabela.update_layout(
+        title='Resultados da Análise por Advogado',
+        height=800,
+        margin=dict(l=20, r=20, t=60, b=20)
+    )
+
+    return df, fig, fig_tabela
+
+
+def executar(df, anos=ANOS_PADRAO, pressupostos=True, df_validos=None):
+    if len(anos) < 2:
+        raise ValueError("A regressão de tendência precisa de pelo menos dois anos.")
+
+    df_sigilosos = preprocessar(df, df_validos)
+    df_temporal = preparar_serie_temporal(df_sigilosos, anos)
+    modelo = analisar_tendencia(df_temporal, anos)
+
+    if pressupostos:
+        verificar_pressupostos(modelo, anos)
+
+    df_resultados, fig, fig_tabela = visualizar_resultados(df_temporal, modelo, anos)
+
+    # Resumo estatístico
+    print("\n=== RESUMO DO MODELO ===")
+    print(modelo.summary())
+
+    return {
+        'tabelas': {'resultados': df_resultados},
+        'figuras': {'tendencia': fig, 'tabela_resultados': fig_tabela},
+    }
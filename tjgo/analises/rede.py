@@ -0,0 +1,47 @@
+'''Rede de Coatuação entre Advogados:
+- Este script monta a rede de advogados que atuam juntos nos mesmos processos (campo oab com
+vários advogados separados por ';'), com pesos por ano e só de processos sigilosos, métricas de
+grau e centralidade por advogado e componentes conexas. Gera tabelas e gráficos da rede.'''
+
+# --- BIBLIOTECAS NECESSÁRIAS ---
+from tjgo import graficos, rede
+from tjgo.cache import memorizar
+from tjgo.dados import ANOS_PADRAO, ETAPAS_CARGA, oabs_por_linha
+
+FONTES = ETAPAS_CARGA + (oabs_por_linha, rede.incidencia, rede.coocorrencia, rede._pares, rede.tabela_arestas,
+                         rede.pagerank, rede.metricas_advogados, rede.construir_rede)
+
+
+def executar(df, anos=ANOS_PADRAO, cache=None):
+    # Arestas e advogados são entradas próprias do cache, calculadas juntas na primeira vez
+    calculado = {}
+
+    def calcular(nome):
+        if not calculado:
+            calculado['arestas'], calculado['advogados'], _ = rede.construir_rede(df, anos)
+        return calculado[nome]
+
+    parametros = {'anos': list(anos)}
+    arestas = memorizar(cache, 'rede_arestas', lambda: calcular('arestas'), parametros=parametros, fontes=FONTES)
+    advogados = memorizar(cache, 'rede_advogados', lambda: calcular('advogados'), parametros=parametros, fontes=FONTES)
+    componentes = rede.resumir_componentes(advogados)
+
+    print(f"Rede de coatuação: {len(advogados):,} advogados, {len(arestas):,} pares, "
+          f"{len(componentes):,} componentes (maior: {componentes['advogados'].max() if len(componentes) else 0:,})")
+
+    fig_rede = rede.figura_rede(
+        arestas, advogados,
+        titulo=f'<b>Rede de Coatuação: {rede.NOS_FIGURA} Advogados de Maior PageRank ({anos[0]}-{anos[-1]})</b>'
+    )
+    fig_graus = rede.figura_graus(advogados, titulo='<b>Distribuição de Coatuantes Distintos por Advogado</b>')
+    fig_componentes = graficos.figura_tabela(
+        componentes.assign(grau_medio=componentes['grau_medio'].round(2)),
+        [('componente', 'Componente'), ('advogados', 'Advogados'), ('grau_medio', 'Grau Médio'),
+         ('advogado_central', 'Advogado Central (PageRank)')],
+        titulo='<b>Componentes Conexas da Rede de Coatuação</b>'
+    )
+
+    return {
+        'tabelas': {'arestas': arestas, 'advogados': advogados, 'componentes': componentes},
+        'figuras': {'rede': fig_rede, 'graus': fig_graus, 'componentes': fig_componentes},
+    }
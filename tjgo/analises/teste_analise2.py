@@ -0,0 +1,148 @@
+'''Análise de Processos Judiciais - Advogados e Sigilos:
+- Este script analisa dados de processos judiciais, focando na validação de números de OAB
+e na proporção de processos sigilosos por advogado. Ele gera tabelas e gráficos para visualização dos dados.'''
+
+# --- BIBLIOTECAS NECESSÁRIAS ---
+import traceback
+
+from tjgo import agregacao, graficos
+from tjgo.agregacao import fmt_int, fmt_pct
+from tjgo.dados import ANOS_PADRAO, explodir_advogados, filtrar_anos, filtrar_oabs_validas
+
+CHAVES = ['oab']
+
+
+def analisar_advogados(df_advogados, anos):
+    """Tabela de proporções por advogado, ordenada pela OAB."""
+    tabela_final = agregacao.montar_tabela_final(agregacao.base_entidades(df_advogados, CHAVES), CHAVES, anos)
+    tabela_proporcoes = agregacao.montar_tabela_proporcoes(tabela_final, CHAVES, anos)
+    return tabela_final, tabela_proporcoes.sort_values('oab')
+
+
+def criar_graficos(tabela_proporcoes, anos):
+    tabela_proporcoes_formatada = agregacao.formatar_tabela_proporcoes(tabela_proporcoes, anos)
+
+    # Tabela Plotly das Proporções com Variação e Média
+    fig_proporcoes = graficos.figura_tabela(
+        tabela_proporcoes_formatada,
+        graficos.colunas_tabela_proporcoes([('oab', 'OAB')], anos),
+        titulo=f'<b>Proporção de Casos Sigilosos por Advogado ({anos[0]}-{anos[-1]})</b><br>'
+               '<i>Ordenado por Variação Total</i>'
+    )
+
+    # --- GRÁFICO DE DISPERSÃO ESTRATÉGICO (SIGILOSOS vs. NÃO SIGILOSOS) ---
+    n = len(anos)
+    colunas_hover = (['variacao_total_sigilosos', 'proporcao_media_sigilosos'] +
+                     [f'proporcao_sigilosos_{ano}' for ano in anos] +
+                     [f'proporcao_nao_sigilosos_{ano}' for ano in anos])
+    hovertemplate = (
+        ["<b>OAB:</b> %{hovertext}",
+         "<b>Variação Total Sigilosos:</b> %{customdata[0]:.2f}%",
+         "<b>Proporção Média de Sigilosos:</b> %{customdata[1]:.2f}%",
+         "<b>--- <b>Contagem de Casos</b> ---"] +
+        [f"<b>Sigilosos {ano}:</b> %{{customdata[{i + 2}]:.2f}}%" for i, ano in enumerate(anos)] +
+        [f"<b>Não Sigilosos {ano}:</b> %{{customdata[{i + 2 + n}]:.2f}}%" for i, ano in enumerate(anos)]
+    )
+    fig_dispersao = graficos.dispersao_estrategica(tabela_proporcoes, 'oab', colunas_hover, hovertemplate, anos)
+    return tabela_proporcoes_formatada, fig_proporcoes, fig_dispersao
+
+
+# --- MÉTRICAS ---
+def imprimir_metricas(df, tabela_proporcoes, anos):
+    """Métricas de qualidade das OABs e classificação por quadrantes."""
+    # 1) total de registros de oab (considera preenchidos e não vazios)
+    mask_oab_preenchida = df["oab"].astype(str).str.strip().ne("") & df["oab"].notna()
+    total_registros_oab = int(mask_oab_preenchida.sum())
+
+    # 2) % de registros de oab válidas (sobre os preenchidos)
+    total_registros_validos = int(df.loc[mask_oab_preenchida, "oab_valida"].sum())
+    pct_validas = (total_registros_validos / total_registros_oab * 100) if total_registros_oab > 0 else 0.0
+
+    # 3) % de registros de oab inválidas (sobre os preenchidos)
+    total_invalidas = int(total_registros_oab - total_registros_validos)
+    pct_invalidas = (total_invalidas / total_registros_oab * 100) if total_registros_oab > 0 else 0.0
+
+    # 4) exemplos de formatos inválidos (máx. 10)
+    exemplos_invalidos = (
+        df.loc[mask_oab_preenchida & ~df["oab_valida"], "oab"]
+          .dropna().astype(str).str.strip().unique().tolist()[:10]
+    )
+
+    # --- Métricas por OAB única (baseadas na tabela_proporcoes) ---
+    if tabela_proporcoes is not None and not tabela_proporcoes.empty:
+        total_oabs_validas_unicas = int(tabela_proporcoes["oab"].nunique())
+
+        def pct(qtd):
+            return (qtd / total_oabs_validas_unicas * 100) if total_oabs_validas_unicas > 0 else 0.0
+
+        # 6) OAB válida com casos sigilosos (% sobre OABs únicas válidas)
+        oabs_com_sigilo = int((tabela_proporcoes["total_sigilosos"] > 0).sum())
+        pct_oab_com_sigilo = pct(oabs_com_sigilo)
+
+        # 7) OAB válida com casos exclusivamente não sigilosos (% sobre OABs únicas válidas)
+        oabs_exclusivamente_nao_sigilosos = int((tabela_proporcoes["total_sigilosos"] == 0).sum())
+        pct_oab_exclusivamente_nao_sigilosos = pct(oabs_exclusivamente_nao_sigilosos)
+
+        # 8–11) Classificação por quadrantes (mesmos cortes do gráfico)
+        media_proporcao = float(tabela_proporcoes["proporcao_media_sigilosos"].mean())
+        cond_direita = tabela_proporcoes["proporcao_media_sigilosos"] >= media_proporcao
+        cond_esquerda = ~cond_direita
+        cond_cima = tabela_proporcoes["variacao_total_sigilosos"] > 0
+        cond_baixo = ~cond_cima
+
+        especialistas_expansao = int((cond_direita & cond_cima).sum())
+        novos_focos = int((cond_esquerda & cond_cima).sum())
+        especialistas_transicao = int((cond_direita & cond_baixo).sum())
+        fora_do_foco = int((cond_esquerda & cond_baixo).sum())
+        pct_expansao, pct_novos = pct(especialistas_expansao), pct(novos_focos)
+        pct_transicao, pct_fora = pct(especialistas_transicao), pct(fora_do_foco)
+    else:
+        total_oabs_validas_unicas = 0
+        oabs_com_sigilo = oabs_exclusivamente_nao_sigilosos = 0
+        pct_oab_com_sigilo = pct_oab_exclusivamente_nao_sigilosos = 0.0
+        especialistas_expansao = novos_focos = especialistas_transicao = fora_do_foco = 0
+        pct_expansao = pct_novos = pct_transicao = pct_fora = 0.0
+
+    # --- PRINT organizado ---
+    print("\n" + "="*100)
+    print(f"MÉTRICAS - OAB / SIGILOS ({anos[0]}–{anos[-1]})")
+    print("="*100)
+    print(f"1) Total de registros de OAB: {fmt_int(total_registros_oab)}")
+    print(f"2) Registros de OAB válidas: {fmt_pct(pct_validas)}  ({fmt_int(total_registros_validos)})")
+    print(f"3) Registros de OAB inválidas: {fmt_pct(pct_invalidas)}  ({fmt_int(total_invalidas)})")
+    print(f"4) Exemplos de formatos inválidos (até 10): {exemplos_invalidos}")
+    print(f"5) Total de registros de OAB válidas: {fmt_int(total_registros_validos)}")
+    print(f"6) OAB válida com casos sigilosos: {fmt_pct(pct_oab_com_sigilo)}  ({oabs_com_sigilo}/{total_oabs_validas_unicas})")
+    print(f"7) OAB válida com casos exclusivamente NÃO sigilosos: {fmt_pct(pct_oab_exclusivamente_nao_sigilosos)}  ({oabs_exclusivamente_nao_sigilosos}/{total_oabs_validas_unicas})")
+    print(f"8) Especialistas em Expansão: {especialistas_expansao}  ({fmt_pct(pct_expansao)} das OABs válidas)")
+    print(f"9) Novos Focos de Atuação: {novos_focos}  ({fmt_pct(pct_novos)} das OABs válidas)")
+    print(f"10) Especialistas em Transição: {especialistas_transicao}  ({fmt_pct(pct_transicao)} das OABs válidas)")
+    print(f"11) Fora do Foco: {fora_do_foco}  ({fmt_pct(pct_fora)} das OABs válidas)")
+    print("="*100 + "\n")
+
+
+def executar(df, anos=ANOS_PADRAO, df_advogados=None):
+    """df_advogados: base de advogados já explodida (pipeline); nesse caso df já traz oab_valida."""
+    df = filtrar_anos(df, anos)
+    if df_advogados is None:
+        df = df.copy()
+        df_advogados = explodir_advogados(filtrar_oabs_validas(df))
+    else:
+        df_advogados = filtrar_anos(df_advogados, anos)
+
+    tabelas, figuras = {}, {}
+    tabela_proporcoes = None
+    if not df_advogados.empty:
+        tabela_final, tabela_proporcoes = analisar_advogados(df_advogados, anos)
+        tabela_proporcoes_formatada, fig_proporcoes, fig_dispersao = criar_graficos(tabela_proporcoes, anos)
+        tabelas.update(tabela_final=tabela_final, tabela_proporcoes=tabela_proporcoes,
+                       tabela_proporcoes_formatada=tabela_proporcoes_formatada)
+        figuras.update(proporcoes=fig_proporcoes, dispersao=fig_dispersao)
+
+    try:
+        imprimir_metricas(df, tabela_proporcoes, anos)
+    except Exception as e:
+        print("[ERRO ao gerar métricas]", e)
+        traceback.print_exc()
+
+    return {'tabelas': tabelas, 'figuras': figuras}
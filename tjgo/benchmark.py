@@ -0,0 +1,255 @@
+'''Benchmark das Etapas:
+- Mede tempo (relógio e CPU) e pico de memória de cada etapa das análises sobre conjuntos
+sintéticos (tjgo.sintetico) de 1M, 10M e 50M linhas: ingestão, normalização de sigilo/datas,
+validação de OAB, explode, processar_dados, métricas de crescimento, formatação, figuras e
+classificação (melhorias).
+- Cada tamanho roda em um processo separado (memória isolada e limite de tempo); os resultados
+são gravados em JSON para comparar execuções (tjgo bench --comparar anterior.json).'''
+
+# --- BIBLIOTECAS NECESSÁRIAS ---
+import json
+import multiprocessing
+import os
+import queue
+import time
+from datetime import datetime
+
+from tjgo.dados import ANOS_PADRAO
+from tjgo.instrumentacao import ambiente
+from tjgo.memoria import formatar_bytes, pico_rss, rss_atual, zerar_pico_rss
+
+TAMANHOS_PADRAO = [1_000_000, 10_000_000, 50_000_000]
+PASTA_DADOS_PADRAO = '.bench_tjgo'
+VERSAO_RESULTADOS = 1
+
+# Chaves de processar_dados/crescimento/figuras (mesmas da analise3)
+CHAVES_BENCH = ['comarca', 'serventia']
+
+
+# --- ETAPAS ---
+# Cada etapa lê e grava no dicionário `estado`; devolve (linhas de entrada, linhas de saída[, extras]).
+def _ingestao(estado):
+    from tjgo.dados import carregar_dados
+    estado['df'] = carregar_dados(estado['pasta'])
+    return None, len(estado['df'])
+
+
+def _normalizacao(estado):
+    from tjgo.dados import tratar_dados
+    estado['df'] = tratar_dados(estado['df'])
+    return len(estado['df']), len(estado['df'])
+
+
+def _validacao_oab(estado):
+    from tjgo.dados import filtrar_oabs_validas
+    estado['df_validos'] = filtrar_oabs_validas(estado['df'])
+    return len(estado['df']), len(estado['df_validos'])
+
+
+def _explode(estado):
+    from tjgo.dados import explodir_advogados
+    estado['df_advogados'] = explodir_advogados(estado['df_validos'])
+    return len(estado['df_validos']), len(estado['df_advogados'])
+
+
+def _processar_dados(estado):
+    from tjgo.agregacao import contagens_anuais
+    _, estado['tabela_final'] = contagens_anuais(estado['df'], CHAVES_BENCH, estado['anos'])
+    return len(estado['df']), len(estado['tabela_final'])
+
+
+def _crescimento(estado):
+    from tjgo.agregacao import montar_tabela_proporcoes
+    from tjgo.estatisticas import calcular_crescimento
+
+    anos = estado['anos']
+    tabela = montar_tabela_proporcoes(estado['tabela_final'], CHAVES_BENCH, anos)
+    (tabela['crescimento_percentual_volume'], tabela['cagr_volume'], tabela['ano_base']) = (
+        calcular_crescimento(tabela[[f'total_{ano}' for ano in anos]], anos))
+    estado['tabela_proporcoes'] = tabela
+    return len(estado['tabela_final']), len(tabela)
+
+
+def _formatacao(estado):
+    from tjgo.agregacao import formatar_tabela_proporcoes
+    estado['tabela_formatada'] = formatar_tabela_proporcoes(estado['tabela_proporcoes'], estado['anos'])
+    return len(estado['tabela_proporcoes']), len(estado['tabela_formatada'])
+
+
+def _figuras(estado):
+    """Constrói as figuras da analise3 e as serializa (custo real de exibir/exportar)."""
+    from tjgo import graficos
+
+    anos = estado['anos']
+    tabela = estado['tabela_proporcoes'].assign(
+        rotulo=estado['tabela_proporcoes']['serventia'] + ' - ' + estado['tabela_proporcoes']['comarca'])
+    fig_tabela = graficos.figura_tabela(
+        estado['tabela_formatada'],
+        graficos.colunas_tabela_proporcoes([('serventia', 'Serventia'), ('comarca', 'Comarca')], anos),
+        titulo='Benchmark')
+    colunas_hover = ['variacao_total_sigilosos'] + [f'sigilosos_{ano}' for ano in anos]
+    fig_dispersao = graficos.dispersao_estrategica(
+        tabela, 'rotulo', colunas_hover, ['%{hovertext}'], anos)
+    tamanho = len(fig_tabela.to_json()) + len(fig_dispersao.to_json())
+    return len(tabela), len(tabela), {'json_bytes': tamanho}
+
+
+def _classificacao(estado):
+    from tjgo.analises import melhorias
+
+    melhorias._progresso = lambda iteravel, desc=None: iteravel
+    tabela = melhorias.processar_dados_melhorado(estado['df_advogados'], anos=estado['anos'])
+    tabela = melhorias.classificar_estrategicamente_melhorado(tabela)
+    return len(estado['df_advogados']), len(tabela)
+
+
+# (nome, função, etapas das quais depende)
+ETAPAS = [
+    ('ingestao', _ingestao, ()),
+    ('normalizacao', _normalizacao, ('ingestao',)),
+    ('validacao_oab', _validacao_oab, ('normalizacao',)),
+    ('explode', _explode, ('validacao_oab',)),
+    ('processar_dados', _processar_dados, ('normalizacao',)),
+    ('crescimento', _crescimento, ('processar_dados',)),
+    ('formatacao', _formatacao, ('crescimento',)),
+    ('figuras', _figuras, ('formatacao',)),
+    # Por último: o laço por OAB da melhorias é a etapa mais lenta e costuma atingir o limite de tempo
+    ('classificacao', _classificacao, ('explode',)),
+]
+
+
+def selecionar_etapas(pular=()):
+    """Nomes das etapas a medir; falha se uma etapa pulada for necessária para outra."""
+    pular = set(pular)
+    desconhecidas = pular - {nome for nome, _, _ in ETAPAS}
+    if desconhecidas:
+        raise ValueError(f"Etapas desconhecidas: {', '.join(sorted(desconhecidas))}")
+    for nome, _, requer in ETAPAS:
+        if nome not in pular and pular & set(requer):
+            raise ValueError(f"A etapa '{nome}' depende de {sorted(pular & set(requer))}")
+    return [nome for nome, _, _ in ETAPAS if nome not in pular]
+
+
+def medir(funcao, *args, tracemalloc_ativo=False):
+    """Executa funcao(*args) medindo relógio, CPU, pico de RSS e (opcional) pico do tracemalloc."""
+    import tracemalloc
+
+    zerar_pico_rss()
+    rss_inicio = rss_atual()
+    if tracemalloc_ativo:
+        tracemalloc.start()
+    cpu, relogio = time.process_time(), time.perf_counter()
+    resultado = funcao(*args)
+    medicao = {
+        'tempo_s': time.perf_counter() - relogio,
+        'cpu_s': time.process_time() - cpu,
+        'rss_inicio_bytes': rss_inicio,
+        'pico_rss_bytes': pico_rss(),
+        'pico_tracemalloc_bytes': None,
+    }
+    if tracemalloc_ativo:
+        medicao['pico_tracemalloc_bytes'] = tracemalloc.get_traced_memory()[1]
+        tracemalloc.stop()
+    return resultado, medicao
+
+
+def _executar_tamanho(pasta, anos, etapas, tracemalloc_ativo, fila):
+    """Processo filho: mede as etapas em ordem e envia cada resultado assim que termina."""
+    estado = {'pasta': pasta, 'anos': anos}
+    funcoes = {nome: funcao for nome, funcao, _ in ETAPAS}
+    for nome in etapas:
+        try:
+            (linhas_entrada, linhas_saida, *extras), medicao = medir(
+                funcoes[nome], estado, tracemalloc_ativo=tracemalloc_ativo)
+            fila.put({'etapa': nome, 'status': 'ok', 'linhas_entrada': linhas_entrada,
+                      'linhas_saida': linhas_saida, **medicao, **(extras[0] if extras else {})})
+        except Exception as e:
+            fila.put({'etapa': nome, 'status': 'erro', 'erro': f"{type(e).__name__}: {e}"})
+            break
+    fila.put(None)
+
+
+def preparar_dados(linhas, pasta_dados=PASTA_DADOS_PADRAO, anos=ANOS_PADRAO, semente=42):
+    """Pasta com o conjunto sintético de `linhas` linhas, gerado apenas na primeira vez."""
+    from tjgo.sintetico import gerar_dados
+
+    pasta = os.path.join(pasta_dados, f'{linhas}_{semente}_{anos[0]}-{anos[-1]}')
+    marcador = os.path.join(pasta, '.completo')
+    if not os.path.exists(marcador):
+        gerar_dados(pasta, linhas=linhas, anos=anos, semente=semente)
+        open(marcador, 'w').close()
+    return pasta
+
+
+def executar_benchmark(tamanhos=TAMANHOS_PADRAO, pasta_dados=PASTA_DADOS_PADRAO, anos=ANOS_PADRAO,
+                       pular=(), limite_segundos=3600, tracemalloc_ativo=False, saida=None):
+    """
+    Mede as etapas para cada tamanho, um processo por tamanho. Se o limite de tempo estourar,
+    a etapa em curso é registrada com status 'tempo_esgotado' e as seguintes não rodam.
+    Retorna o dicionário de resultados (e o grava em `saida`, se informado).
+    """
+    etapas = selecionar_etapas(pular)
+    contexto = multiprocessing.get_context('spawn')
+    resultados = {
+        'versao': VERSAO_RESULTADOS,
+        'inicio': datetime.now().isoformat(timespec='seconds'),
+        'ambiente': ambiente(),
+        'parametros': {'anos': list(anos), 'limite_segundos': limite_segundos,
+                       'tracemalloc': tracemalloc_ativo},
+        'execucoes': [],
+    }
+
+    for linhas in tamanhos:
+        pasta = preparar_dados(linhas, pasta_dados, anos)
+        print(f"\n=== {linhas:,} linhas ({pasta}) ===")
+        fila = contexto.Queue()
+        processo = contexto.Process(target=_executar_tamanho,
+                                    args=(pasta, list(anos), etapas, tracemalloc_ativo, fila))
+        processo.start()
+        prazo = time.monotonic() + limite_segundos
+        medidas = []
+        while True:
+            try:
+                medida = fila.get(timeout=max(prazo - time.monotonic(), 0.01))
+            except queue.Empty:
+                feitas = {m['etapa'] for m in medidas}
+                pendente = next(nome for nome in etapas if nome not in feitas)
+                medidas.append({'etapa': pendente, 'status': 'tempo_esgotado'})
+                print(f"{pendente:<16} tempo esgotado ({limite_segundos}s)")
+                processo.terminate()
+                break
+            if medida is None:
+                break
+            medidas.append(medida)
+            if medida['status'] == 'ok':
+                print(f"{medida['etapa']:<16} {medida['tempo_s']:>9.2f}s  cpu {medida['cpu_s']:>9.2f}s  "
+                      f"pico RSS {formatar_bytes(medida['pico_rss_bytes']):>10}  "
+                      f"linhas {medida['linhas_entrada'] or '-'} -> {medida['linhas_saida']}")
+            else:
+                print(f"{medida['etapa']:<16} {medida['status']}: {medida.get('erro')}")
+        processo.join()
+        resultados['execucoes'].append({'linhas': linhas, 'pasta': pasta, 'etapas': medidas})
+
+        if saida:
+            # Grava a cada tamanho para não perder resultados de execuções longas
+            with open(saida, 'w', encoding='utf-8') as f:
+                json.dump(resultados, f, indent=2, ensure_ascii=False)
+    return resultados
+
+
+def comparar(anterior, atual):
+    """Tabela (DataFrame) de tempo e pico de RSS por (linhas, etapa) entre duas execuções."""
+    import pandas as pd
+
+    def achatar(resultados, sufixo):
+        linhas = [{'linhas': e['linhas'], 'etapa': m['etapa'],
+                   f'tempo_s_{sufixo}': m.get('tempo_s'), f'pico_rss_mb_{sufixo}': (m.get('pico_rss_bytes') or 0) / 2**20}
+                  for e in resultados['execucoes'] for m in e['etapas']]
+        return pd.DataFrame(linhas, columns=['linhas', 'etapa', f'tempo_s_{sufixo}', f'pico_rss_mb_{sufixo}'])
+
+    tabela = achatar(anterior, 'anterior').merge(achatar(atual, 'atual'), on=['linhas', 'etapa'], how='outer')
+    ordem = {nome: i for i, (nome, _, _) in enumerate(ETAPAS)}
+    tabela = tabela.sort_values(['linhas', 'etapa'], key=lambda s: s.map(ordem) if s.name == 'etapa' else s)
+    tabela['razao_tempo'] = tabela['tempo_s_atual'] / tabela['tempo_s_anterior']
+    tabela['razao_memoria'] = tabela['pico_rss_mb_atual'] / tabela['pico_rss_mb_anterior']
+    return tabela
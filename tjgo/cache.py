@@ -0,0 +1,159 @@
+'''Cache em Disco dos Estágios:
+- Guarda DataFrames intermediários (dados tratados, tabela_final, tabela_proporcoes,
+tabela_melhorada) em Parquet (pyarrow), com chave = hash de (impressão dos CSVs de entrada,
+parâmetros da carga como a deduplicação, código-fonte das funções do estágio, parâmetros).
+Sem pyarrow, usa pickle.
+- O diretório tem tamanho máximo; ao ultrapassá-lo, as entradas usadas há mais tempo são removidas.'''
+
+# --- BIBLIOTECAS NECESSÁRIAS ---
+import hashlib
+import inspect
+import json
+import os
+import pickle
+import sys
+import tempfile
+import threading
+
+import pandas as pd
+
+DIRETORIO_PADRAO = '.cache_tjgo'
+LIMITE_PADRAO_MB = 1024
+
+# Incrementar quando o formato das entradas mudar
+VERSAO_FORMATO = 1
+
+
+def impressao_arquivos(caminhos):
+    """Impressão digital dos arquivos de entrada: (caminho absoluto, tamanho, mtime em ns)."""
+    impressao = []
+    for caminho in sorted(caminhos):
+        info = os.stat(caminho)
+        impressao.append((os.path.abspath(caminho), info.st_size, info.st_mtime_ns))
+    return impressao
+
+
+def _fonte(funcao):
+    try:
+        return inspect.getsource(funcao)
+    except (OSError, TypeError):
+        return getattr(funcao, '__qualname__', repr(funcao))
+
+
+def _tem_pyarrow():
+    try:
+        import pyarrow  # noqa: F401
+    except ImportError:
+        return False
+    return True
+
+
+class CacheDisco:
+    """
+    Cache de DataFrames em disco, com despejo LRU por tamanho total.
+    entradas: arquivos de dados cujo conteúdo invalida todas as entradas quando muda.
+    carga: parâmetros da carga que mudam as linhas do quadro tratado (ex.: política de
+    deduplicação); entram na chave de todas as entradas, como as entradas.
+    """
+
+    def __init__(self, diretorio=DIRETORIO_PADRAO, limite_mb=LIMITE_PADRAO_MB, entradas=(), carga=None):
+        self.diretorio = diretorio
+        self.limite_bytes = int(limite_mb * 1024 * 1024)
+        self.impressao = impressao_arquivos(entradas)
+        self.carga = dict(carga or {})
+        self.parquet = _tem_pyarrow()
+        self._trava = threading.Lock()
+        os.makedirs(diretorio, exist_ok=True)
+
+    def chave(self, nome, fontes=(), parametros=None):
+        conteudo = json.dumps({
+            'versao': VERSAO_FORMATO,
+            'nome': nome,
+            'entradas': self.impressao,
+            'carga': self.carga,
+            'fontes': [_fonte(f) for f in fontes],
+            'parametros': parametros or {},
+        }, sort_keys=True, default=str)
+        return f"{nome}-{hashlib.sha256(conteudo.encode('utf-8')).hexdigest()[:32]}"
+
+    def _caminhos(self, chave):
+        base = os.path.join(self.diretorio, chave)
+        return base + '.parquet', base + '.pkl'
+
+    def ler(self, chave):
+        """DataFrame guardado na chave, ou None. Um acerto renova a entrada (LRU)."""
+        for caminho in self._caminhos(chave):
+            try:
+                if caminho.endswith('.parquet'):
+                    df = pd.read_parquet(caminho)
+                else:
+                    with open(caminho, 'rb') as f:
+                        df = pickle.load(f)
+                os.utime(caminho)
+                return df
+            except FileNotFoundError:
+                continue
+        return None
+
+    def gravar(self, chave, df):
+        """Grava de forma atômica (arquivo temporário + rename) e aplica o limite de tamanho."""
+        parquet, pkl = self._caminhos(chave)
+        fd, temporario = tempfile.mkstemp(dir=self.diretorio, suffix='.tmp')
+        os.close(fd)
+        try:
+            destino = pkl
+            if self.parquet:
+                try:
+                    df.to_parquet(temporario, index=False)
+                    destino = parquet
+                except (ValueError, TypeError, ImportError) as e:
+                    # Colunas com tipos mistos não são representáveis em Parquet
+                    print(f"[cache] {chave}: Parquet indisponível ({e}); usando pickle", file=sys.stderr)
+            if destino == pkl:
+                with open(temporario, 'wb') as f:
+                    pickle.dump(df, f, protocol=pickle.HIGHEST_PROTOCOL)
+            os.replace(temporario, destino)
+        finally:
+            if os.path.exists(temporario):
+                os.remove(temporario)
+        self.despejar()
+
+    def despejar(self):
+        """Remove as entradas menos recentemente usadas até caber no limite."""
+        with self._trava:
+            entradas = []
+            for nome in os.listdir(self.diretorio):
+                if not nome.endswith(('.parquet', '.pkl')):
+                    continue
+                caminho = os.path.join(self.diretorio, nome)
+                try:
+                    info = os.stat(caminho)
+                except FileNotFoundError:
+                    continue
+                entradas.append((info.st_mtime_ns, info.st_size, caminho))
+
+            total = sum(tamanho for _, tamanho, _ in entradas)
+            for _, tamanho, caminho in sorted(entradas):
+                if total <= self.limite_bytes:
+                    break
+                try:
+                    os.remove(caminho)
+                except FileNotFoundError:
+                    pass
+                total -= tamanho
+
+    def obter(self, nome, calcular, parametros=None, fontes=()):
+        """Lê o estágio do cache ou o calcula com calcular() e grava o resultado."""
+        chave = self.chave(nome, fontes, parametros)
+        df = self.ler(chave)
+        if df is None:
+            df = calcular()
+            self.gravar(chave, df)
+        return df
+
+
+def memorizar(cache, nome, calcular, parametros=None, fontes=()):
+    """cache.obter(...) quando há cache; caso contrário apenas calcular()."""
+    if cache is None:
+        return calcular()
+    return cache.obter(nome, calcular, parametros=parametros, fontes=fontes)
@@ -0,0 +1,203 @@
+'''Canonicalização dos Nomes de Comarca, Serventia e Área de Ação:
+- Variantes de grafia ('GOIÂNIA', 'Goiania', '1ª VARA CIVEL', 'V. Cível'...) dividem uma mesma
+unidade em várias linhas das tabelas. Cada nome é normalizado (sem acentos, minúsculo, sem
+pontuação, abreviações expandidas); nomes com a mesma forma normalizada são unificados.
+- Quase-duplicatas (erros de digitação) são encontradas por um índice de bloqueio de trigramas:
+só pares que compartilham trigramas pouco frequentes e têm Jaccard dos trigramas suficiente são
+comparados (razão de similaridade do difflib), nunca todos os pares. Nomes com números
+diferentes ('1ª Vara' x '2ª Vara') nunca são unificados.
+- O resultado é uma tabela de mapeamento (coluna, original, canonico, ...) gravada em CSV, que
+pode ser revisada à mão e é aplicada na carga (tratar_dados) como remapeamento das categorias.'''
+
+# --- BIBLIOTECAS NECESSÁRIAS ---
+import difflib
+import re
+import unicodedata
+
+import numpy as np
+import pandas as pd
+
+from tjgo.dados import COLUNAS_TEXTO, codificar
+from tjgo.instrumentacao import etapa
+
+ARQUIVO_PADRAO = 'canonicos.csv'
+COLUNAS_MAPEAMENTO = ['coluna', 'original', 'canonico', 'chave', 'similaridade', 'linhas']
+
+# Razão de similaridade (difflib) mínima entre duas chaves para unificá-las
+LIMIAR_PADRAO = 0.9
+
+# Jaccard mínimo dos trigramas para um par candidato ser comparado
+JACCARD_MINIMO = 0.3
+
+# Trigramas presentes em mais chaves que isso não formam blocos ('var', 'ara' em todas as varas)
+TAMANHO_MAXIMO_BLOCO = 200
+
+# Abreviações usuais nas extrações, expandidas por token depois da normalização
+ABREVIACOES = {
+    'v': 'vara', 'vr': 'vara', 'jz': 'juizado', 'jec': 'juizado especial civel',
+    'esp': 'especial', 'civ': 'civel', 'crim': 'criminal', 'fam': 'familia',
+    'faz': 'fazenda', 'pub': 'publica', 'mun': 'municipal', 'est': 'estadual',
+    'inf': 'infancia', 'juv': 'juventude', 'exec': 'execucao', 'sta': 'santa', 'sto': 'santo',
+}
+
+_NAO_ALFANUMERICO = re.compile(r'[^0-9a-z]+')
+_DIGITOS = re.compile(r'\d+')
+
+
+# --- NORMALIZAÇÃO ---
+def normalizar_nome(texto):
+    """Chave de comparação: sem acentos, minúscula, sem pontuação e com abreviações expandidas."""
+    texto = unicodedata.normalize('NFKD', str(texto))  # 'ª' -> 'a', 'Â' -> 'A' + acento
+    texto = ''.join(c for c in texto if not unicodedata.combining(c)).casefold()
+    tokens = _NAO_ALFANUMERICO.sub(' ', texto).split()
+    return ' '.join(ABREVIACOES.get(token, token) for token in tokens)
+
+
+def trigramas(chave):
+    """Conjunto de trigramas de caracteres da chave, com bordas marcadas por espaço."""
+    texto = f' {chave} '
+    return {texto[i:i + 3] for i in range(len(texto) - 2)}
+
+
+# --- ÍNDICE DE BLOQUEIO ---
+def pares_candidatos(chaves, tamanho_maximo_bloco=TAMANHO_MAXIMO_BLOCO):
+    """
+    Pares (i, j, trigramas em comum), i < j, de chaves que compartilham ao menos um trigrama
+    de um bloco com até tamanho_maximo_bloco chaves. Produto esparso da matriz de incidência
+    chave × trigrama pela sua transposta, restrito às colunas (blocos) mantidas.
+    """
+    from scipy import sparse
+
+    conjuntos = [trigramas(chave) for chave in chaves]
+    vocabulario = {}
+    linhas, colunas = [], []
+    for i, conjunto in enumerate(conjuntos):
+        for trigrama in conjunto:
+            linhas.append(i)
+            colunas.append(vocabulario.setdefault(trigrama, len(vocabulario)))
+
+    incidencia = sparse.csr_matrix((np.ones(len(linhas), dtype=np.int32), (linhas, colunas)),
+                                   shape=(len(chaves), len(vocabulario)))
+    tamanhos = np.asarray([len(c) for c in conjuntos])
+
+    # Blocos grandes demais não discriminam: saem da geração de candidatos
+    por_bloco = np.asarray(incidencia.sum(axis=0)).ravel()
+    blocos = incidencia[:, np.flatnonzero((por_bloco > 1) & (por_bloco <= tamanho_maximo_bloco))]
+    candidatos = sparse.triu(blocos @ blocos.T, k=1).tocoo()
+
+    # O número de trigramas em comum usa todos os trigramas, não só os dos blocos
+    comuns = np.asarray(incidencia[candidatos.row].multiply(incidencia[candidatos.col]).sum(axis=1)).ravel()
+    return candidatos.row, candidatos.col, comuns, tamanhos
+
+
+def _raiz(pais, i):
+    while pais[i] != i:
+        pais[i] = pais[pais[i]]
+        i = pais[i]
+    return i
+
+
+def agrupar_chaves(chaves, limiar=LIMIAR_PADRAO, tamanho_maximo_bloco=TAMANHO_MAXIMO_BLOCO):
+    """
+    Grupo (índice da raiz) de cada chave e sua maior similaridade com outra chave do grupo
+    (1 quando está sozinha). Pares candidatos com Jaccard >= JACCARD_MINIMO, os mesmos números
+    e razão de similaridade >= limiar são unidos (união-busca).
+    """
+    n = len(chaves)
+    pais = list(range(n))
+    ligacao = np.zeros(n)
+    if n < 2:
+        return np.arange(n), np.ones(n)
+
+    i, j, comuns, tamanhos = pares_candidatos(chaves, tamanho_maximo_bloco)
+    jaccard = comuns / (tamanhos[i] + tamanhos[j] - comuns)
+    numeros = [tuple(_DIGITOS.findall(chave)) for chave in chaves]
+    comparar = jaccard >= JACCARD_MINIMO
+    for a, b in zip(i[comparar], j[comparar]):
+        if numeros[a] != numeros[b]:
+            continue
+        s = difflib.SequenceMatcher(None, chaves[a], chaves[b]).ratio()
+        if s < limiar:
+            continue
+        raiz_a, raiz_b = _raiz(pais, a), _raiz(pais, b)
+        if raiz_a != raiz_b:
+            pais[max(raiz_a, raiz_b)] = min(raiz_a, raiz_b)
+        ligacao[a], ligacao[b] = max(ligacao[a], s), max(ligacao[b], s)
+    return np.array([_raiz(pais, k) for k in range(n)]), np.where(ligacao > 0, ligacao, 1.0)
+
+
+# --- MAPEAMENTO ---
+def mapear_coluna(serie, limiar=LIMIAR_PADRAO):
+    """
+    Tabela de mapeamento de uma coluna: uma linha por valor distinto, com a chave normalizada
+    e o nome canônico do grupo: a grafia mais frequente da chave mais frequente do grupo; no
+    empate, a com mais acentos e minúsculas ('Goiânia' antes de 'GOIANIA'), depois a alfabética.
+    """
+    contagens = serie.value_counts(sort=False)
+    contagens = contagens[contagens > 0]
+    tabela = pd.DataFrame({'original': contagens.index.astype(str), 'linhas': contagens.to_numpy()})
+    tabela['chave'] = tabela['original'].map(normalizar_nome)
+
+    # Primeiro nível: mesma chave normalizada; segundo: quase-duplicatas entre as chaves
+    chaves = pd.Index(tabela['chave'].unique())
+    grupos, similaridade = agrupar_chaves(list(chaves), limiar)
+    posicao = chaves.get_indexer(tabela['chave'])
+    tabela['grupo'] = grupos[posicao]
+    tabela['similaridade'] = similaridade[posicao].round(4)
+
+    acentos = tabela['original'].map(lambda v: sum(not c.isascii() for c in v))
+    minusculas = tabela['original'].map(lambda v: sum(c.islower() for c in v))
+    linhas_chave = tabela.groupby('chave')['linhas'].transform('sum')
+    representantes = (tabela.assign(_linhas_chave=linhas_chave, _acentos=acentos, _minusculas=minusculas)
+                            .sort_values(['grupo', '_linhas_chave', 'linhas', '_acentos', '_minusculas', 'original'],
+                                         ascending=[True, False, False, False, False, True])
+                            .drop_duplicates('grupo').set_index('grupo')['original'])
+    tabela['canonico'] = tabela['grupo'].map(representantes)
+    tabela['coluna'] = serie.name
+    return tabela[COLUNAS_MAPEAMENTO].sort_values(['canonico', 'original']).reset_index(drop=True)
+
+
+def construir_mapeamento(df, colunas=COLUNAS_TEXTO, limiar=LIMIAR_PADRAO):
+    """Tabela de mapeamento das colunas de texto de um quadro tratado (tratar_dados)."""
+    with etapa('canonicalizacao.mapeamento', df) as e:
+        tabelas = [mapear_coluna(df[coluna], limiar) for coluna in colunas if coluna in df.columns]
+        return e.saida(pd.concat(tabelas, ignore_index=True))
+
+
+def gravar_mapeamento(mapeamento, caminho=ARQUIVO_PADRAO):
+    mapeamento.to_csv(caminho, index=False, encoding='utf-8')
+    return caminho
+
+
+def ler_mapeamento(caminho=ARQUIVO_PADRAO):
+    """{coluna: {original: canonico}} do CSV, só com os valores que mudam."""
+    tabela = pd.read_csv(caminho, encoding='utf-8', dtype=str, keep_default_na=False)
+    tabela = tabela[tabela['original'] != tabela['canonico']]
+    return {coluna: dict(zip(grupo['original'], grupo['canonico']))
+            for coluna, grupo in tabela.groupby('coluna', sort=False)}
+
+
+# --- APLICAÇÃO NA CARGA ---
+def remapear(serie, mapa):
+    """
+    Substitui os valores pelo nome canônico, uma vez por categoria (códigos preservados).
+    Categóricas continuam categóricas, com as categorias unificadas.
+    """
+    codigos, valores = codificar(serie)
+    valores = pd.Series(pd.Index(valores).astype(str), dtype=object)
+    novos = valores.map(mapa).fillna(valores).to_numpy(dtype=object)
+    if not isinstance(serie.dtype, pd.CategoricalDtype):
+        # Posição extra no fim: código -1 (nulo) continua nulo
+        return pd.Series(np.append(novos, np.nan)[codigos], index=serie.index, name=serie.name)
+    categorias, inverso = np.unique(novos, return_inverse=True)
+    return pd.Series(pd.Categorical.from_codes(np.append(inverso, -1)[codigos], categories=categorias),
+                     index=serie.index, name=serie.name)
+
+
+def aplicar_mapeamento(df, mapeamento):
+    """Remapeia em df as colunas presentes no mapeamento ({coluna: {original: canonico}})."""
+    with etapa('tratamento.canonicos', df):
+        for coluna, mapa in mapeamento.items():
+            if coluna in df.columns and mapa:
+                df[coluna] = remapear(df[coluna], mapa)
+    return df
@@ -0,0 +1,393 @@
+'''Linha de Comando:
+- Ponto de entrada único das análises. Exemplos:
+    tjgo run analise5 --years 2022-2024
+    tjgo run analise4 --years 2022-2024 --bootstrap 1000
+    tjgo run analise3 analise5 melhorias --years 2022-2024
+    tjgo run todas --sem-graficos
+    tjgo run todas --relatorio relatorio --relatorio-workers 4
+    tjgo run analise5 --cache .cache_tjgo
+    tjgo run analise3 --profile --saida saidas
+    tjgo run analise3 analise4 --top 20 --top-metrica total_sigilosos
+    tjgo run clusters --clusters 10 --relatorio relatorio
+    tjgo run todas --limite-memoria 2048
+    tjgo run todas --deduplicar ultimo_arquivo --relatorio-conflitos conflitos.csv
+    tjgo canonicalizar --saida canonicos.csv && tjgo run analise3 --canonicos canonicos.csv
+    tjgo servir --porta 8765 --cache
+    tjgo similares 12345GO 67890GO --k 10 --years 2022-2024 --cache .cache_tjgo
+    tjgo gerar --linhas 1000000 --saida dados_sinteticos
+    tjgo bench --linhas 1000000,10000000 --saida bench.json --comparar bench_anterior.json
+    tjgo list'''
+
+# --- BIBLIOTECAS NECESSÁRIAS ---
+import argparse
+import sys
+
+from tjgo.analises import ANALISES
+from tjgo.cache import DIRETORIO_PADRAO, LIMITE_PADRAO_MB
+from tjgo.dados import ANOS_PADRAO, PASTA_PADRAO, POLITICAS_DEDUP, parse_anos
+from tjgo.topn import METRICA_PADRAO, METRICAS
+
+SAIDA_PADRAO = 'saidas'
+
+
+def criar_cache(diretorio, limite_mb=LIMITE_PADRAO_MB, pasta=PASTA_PADRAO, canonicos=None, deduplicar=None):
+    """
+    CacheDisco invalidado pelos CSVs da pasta (e pelo mapeamento de nomes, quando usado) e
+    pela política de deduplicação, ou None quando diretorio é vazio.
+    """
+    if not diretorio:
+        return None
+    from tjgo.cache import CacheDisco
+    from tjgo.dados import listar_arquivos
+
+    entradas = [arquivo for arquivo, _ in listar_arquivos(pasta)] + ([canonicos] if canonicos else [])
+    return CacheDisco(diretorio, limite_mb=limite_mb, entradas=entradas, carga={'deduplicar': deduplicar})
+
+
+def executar_analises(nomes, anos=ANOS_PADRAO, pasta=PASTA_PADRAO, exibir=True,
+                      cache=None, cache_limite_mb=LIMITE_PADRAO_MB, saida=None, perfil=False,
+                      tracemalloc_ativo=False, relatorio=None, relatorio_workers=None,
+                      relatorio_formato='pacote', **opcoes):
+    """
+    Executa as análises com uma única carga dos dados e exibe as figuras (fig.show).
+    relatorio: pasta onde as figuras são gravadas como HTML estático, sem abrir o navegador
+    (matplotlib no backend Agg); relatorio_workers: processos que serializam as figuras;
+    relatorio_formato: 'pacote' (uma página por análise, dados uma vez) ou 'figuras'.
+    saida: pasta onde o log JSON da execução (tempo, CPU, linhas e memória por etapa) é gravado.
+    perfil: cProfile da execução (força execução sequencial: o cProfile só vê a thread principal).
+    """
+    import pandas as pd
+
+    from tjgo.instrumentacao import etapa, gravar_registro, imprimir_resumo, perfilar, registrar_execucao
+    from tjgo.pipeline import executar_analises as executar_pipeline
+
+    pd.set_option('display.max_columns', None)
+    if relatorio:
+        import matplotlib
+
+        matplotlib.use('Agg')
+    sequencial = (perfil or opcoes.get('max_workers') == 1 or opcoes.get('economizar')
+                  or bool(opcoes.get('limite_memoria_mb')))
+    with registrar_execucao(isolar_picos=sequencial, tracemalloc_ativo=tracemalloc_ativo) as registro:
+        with perfilar(saida or SAIDA_PADRAO, ativo=perfil) as caminhos_perfil:
+            resultados = executar_pipeline(nomes, anos=anos, pasta=pasta, sequencial=sequencial,
+                                           cache=criar_cache(cache, cache_limite_mb, pasta, opcoes.get('canonicos'),
+                                                             opcoes.get('deduplicar')),
+                                           **opcoes)
+
+            if relatorio:
+                from tjgo.relatorio import gerar_relatorio
+
+                gerar_relatorio(resultados, relatorio, max_workers=relatorio_workers, formato=relatorio_formato)
+            elif exibir:
+                for nome, resultado in resultados.items():
+                    for nome_fig, fig in resultado['figuras'].items():
+                        with etapa(f'exibir:{nome}:{nome_fig}'):
+                            fig.show()
+
+    if saida or perfil:
+        caminho = gravar_registro(
+            registro, saida or SAIDA_PADRAO, comando=sys.argv, analises=list(nomes), anos=list(anos),
+            dados=pasta, perfil=caminhos_perfil,
+            opcoes={chave: valor for chave, valor in opcoes.items() if isinstance(valor, (int, float, str, bool))})
+        imprimir_resumo(registro)
+        print(f"\nLog da execução gravado em {caminho}", file=sys.stderr)
+        if caminhos_perfil:
+            print(f"Perfil: {caminhos_perfil['relatorio']} ({caminhos_perfil['prof']})", file=sys.stderr)
+    return resultados
+
+
+def executar_analise(nome, anos=ANOS_PADRAO, pasta=PASTA_PADRAO, exibir=True, **opcoes):
+    """Carrega os dados, executa uma análise e exibe as figuras (fig.show)."""
+    return executar_analises([nome], anos=anos, pasta=pasta, exibir=exibir, **opcoes)[nome]
+
+
+def servir(pasta=PASTA_PADRAO, host='127.0.0.1', porta=None, cache=None, cache_limite_mb=LIMITE_PADRAO_MB,
+           deduplicar=None, canonicos=None):
+    """Monta o cubo de contagens (do cache, quando disponível) e inicia o serviço de consultas."""
+    from tjgo import servico
+    from tjgo.cache import memorizar
+    from tjgo.canonicalizacao import ler_mapeamento, remapear
+    from tjgo.dados import ETAPAS_CARGA, carregar_dados, deduplicar_processos, resumir_conflitos, tratar_dados
+
+    def construir():
+        df = tratar_dados(carregar_dados(pasta), canonicos=canonicos and ler_mapeamento(canonicos))
+        if deduplicar:
+            df, conflitos = deduplicar_processos(df, deduplicar)
+            print(resumir_conflitos(conflitos, deduplicar), file=sys.stderr)
+        return servico.construir_cubo(df)
+
+    servico.validar_host_local(host)
+    tabela_cubo = memorizar(
+        criar_cache(cache, cache_limite_mb, pasta, canonicos, deduplicar), 'cubo', construir,
+        parametros={'deduplicar': deduplicar},
+        fontes=ETAPAS_CARGA + (servico.construir_cubo, remapear),
+    )
+    cubo = servico.Cubo(tabela_cubo)
+    print(f"Cubo carregado: {len(tabela_cubo):,} células")
+    servico.servir(cubo, host=host, porta=porta or servico.PORTA_PADRAO)
+
+
+def similares(oabs, anos=ANOS_PADRAO, pasta=PASTA_PADRAO, k=None, cache=None,
+              cache_limite_mb=LIMITE_PADRAO_MB, saida=None, canonicos=None, deduplicar=None):
+    """
+    Advogados de carteira mais parecida com cada OAB (tjgo.similaridade). As carteiras incluem
+    os processos com vários advogados (dados.explodir_oabs_validas). Os perfis advogado × termo
+    ficam no cache; o índice é montado a cada chamada e as consultas levam ms.
+    """
+    import time
+
+    import pandas as pd
+
+    from tjgo import similaridade
+    from tjgo.cache import memorizar
+    from tjgo.dados import ETAPAS_CARGA, explodir_oabs_validas, oabs_por_linha
+    from tjgo.pipeline import _carregar_com_cache
+
+    cache = criar_cache(cache, cache_limite_mb, pasta, canonicos, deduplicar)
+
+    def calcular():
+        df = _carregar_com_cache(pasta, cache, deduplicar=deduplicar, canonicos=canonicos)
+        return similaridade.perfis_advogados(explodir_oabs_validas(df), anos)
+
+    perfis = memorizar(cache, 'perfis_advogados', calcular, parametros={'anos': list(anos)},
+                       fontes=ETAPAS_CARGA + (oabs_por_linha, explodir_oabs_validas, similaridade.perfis_advogados))
+    indice = similaridade.IndiceSimilaridade(perfis)
+
+    inicio = time.perf_counter()
+    resultado = indice.similares_lote(oabs, k or similaridade.K_PADRAO)
+    decorrido = time.perf_counter() - inicio
+    with pd.option_context('display.width', 200, 'display.max_rows', None):
+        print(resultado.to_string(index=False))
+    print(f"{len(indice):,} advogados indexados; {len(oabs)} consulta(s) em {decorrido * 1000:.1f} ms")
+    if saida:
+        resultado.to_csv(saida, index=False, encoding='utf-8')
+    return resultado
+
+
+def canonicalizar(pasta=PASTA_PADRAO, saida=None, colunas=None, limiar=None):
+    """Gera o CSV de mapeamento de nomes (tjgo.canonicalizacao) a partir dos CSVs da pasta."""
+    from tjgo import canonicalizacao
+    from tjgo.dados import COLUNAS_TEXTO, carregar_dados, tratar_dados
+
+    df = tratar_dados(carregar_dados(pasta, economizar=True), economizar=True)
+    mapeamento = canonicalizacao.construir_mapeamento(
+        df, colunas or COLUNAS_TEXTO, limiar or canonicalizacao.LIMIAR_PADRAO)
+    caminho = canonicalizacao.gravar_mapeamento(mapeamento, saida or canonicalizacao.ARQUIVO_PADRAO)
+
+    alterados = mapeamento[mapeamento['original'] != mapeamento['canonico']]
+    for coluna, grupo in mapeamento.groupby('coluna', sort=False):
+        print(f"{coluna}: {grupo['original'].nunique()} grafias -> {grupo['canonico'].nunique()} nomes")
+    print(f"{len(alterados)} grafias remapeadas; mapeamento gravado em {caminho}")
+    return mapeamento
+
+
+def benchmark(tamanhos, saida=None, comparar_com=None, **opcoes):
+    """Executa o benchmark das etapas e, opcionalmente, compara com um resultado anterior."""
+    import json
+
+    import pandas as pd
+
+    from tjgo import benchmark as bench
+
+    resultados = bench.executar_benchmark(tamanhos, saida=saida, **opcoes)
+    if saida:
+        print(f"\nResultados gravados em {saida}")
+    if comparar_com:
+        with open(comparar_com, encoding='utf-8') as f:
+            anterior = json.load(f)
+        with pd.option_context('display.width', 200, 'display.max_rows', None):
+            print(bench.comparar(anterior, resultados).round(3).to_string(index=False))
+    return resultados
+
+
+def _parse_inteiros(texto):
+    """'1000000,10000000' ou '1e6,1e7' -> lista de inteiros."""
+    return [int(float(parte)) for parte in texto.split(',') if parte.strip()]
+
+
+def _adicionar_opcao_deduplicar(parser):
+    parser.add_argument('--deduplicar', choices=list(POLITICAS_DEDUP), default=None,
+                        help="Reconcilia processos repetidos entre os CSVs anuais antes das agregações")
+
+
+def _adicionar_opcao_canonicos(parser):
+    parser.add_argument('--canonicos', default=None, metavar='CSV',
+                        help="Mapeamento de nomes (tjgo canonicalizar) aplicado a comarca, serventia e área")
+
+
+def _adicionar_opcoes_cache(parser):
+    parser.add_argument('--cache', nargs='?', const=DIRETORIO_PADRAO, default=None, metavar='DIR',
+                        help=f"Guarda os estágios em disco (padrão do diretório: {DIRETORIO_PADRAO})")
+    parser.add_argument('--cache-limite-mb', type=float, default=LIMITE_PADRAO_MB,
+                        help="Tamanho máximo do cache; as entradas menos usadas são removidas")
+
+
+def _tipo_anos(minimo=1):
+    """Tipo argparse de --years: parse_anos com a mensagem de erro no uso do comando."""
+    def converter(texto):
+        try:
+            return parse_anos(texto, minimo=minimo)
+        except ValueError as e:
+            raise argparse.ArgumentTypeError(str(e)) from None
+    return converter
+
+
+def criar_parser():
+    parser = argparse.ArgumentParser(prog='tjgo', description='Análises de processos judiciais sigilosos (TJGO).')
+    sub = parser.add_subparsers(dest='comando', required=True)
+
+    run = sub.add_parser('run', help='Executa uma ou mais análises (carga única dos dados)')
+    run.add_argument('analises', nargs='+', choices=list(ANALISES) + ['todas'], metavar='analise',
+                     help=f"Análises a executar ({', '.join(ANALISES)}) ou 'todas'")
+    run.add_argument('--years', '--anos', dest='anos', type=_tipo_anos(minimo=2),
+                     default=list(ANOS_PADRAO), help="Anos analisados, ex.: 2022-2024 ou 2022,2024")
+    run.add_argument('--dados', default=PASTA_PADRAO, help="Pasta com os CSVs processo(s)_AAAA.csv")
+    run.add_argument('--bootstrap', type=int, default=0, metavar='N',
+                     help="Réplicas bootstrap para ICs de variação/crescimento (0 = desativado)")
+    run.add_argument('--top', type=int, default=None, metavar='N',
+                     help="analise3/4/6: só as N maiores entidades nas figuras, mais uma linha 'Outros' exata")
+    run.add_argument('--top-metrica', choices=METRICAS, default=METRICA_PADRAO,
+                     help=f"Métrica que ordena o --top (padrão: {METRICA_PADRAO})")
+    run.add_argument('--clusters', dest='grupos', type=int, default=None, metavar='N',
+                     help="clusters: número de grupos de advogados (padrão: 8)")
+    run.add_argument('--sem-pressupostos', dest='pressupostos', action='store_false',
+                     help="Pula a verificação de pressupostos (ml_regressao)")
+    run.add_argument('--sem-graficos', dest='exibir', action='store_false',
+                     help="Não abre as figuras no navegador")
+    run.add_argument('--relatorio', default=None, metavar='DIR',
+                     help="Grava todas as figuras como HTML estático nesta pasta (sem navegador)")
+    run.add_argument('--relatorio-workers', type=int, default=None, metavar='N',
+                     help="Processos que gravam as figuras do relatório (padrão: núcleos; 1 = sequencial)")
+    run.add_argument('--relatorio-formato', choices=['pacote', 'figuras'], default='pacote',
+                     help="pacote: uma página por análise com os dados uma única vez; figuras: um HTML por figura")
+    _adicionar_opcoes_cache(run)
+    run.add_argument('--workers', type=int, default=None,
+                     help="Análises executadas em paralelo (padrão: automático; 1 = sequencial)")
+    run.add_argument('--saida', default=None, metavar='DIR',
+                     help="Grava o log JSON da execução (etapas, tempo, memória) nesta pasta")
+    run.add_argument('--profile', dest='perfil', action='store_true',
+                     help=f"Perfil cProfile da execução (sequencial), gravado em --saida ou {SAIDA_PADRAO}/")
+    run.add_argument('--tracemalloc', action='store_true',
+                     help="Registra também o pico do tracemalloc por etapa (mais lento)")
+    run.add_argument('--economizar-memoria', dest='economizar', action='store_true',
+                     help="Tipos compactos (categóricos, inteiros reduzidos) e uma análise por vez")
+    run.add_argument('--limite-memoria', dest='limite_memoria_mb', type=float, default=None, metavar='MB',
+                     help="Pico de RSS máximo; implica --economizar-memoria e interrompe a execução se excedido")
+    _adicionar_opcao_deduplicar(run)
+    run.add_argument('--relatorio-conflitos', default=None, metavar='CSV',
+                     help="Grava os processos repetidos entre arquivos e suas divergências (com --deduplicar)")
+    _adicionar_opcao_canonicos(run)
+
+    srv = sub.add_parser('servir', help='Serviço HTTP local de consultas agregadas')
+    srv.add_argument('--dados', default=PASTA_PADRAO, help="Pasta com os CSVs processo(s)_AAAA.csv")
+    srv.add_argument('--host', default='127.0.0.1', help="Endereço local (loopback) de escuta")
+    srv.add_argument('--porta', type=int, default=None, help="Porta TCP (padrão: 8765)")
+    _adicionar_opcoes_cache(srv)
+    _adicionar_opcao_deduplicar(srv)
+    _adicionar_opcao_canonicos(srv)
+
+    can = sub.add_parser('canonicalizar', help='Gera o mapeamento de grafias de comarca, serventia e área')
+    can.add_argument('--dados', default=PASTA_PADRAO, help="Pasta com os CSVs processo(s)_AAAA.csv")
+    can.add_argument('--saida', default='canonicos.csv', help="CSV do mapeamento (revisável à mão)")
+    can.add_argument('--colunas', default=None, help="Colunas, separadas por vírgula (padrão: as três)")
+    can.add_argument('--limiar', type=float, default=None,
+                     help="Similaridade mínima (0-1) para unificar quase-duplicatas (padrão: 0.9)")
+
+    sim = sub.add_parser('similares', help='Advogados com carteira parecida (áreas, comarcas e sigilo)')
+    sim.add_argument('oabs', nargs='+', metavar='OAB', help="OABs consultadas (ex.: 12345GO)")
+    sim.add_argument('--k', type=int, default=None, help="Vizinhos por OAB (padrão: 10)")
+    sim.add_argument('--years', '--anos', dest='anos', type=_tipo_anos(), default=list(ANOS_PADRAO))
+    sim.add_argument('--dados', default=PASTA_PADRAO, help="Pasta com os CSVs processo(s)_AAAA.csv")
+    sim.add_argument('--saida', default=None, metavar='CSV', help="Grava os vizinhos neste CSV")
+    _adicionar_opcoes_cache(sim)
+    _adicionar_opcao_deduplicar(sim)
+    _adicionar_opcao_canonicos(sim)
+
+    ger = sub.add_parser('gerar', help='Gera CSVs sintéticos no esquema dos dados do TJGO')
+    ger.add_argument('--linhas', type=int, default=100_000, help="Total de linhas (10 mil a 100 milhões)")
+    ger.add_argument('--years', '--anos', dest='anos', type=_tipo_anos(), default=list(ANOS_PADRAO))
+    ger.add_argument('--saida', default='dados_sinteticos', help="Pasta de saída")
+    ger.add_argument('--prefixo', choices=['processo', 'processos'], default='processos')
+    ger.add_argument('--semente', type=int, default=42)
+    ger.add_argument('--lote', type=int, default=None, help="Linhas geradas e gravadas por vez")
+
+    bch = sub.add_parser('bench', help='Mede tempo e memória de cada etapa em dados sintéticos')
+    bch.add_argument('--linhas', type=_parse_inteiros, default=None,
+                     help="Tamanhos dos conjuntos, ex.: 1e6,1e7,5e7 (padrão: 1M, 10M e 50M)")
+    bch.add_argument('--saida', default='benchmark.json', help="Arquivo JSON com os resultados")
+    bch.add_argument('--comparar', default=None, metavar='JSON', help="Resultado anterior para comparação")
+    bch.add_argument('--pasta-dados', default=None, help="Onde os conjuntos sintéticos são gerados/reutilizados")
+    bch.add_argument('--pular', default='', help="Etapas a não medir, separadas por vírgula (ex.: classificacao)")
+    bch.add_argument('--limite-segundos', type=float, default=3600, help="Tempo máximo por tamanho")
+    bch.add_argument('--tracemalloc', action='store_true', help="Mede também o pico do tracemalloc (mais lento)")
+
+    sub.add_parser('list', help='Lista as análises disponíveis')
+    return parser
+
+
+def main(argv=None):
+    args = criar_parser().parse_args(argv)
+
+    if args.comando == 'list':
+        for nome in ANALISES:
+            print(nome)
+        return 0
+
+    if args.comando == 'gerar':
+        from tjgo.sintetico import TAMANHO_LOTE_PADRAO, gerar_dados
+
+        gerar_dados(args.saida, linhas=args.linhas, anos=args.anos, semente=args.semente,
+                    tamanho_lote=args.lote or TAMANHO_LOTE_PADRAO, prefixo=args.prefixo)
+        return 0
+
+    if args.comando == 'bench':
+        from tjgo.benchmark import PASTA_DADOS_PADRAO, TAMANHOS_PADRAO
+
+        benchmark(args.linhas or TAMANHOS_PADRAO, saida=args.saida, comparar_com=args.comparar,
+                  pasta_dados=args.pasta_dados or PASTA_DADOS_PADRAO,
+                  pular=[p.strip() for p in args.pular.split(',') if p.strip()],
+                  limite_segundos=args.limite_segundos, tracemalloc_ativo=args.tracemalloc)
+        return 0
+
+    if args.comando == 'canonicalizar':
+        canonicalizar(pasta=args.dados, saida=args.saida, limiar=args.limiar,
+                      colunas=args.colunas and [c.strip() for c in args.colunas.split(',') if c.strip()])
+        return 0
+
+    if args.comando == 'servir':
+        servir(pasta=args.dados, host=args.host, porta=args.porta,
+               cache=args.cache, cache_limite_mb=args.cache_limite_mb, deduplicar=args.deduplicar,
+               canonicos=args.canonicos)
+        return 0
+
+    if args.comando == 'similares':
+        try:
+            similares(args.oabs, anos=args.anos, pasta=args.dados, k=args.k, cache=args.cache,
+                      cache_limite_mb=args.cache_limite_mb, saida=args.saida, canonicos=args.canonicos,
+                      deduplicar=args.deduplicar)
+        except KeyError as e:
+            print(f"Erro: {e.args[0]}", file=sys.stderr)
+            return 1
+        return 0
+
+    from tjgo.memoria import LimiteMemoriaExcedido
+
+    try:
+        executar_analises(args.analises, anos=args.anos, pasta=args.dados, exibir=args.exibir,
+                          max_workers=args.workers, bootstrap=args.bootstrap, pressupostos=args.pressupostos,
+                          top=args.top, top_metrica=args.top_metrica, grupos=args.grupos,
+                          cache=args.cache, cache_limite_mb=args.cache_limite_mb, saida=args.saida,
+                          perfil=args.perfil, tracemalloc_ativo=args.tracemalloc, economizar=args.economizar,
+                          limite_memoria_mb=args.limite_memoria_mb, deduplicar=args.deduplicar,
+                          relatorio_conflitos=args.relatorio_conflitos, canonicos=args.canonicos,
+                          relatorio=args.relatorio, relatorio_workers=args.relatorio_workers,
+                          relatorio_formato=args.relatorio_formato)
+    except LimiteMemoriaExcedido as e:
+        print(f"Erro: {e}", file=sys.stderr)
+        return 1
+    return 0
+
+
+if __name__ == '__main__':
+    sys.exit(main())
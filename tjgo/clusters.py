@@ -0,0 +1,184 @@
+'''Agrupamento de Advogados por Perfil de Atuação:
+- Cada advogado é descrito por atributos das contagens anuais (volume em escala log e proporção
+de sigilosos por ano), tendências (inclinação de mínimos quadrados do volume e da proporção de
+sigilosos ao longo dos anos) e composição por área de ação (participação de cada uma das
+AREAS_ATRIBUTOS áreas mais frequentes e das demais).
+- Em vez de cortes fixos (quadrantes de teste_analise2, classificacao_melhorada de melhorias),
+os grupos vêm de MiniBatchKMeans sobre os atributos padronizados, em float32: centenas de
+milhares de advogados são agrupados em segundos. Os grupos são renumerados pela proporção média
+de sigilosos (0 = maior) e resumidos numa tabela de perfis, nas unidades originais.'''
+
+# --- BIBLIOTECAS NECESSÁRIAS ---
+import numpy as np
+import pandas as pd
+
+from tjgo.agregacao import base_entidades, montar_tabela_final, montar_tabela_proporcoes
+from tjgo.cnj import coluna_processo
+from tjgo.dados import ANOS_PADRAO, codificar
+from tjgo.instrumentacao import etapa
+
+K_PADRAO = 8
+AREAS_ATRIBUTOS = 12
+TAMANHO_LOTE = 4096
+INICIALIZACOES = 3
+SEMENTE = 42
+
+
+# --- ATRIBUTOS ---
+def _inclinacao(valores):
+    """Inclinação de mínimos quadrados de cada linha de valores (colunas = anos consecutivos)."""
+    x = np.arange(valores.shape[1], dtype=np.float64)
+    x -= x.mean()
+    if not x.any():
+        return np.zeros(len(valores))
+    return (valores - valores.mean(axis=1, keepdims=True)) @ x / (x @ x)
+
+
+def composicao_areas(df_advogados, oabs, n_areas=AREAS_ATRIBUTOS):
+    """
+    Participação (%) das n_areas áreas de ação mais frequentes (por processos distintos) e das
+    demais ('area_outras') nos processos distintos de cada advogado de oabs.
+    """
+    processo = coluna_processo(df_advogados)
+    base = base_entidades(df_advogados, ['oab', 'nome_area_acao'])
+    base = base[['oab', processo, 'nome_area_acao']].drop_duplicates()
+    linhas = pd.Index(oabs).get_indexer(base['oab'].astype(str))
+    codigos, areas = codificar(base['nome_area_acao'])
+    validos = (linhas >= 0) & (codigos >= 0)
+    linhas, codigos = linhas[validos], codigos[validos]
+
+    # As n_areas mais frequentes ficam com uma coluna cada; as demais vão para a última
+    frequencia = np.bincount(codigos, minlength=len(areas))
+    principais = np.argsort(-frequencia, kind='stable')[:n_areas]
+    coluna = np.full(len(areas), len(principais), dtype=np.int64)
+    coluna[principais] = np.arange(len(principais))
+
+    n_colunas = len(principais) + 1
+    contagens = np.bincount(linhas * n_colunas + coluna[codigos],
+                            minlength=len(oabs) * n_colunas).reshape(len(oabs), n_colunas)
+    totais = contagens.sum(axis=1, keepdims=True)
+    participacao = np.divide(100.0 * contagens, totais, out=np.zeros(contagens.shape), where=totais > 0)
+    nomes = [f'area_{areas[i]}' for i in principais] + ['area_outras']
+    return pd.DataFrame(participacao, columns=nomes)
+
+
+def atributos_advogados(df_advogados, anos=ANOS_PADRAO, n_areas=AREAS_ATRIBUTOS):
+    """
+    Uma linha por advogado: oab, total_processos (não é atributo do agrupamento) e os atributos
+    (float32): log_total_<ano>, proporcao_sigilosos_<ano>, proporcao_media_sigilosos,
+    tendencia_volume (log por ano), tendencia_sigilosos (pontos percentuais por ano) e a
+    composição por área (composicao_areas).
+    """
+    anos = list(anos)
+    with etapa('clusters.atributos', df_advogados) as e:
+        base = base_entidades(df_advogados, ['oab'])
+        base = base[base['ano_distribuicao'].isin(anos)]
+        tabela = montar_tabela_proporcoes(montar_tabela_final(base, ['oab'], anos), ['oab'], anos)
+        tabela['oab'] = tabela['oab'].astype(str)
+
+        totais = tabela[[f'total_{ano}' for ano in anos]].to_numpy(dtype=np.float64)
+        proporcoes = tabela[[f'proporcao_sigilosos_{ano}' for ano in anos]].to_numpy(dtype=np.float64)
+        atributos = pd.DataFrame({'oab': tabela['oab'], 'total_processos': tabela['total_processos']})
+        for i, ano in enumerate(anos):
+            atributos[f'log_total_{ano}'] = np.log1p(totais[:, i])
+        for i, ano in enumerate(anos):
+            atributos[f'proporcao_sigilosos_{ano}'] = proporcoes[:, i]
+        atributos['proporcao_media_sigilosos'] = tabela['proporcao_media_sigilosos'].to_numpy()
+        atributos['tendencia_volume'] = _inclinacao(np.log1p(totais))
+        atributos['tendencia_sigilosos'] = _inclinacao(proporcoes)
+
+        no_periodo = df_advogados[df_advogados['ano_distribuicao'].isin(anos)]
+        areas = composicao_areas(no_periodo, atributos['oab'], n_areas)
+        atributos = pd.concat([atributos.reset_index(drop=True), areas], axis=1)
+        colunas = colunas_atributos(atributos)
+        atributos[colunas] = atributos[colunas].astype(np.float32)
+        return e.saida(atributos)
+
+
+def colunas_atributos(atributos):
+    """Colunas usadas no agrupamento (todas, exceto a OAB, o total e o grupo)."""
+    return [c for c in atributos.columns if c not in ('oab', 'total_processos', 'cluster')]
+
+
+# --- AGRUPAMENTO ---
+def agrupar(atributos, k=K_PADRAO, tamanho_lote=TAMANHO_LOTE, semente=SEMENTE):
+    """
+    (grupo de cada advogado, centros nas unidades originais) com MiniBatchKMeans sobre os
+    atributos padronizados (média 0, desvio 1) em float32. Grupos renumerados pela proporção
+    média de sigilosos dos seus advogados, da maior para a menor.
+    """
+    from sklearn.cluster import MiniBatchKMeans
+    from sklearn.preprocessing import StandardScaler
+
+    colunas = colunas_atributos(atributos)
+    k = max(1, min(k, len(atributos)))
+    with etapa('clusters.kmeans', atributos) as e:
+        padronizador = StandardScaler()
+        matriz = padronizador.fit_transform(atributos[colunas].to_numpy(dtype=np.float32))
+        modelo = MiniBatchKMeans(n_clusters=k, batch_size=tamanho_lote, n_init=INICIALIZACOES,
+                                 random_state=semente).fit(matriz)
+        centros = pd.DataFrame(padronizador.inverse_transform(modelo.cluster_centers_), columns=colunas)
+
+        # Ordem pela média do grupo (não do centro, que o mini-lote só aproxima)
+        rotulos = modelo.labels_
+        media = (np.bincount(rotulos, weights=atributos['proporcao_media_sigilosos'].to_numpy(), minlength=k)
+                 / np.maximum(np.bincount(rotulos, minlength=k), 1))
+        ordem = np.argsort(-media, kind='stable')
+        renumeracao = np.empty(k, dtype=np.int64)
+        renumeracao[ordem] = np.arange(k)
+        centros = centros.iloc[ordem].reset_index(drop=True)
+        return e.saida(renumeracao[rotulos]), centros
+
+
+def perfis_clusters(atributos, grupos, anos=ANOS_PADRAO):
+    """
+    Tabela de perfis, uma linha por grupo: advogados, processos (mediana e total das carteiras),
+    média de cada atributo e área predominante. Os volumes anuais voltam à escala de processos
+    (total_tipico_<ano>: expm1 da média de log_total_<ano>, uma média geométrica).
+    """
+    colunas = colunas_atributos(atributos)
+    tabela = atributos.assign(cluster=grupos)
+    por_grupo = tabela.groupby('cluster')
+    perfis = pd.DataFrame({
+        'advogados': por_grupo.size(),
+        'mediana_processos': por_grupo['total_processos'].median(),
+        'processos_carteiras': por_grupo['total_processos'].sum(),
+    })
+    medias = por_grupo[colunas].mean().astype(np.float64)
+    for ano in anos:
+        medias[f'log_total_{ano}'] = np.expm1(medias[f'log_total_{ano}'])
+    medias = medias.rename(columns={f'log_total_{ano}': f'total_tipico_{ano}' for ano in anos})
+    perfis = perfis.join(medias.round(2))
+
+    colunas_areas = [c for c in perfis.columns if c.startswith('area_')]
+    perfis['area_predominante'] = perfis[colunas_areas].idxmax(axis=1).str.slice(len('area_'))
+    return perfis.reset_index()
+
+
+def agrupar_advogados(atributos, k=K_PADRAO, anos=ANOS_PADRAO):
+    """(atributos com a coluna cluster, tabela de perfis) dos advogados."""
+    grupos, _ = agrupar(atributos, k)
+    return atributos.assign(cluster=grupos), perfis_clusters(atributos, grupos, anos)
+
+
+# --- FIGURA ---
+def figura_perfis(perfis, atributos, titulo=''):
+    """Mapa de calor dos perfis: desvio de cada atributo médio do grupo em relação a todos os advogados."""
+    import plotly.graph_objects as go
+
+    colunas = colunas_atributos(atributos)
+    valores = atributos[colunas].to_numpy(dtype=np.float64)
+    media, desvio = valores.mean(axis=0), valores.std(axis=0)
+    centros = np.vstack([valores[atributos['cluster'].to_numpy() == g].mean(axis=0) for g in perfis['cluster']])
+    padronizado = np.divide(centros - media, desvio, out=np.zeros_like(centros), where=desvio > 0)
+
+    rotulos = [f"Grupo {g} ({n:,} adv.)" for g, n in zip(perfis['cluster'], perfis['advogados'])]
+    fig = go.Figure(go.Heatmap(
+        z=padronizado, x=colunas, y=rotulos, customdata=centros,
+        colorscale='RdBu', reversescale=True, zmid=0,
+        colorbar=dict(title='Desvios-padrão'),
+        hovertemplate='<b>%{y}</b><br>%{x}: %{customdata:.2f}<br>%{z:+.2f} desvios-padrão<extra></extra>',
+    ))
+    fig.update_layout(title=titulo, title_x=0.5, height=max(400, 60 * len(rotulos) + 250),
+                      yaxis=dict(autorange='reversed'), xaxis=dict(tickangle=-45))
+    return fig
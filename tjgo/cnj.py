@@ -0,0 +1,176 @@
+'''Número Único CNJ dos Processos:
+- Parser vetorizado do número CNJ (NNNNNNN-DD.AAAA.J.TR.OOOO, Res. CNJ 65/2008, também aceito
+sem pontuação) em campos inteiros: sequencial, dígitos verificadores, ano do ajuizamento,
+segmento da justiça, tribunal e unidade de origem.
+- Validação dos dígitos verificadores (mod 97) da coluna inteira de uma vez.
+- Chave int64 compacta por processo (chave_processo), usada nas contagens de processos únicos e
+nas deduplicações no lugar da string: números válidos viram os campos empacotados em bits;
+números inválidos ou fora do formato recebem uma chave negativa distinta por valor.'''
+
+# --- BIBLIOTECAS NECESSÁRIAS ---
+import numpy as np
+import pandas as pd
+
+COLUNA_CHAVE = 'chave_processo'
+CAMPOS = ['sequencial', 'dv', 'ano', 'segmento', 'tribunal', 'origem']
+
+# Dígitos de cada campo no número sem pontuação (20 dígitos)
+LARGURAS = {'sequencial': 7, 'dv': 2, 'ano': 4, 'segmento': 1, 'tribunal': 2, 'origem': 4}
+# Posições da pontuação no número formatado (25 caracteres)
+SEPARADORES = {7: '-', 10: '.', 15: '.', 17: '.', 20: '.'}
+
+# Bits de cada campo na chave (do menos para o mais significativo); o DV não entra, pois é
+# determinado pelos demais campos. 24 + 14 + 7 + 4 + 14 = 63 bits: a chave é sempre >= 0.
+BITS_CHAVE = [('sequencial', 24), ('origem', 14), ('tribunal', 7), ('segmento', 4), ('ano', 14)]
+
+# Processo nulo: uma única chave (conta como um processo, ao contrário de NaN em nunique)
+CHAVE_NULA = np.iinfo(np.int64).min
+
+# Valores distintos processados por vez (limita as matrizes de caracteres em colunas enormes)
+TAMANHO_BLOCO = 1_000_000
+
+
+# --- DÍGITO VERIFICADOR ---
+def digito_verificador(sequencial, ano, segmento, tribunal, origem):
+    """DV do número CNJ: 98 - (NNNNNNN AAAA J TR OOOO 00 mod 97), em etapas que cabem em int64."""
+    resto = np.asarray(sequencial, dtype=np.int64) % 97
+    resto = (resto * 10**7 + np.asarray(ano, dtype=np.int64) * 1000
+             + np.asarray(segmento, dtype=np.int64) * 100 + np.asarray(tribunal, dtype=np.int64)) % 97
+    resto = (resto * 10**6 + np.asarray(origem, dtype=np.int64) * 100) % 97
+    return 98 - resto
+
+
+# --- PARSER ---
+def _matriz(valores, largura):
+    """Matriz (n × largura) de bytes de strings de mesmo comprimento (não ASCII vira '?')."""
+    texto = ''.join(valores).encode('ascii', errors='replace')
+    return np.frombuffer(texto, dtype=np.uint8).reshape(-1, largura)
+
+
+def _campos_digitos(digitos):
+    """Campos inteiros a partir da matriz (n × 20) de dígitos (0-9)."""
+    campos, inicio = {}, 0
+    for campo in CAMPOS:
+        largura = LARGURAS[campo]
+        potencias = 10 ** np.arange(largura - 1, -1, -1, dtype=np.int64)
+        campos[campo] = digitos[:, inicio:inicio + largura].astype(np.int64) @ potencias
+        inicio += largura
+    return campos
+
+
+def _parsear_valores(valores):
+    """
+    Campos de um array de strings distintas: dicionário campo -> int64 (-1 fora do formato),
+    mais 'formato_valido' e 'dv_valido'.
+    """
+    n = len(valores)
+    campos = {campo: np.full(n, -1, dtype=np.int64) for campo in CAMPOS}
+    formato_valido = np.zeros(n, dtype=bool)
+
+    comprimentos = np.fromiter(map(len, valores), dtype=np.int64, count=n)
+    # Espaços nas bordas só são removidos dos (raros) valores fora dos dois comprimentos
+    fora = (comprimentos != 25) & (comprimentos != 20)
+    if fora.any():
+        valores = valores.copy()
+        valores[fora] = [v.strip() for v in valores[fora]]
+        comprimentos[fora] = np.fromiter(map(len, valores[fora]), dtype=np.int64, count=int(fora.sum()))
+
+    colunas_digitos = [i for i in range(25) if i not in SEPARADORES]
+    for largura in (25, 20):
+        linhas = np.flatnonzero(comprimentos == largura)
+        if not linhas.size:
+            continue
+        matriz = _matriz(valores[linhas], largura)
+        ok = np.ones(linhas.size, dtype=bool)
+        if largura == 25:
+            for posicao, separador in SEPARADORES.items():
+                ok &= matriz[:, posicao] == ord(separador)
+            matriz = matriz[:, colunas_digitos]
+        digitos = matriz - np.uint8(ord('0'))  # não dígitos viram valores > 9 (uint8)
+        ok &= (digitos <= 9).all(axis=1)
+        linhas, digitos = linhas[ok], digitos[ok]
+        for campo, valores_campo in _campos_digitos(digitos).items():
+            campos[campo][linhas] = valores_campo
+        formato_valido[linhas] = True
+
+    dv = digito_verificador(campos['sequencial'], campos['ano'], campos['segmento'],
+                            campos['tribunal'], campos['origem'])
+    campos['formato_valido'] = formato_valido
+    campos['dv_valido'] = formato_valido & (dv == campos['dv'])
+    return campos
+
+
+def _codificar(serie):
+    """(códigos por linha, valores distintos como array de str); nulos = -1."""
+    if isinstance(serie.dtype, pd.CategoricalDtype):
+        codigos, valores = serie.cat.codes.to_numpy(), serie.cat.categories
+    else:
+        codigos, valores = pd.factorize(serie)
+    return codigos, pd.Index(valores).astype(str).to_numpy(dtype=object)
+
+
+def _parsear_distintos(valores):
+    """_parsear_valores em blocos de TAMANHO_BLOCO valores."""
+    partes = [_parsear_valores(valores[i:i + TAMANHO_BLOCO])
+              for i in range(0, len(valores), TAMANHO_BLOCO)] or [_parsear_valores(valores)]
+    return {campo: np.concatenate([parte[campo] for parte in partes]) for campo in partes[0]}
+
+
+def parsear_cnj(serie):
+    """
+    DataFrame com os campos inteiros do número CNJ de cada linha (-1 quando fora do formato) e
+    as colunas formato_valido e dv_valido. Cada valor distinto é interpretado uma vez.
+    """
+    codigos, valores = _codificar(serie)
+    campos = _parsear_distintos(valores)
+    # Posição extra no fim: código -1 (nulo) -> fora do formato
+    return pd.DataFrame({campo: np.append(vetor, -1 if vetor.dtype != bool else False)[codigos]
+                         for campo, vetor in campos.items()}, index=serie.index)
+
+
+def validar_cnj(serie):
+    """True quando o número está no formato CNJ e os dígitos verificadores conferem."""
+    return parsear_cnj(serie)['dv_valido']
+
+
+# --- CHAVE COMPACTA ---
+def empacotar(campos):
+    """Chave int64 a partir dos campos (arrays) sequencial, origem, tribunal, segmento e ano."""
+    chave, deslocamento = np.zeros(len(campos['sequencial']), dtype=np.int64), 0
+    for campo, bits in BITS_CHAVE:
+        chave |= np.asarray(campos[campo], dtype=np.int64) << deslocamento
+        deslocamento += bits
+    return chave
+
+
+def desempacotar(chaves):
+    """Campos (dicionário de arrays) de chaves >= 0; o DV é recalculado."""
+    chaves = np.asarray(chaves, dtype=np.int64)
+    campos, deslocamento = {}, 0
+    for campo, bits in BITS_CHAVE:
+        campos[campo] = (chaves >> deslocamento) & ((1 << bits) - 1)
+        deslocamento += bits
+    campos['dv'] = digito_verificador(campos['sequencial'], campos['ano'], campos['segmento'],
+                                      campos['tribunal'], campos['origem'])
+    return campos
+
+
+def chave_processo(serie):
+    """
+    Chave int64 por processo (mesma chave <=> mesmo processo):
+    - número CNJ válido (formato e DV): campos empacotados (>= 0), com ou sem pontuação;
+    - inválido ou fora do formato: -1, -2, ... (um por valor distinto, na ordem de aparição);
+    - nulo: CHAVE_NULA.
+    """
+    codigos, valores = _codificar(serie)
+    campos = _parsear_distintos(valores)
+    validos = campos['dv_valido']
+    chaves = np.where(validos, empacotar(campos), 0)
+    invalidos = np.flatnonzero(~validos)
+    chaves[invalidos] = -1 - np.arange(invalidos.size, dtype=np.int64)
+    return pd.Series(np.append(chaves, CHAVE_NULA)[codigos], index=serie.index, name=COLUNA_CHAVE)
+
+
+def coluna_processo(df):
+    """Coluna que identifica o processo: chave_processo quando presente, senão processo."""
+    return COLUNA_CHAVE if COLUNA_CHAVE in df.columns else 'processo'
@@ -0,0 +1,437 @@
+'''Carga e Tratamento dos Dados:
+- Leitura dos CSVs anuais da pasta uploads e normalização compartilhada por todas as análises
+(datas, flag de sigilo, textos e validação de OAB). Sigilo e datas são interpretados uma vez por
+valor distinto e o resultado é propagado às linhas pelos códigos (custo ~ valores únicos).
+- economizar=True (modo de economia de memória): textos repetidos como categóricos desde a
+leitura de cada CSV, data_baixa (não usada pelas análises) descartada, ano em float32 e o número
+do processo mantido só como chave int64.
+- deduplicar_processos: reconciliação de processos repetidos entre CSVs anuais (POLITICAS_DEDUP),
+com relatório de conflitos de data de distribuição e sigilo.'''
+
+# --- BIBLIOTECAS NECESSÁRIAS ---
+import glob
+import os
+import re
+import warnings
+
+import numpy as np
+import pandas as pd
+
+from tjgo import cnj
+from tjgo.cnj import COLUNA_CHAVE, chave_processo, coluna_processo
+from tjgo.instrumentacao import etapa
+
+PASTA_PADRAO = 'uploads'
+ANOS_PADRAO = [2022, 2023, 2024]
+
+# Aceita os dois padrões de nome usados nas extrações: processo_AAAA.csv e processos_AAAA.csv
+PADRAO_ARQUIVO = re.compile(r'processos?_(\d{4})\.csv$')
+
+COLUNAS_TEXTO = ['comarca', 'serventia', 'nome_area_acao']
+
+# Formatos de data aceitos, em ordem: o das extrações, ISO 8601 com hora e o brasileiro.
+# Sem inferência automática: '05/01/2022' nunca é lido como 1º de maio.
+FORMATOS_DATA = ('%Y-%m-%d', 'ISO8601', '%d/%m/%Y')
+
+# Colunas lidas no modo de economia (data_baixa não é usada pelas análises)
+COLUNAS_ECONOMIA = ['processo', 'data_distribuicao', 'is_segredo_justica', 'oab'] + COLUNAS_TEXTO
+
+# Colunas com poucos valores distintos interpretadas por tratar_dados. No modo de economia são
+# lidas como categóricas: o parser não cria um objeto por linha e a normalização usa as categorias
+COLUNAS_CODIFICADAS = ['data_distribuicao', 'data_baixa', 'is_segredo_justica']
+
+MAPA_SIGILO = {
+    'true': True, 'false': False,
+    '1': True, '0': False,
+    '1.0': True, '0.0': False,  # coluna 0/1 com nulos lida como float
+    'sim': True, 'não': False, 'nao': False
+}
+
+UFS_VALIDAS = ['GO', 'DF', 'SP', 'RJ', 'MG', 'RS', 'SC', 'PR', 'BA', 'PE',
+               'CE', 'MA', 'ES', 'AL', 'SE', 'PB', 'RN', 'PI', 'MT', 'MS',
+               'TO', 'PA', 'AP', 'AM', 'RR', 'AC', 'RO']
+PADRAO_OAB = re.compile(f"^[1-9]\\d*[A-Z]\\s({'|'.join(UFS_VALIDAS)})$")
+
+
+# 1) Carregar e concatenar os dados dos processos judiciais
+def listar_arquivos(pasta=PASTA_PADRAO):
+    """
+    Lista os CSVs anuais da pasta, como pares (caminho, ano do arquivo), em ordem de ano.
+    Um arquivo por ano: com processo_AAAA.csv e processos_AAAA.csv do mesmo ano, fica o
+    processos_ (com aviso), em vez de carregar o ano duas vezes.
+    """
+    por_ano = {}
+    for arquivo in sorted(glob.glob(os.path.join(pasta, 'processo*_*.csv'))):
+        m = PADRAO_ARQUIVO.search(os.path.basename(arquivo))
+        if m:
+            por_ano.setdefault(int(m.group(1)), []).append(arquivo)
+
+    arquivos = []
+    for ano, caminhos in sorted(por_ano.items()):
+        caminhos.sort(key=lambda c: not os.path.basename(c).startswith('processos_'))
+        if len(caminhos) > 1:
+            warnings.warn(f"Mais de um CSV para {ano}: usando {os.path.basename(caminhos[0])}, "
+                          f"ignorando {', '.join(os.path.basename(c) for c in caminhos[1:])}", stacklevel=2)
+        arquivos.append((caminhos[0], ano))
+    return arquivos
+
+
+def carregar_dados(pasta=PASTA_PADRAO, economizar=False):
+    """
+    Carrega e concatena todos os CSVs anuais, adicionando a coluna ano_arquivo.
+    economizar: lê só COLUNAS_ECONOMIA e converte os textos repetidos de cada arquivo em categóricos.
+    """
+    from tjgo.memoria import categorizar, concatenar
+
+    arquivos = listar_arquivos(pasta)
+    if not arquivos:
+        raise FileNotFoundError(f"Nenhum CSV encontrado no padrão '{pasta}/processo(s)_AAAA.csv'.")
+
+    with etapa('leitura_csv') as e:
+        dfs = []
+        for arquivo, ano in arquivos:
+            if economizar:
+                # Datas, sigilo e textos de baixa cardinalidade saem do parser como categóricos
+                df_ano = pd.read_csv(arquivo, sep=',', encoding='utf-8',
+                                     usecols=lambda col: col in COLUNAS_ECONOMIA,
+                                     dtype=dict.fromkeys(COLUNAS_CODIFICADAS + COLUNAS_TEXTO, 'category'))
+                categorizar(df_ano, ['oab'])
+                df_ano['ano_arquivo'] = np.int16(ano)
+            else:
+                df_ano = pd.read_csv(arquivo, sep=',', encoding='utf-8')
+                df_ano['ano_arquivo'] = ano  # Adicionar coluna com o ano do arquivo
+            dfs.append(df_ano)
+        return e.saida(concatenar(dfs))
+
+
+# 2) Tratamento dos Dados
+def codificar(serie):
+    """(códigos por linha, valores distintos): categorias prontas ou pd.factorize; nulos = -1."""
+    if isinstance(serie.dtype, pd.CategoricalDtype):
+        return serie.cat.codes.to_numpy(), serie.cat.categories
+    return pd.factorize(serie)
+
+
+def normalizar_sigilo(serie):
+    """
+    Converte is_segredo_justica para booleano (strings 'True'/'False', 1/0, Sim/Não...).
+    Cada valor distinto é interpretado uma vez; valores desconhecidos e nulos viram False.
+    """
+    if pd.api.types.is_bool_dtype(serie):
+        return serie.astype(bool)
+    if pd.api.types.is_numeric_dtype(serie):
+        return serie.eq(1)
+    codigos, valores = codificar(serie)
+    # Posição extra no fim da tabela: código -1 (nulo) -> False
+    tabela = np.append(pd.Index(valores).astype(str).str.strip().str.lower()
+                         .map(MAPA_SIGILO).fillna(False).to_numpy(dtype=bool), False)
+    return pd.Series(tabela[codigos], index=serie.index, name=serie.name)
+
+
+def parsear_datas(serie, formatos=FORMATOS_DATA):
+    """
+    Datas com formatos fixos (tentados em ordem), interpretadas uma vez por valor distinto.
+    Valores em nenhum dos formatos viram NaT, como em pd.to_datetime(errors='coerce').
+    """
+    if pd.api.types.is_datetime64_any_dtype(serie):
+        return serie
+    codigos, valores = codificar(serie)
+    valores = pd.Index(valores).astype(str).str.strip()
+    datas = np.full(len(valores), np.datetime64('NaT'), dtype='datetime64[ns]')
+    pendentes = np.ones(len(valores), dtype=bool)
+    for formato in formatos:
+        if not pendentes.any():
+            break
+        convertidas = pd.to_datetime(valores[pendentes], format=formato, errors='coerce')
+        if convertidas.tz is not None:
+            convertidas = convertidas.tz_convert(None)
+        datas[pendentes] = convertidas.to_numpy(dtype='datetime64[ns]')
+        pendentes &= np.isnat(datas)
+    datas = pd.DatetimeIndex(datas)
+    return pd.Series(datas.take(codigos, allow_fill=True, fill_value=pd.NaT),
+                     index=serie.index, name=serie.name)
+
+
+def limpar_texto(serie):
+    """
+    astype(str).str.strip(), aplicado uma vez por valor distinto. Categóricas continuam
+    categóricas (categorias iguais após o strip são unificadas).
+    """
+    if serie.dtype != object and not isinstance(serie.dtype, pd.CategoricalDtype):
+        return serie.astype(str).str.strip()
+    codigos, valores = codificar(serie)
+    # Nulos (código -1) viram 'nan', como em astype(str): última posição dos rótulos
+    rotulos = np.append(pd.Index(valores).astype(str).str.strip().to_numpy(dtype=object), 'nan')
+    if serie.dtype == object:
+        return pd.Series(rotulos[codigos], index=serie.index, name=serie.name)
+    categorias, inverso = np.unique(rotulos, return_inverse=True)
+    return pd.Series(pd.Categorical.from_codes(inverso[codigos], categories=categorias),
+                     index=serie.index, name=serie.name).cat.remove_unused_categories()
+
+
+def tratar_dados(df, economizar=False, canonicos=None):
+    """
+    Converte datas, cria ano_distribuicao, normaliza o sigilo, limpa as colunas de texto e
+    cria chave_processo (tjgo.cnj). economizar: descarta a string processo após criar a chave.
+    canonicos: mapeamento {coluna: {original: canonico}} (tjgo.canonicalizacao) aplicado aos textos.
+    """
+    with etapa('tratamento.datas', df):
+        df['data_distribuicao'] = parsear_datas(df['data_distribuicao'])
+        if 'data_baixa' in df.columns:
+            df['data_baixa'] = parsear_datas(df['data_baixa'])
+        df['ano_distribuicao'] = df['data_distribuicao'].dt.year
+        if economizar:
+            df['ano_distribuicao'] = df['ano_distribuicao'].astype(np.float32)
+    with etapa('tratamento.sigilo', df):
+        df['is_segredo_justica'] = normalizar_sigilo(df['is_segredo_justica'])
+
+    with etapa('tratamento.textos', df):
+        for col in COLUNAS_TEXTO:
+            if col in df.columns:
+                df[col] = limpar_texto(df[col])
+    if canonicos:
+        from tjgo.canonicalizacao import aplicar_mapeamento
+
+        aplicar_mapeamento(df, canonicos)
+
+    # Chave int64 do número CNJ: contagens de processos únicos e deduplicações usam a chave
+    with etapa('tratamento.processo', df):
+        df[COLUNA_CHAVE] = chave_processo(df['processo'])
+        if economizar:
+            df.drop(columns='processo', inplace=True)
+    # Evita a cópia de reset_index quando o índice já é 0..n-1 (caso de carregar_dados)
+    if pd.RangeIndex(len(df)).equals(df.index):
+        return df
+    return df.reset_index(drop=True)
+
+
+def _codigos_processo(df):
+    """(códigos 0..k-1 do processo por linha, k): fatoração por hash da chave int64."""
+    codigos, valores = pd.factorize(df[coluna_processo(df)], use_na_sentinel=False)
+    return codigos, len(valores)
+
+
+def _identificaveis(df):
+    """
+    Linhas cujo número identifica o processo: chave de número CNJ válido (>= 0). Números nulos
+    (CHAVE_NULA) e inválidos (chaves negativas) não se comparam entre arquivos; sem a chave, só
+    os números não nulos.
+    """
+    if COLUNA_CHAVE in df.columns:
+        return df[COLUNA_CHAVE].to_numpy() >= 0
+    return df['processo'].notna().to_numpy()
+
+
+def _por_processo(valores, codigos, k, operacao):
+    """Mínimo/máximo de valores (int64) por código de processo; -1 nos códigos ausentes."""
+    return (pd.Series(valores).groupby(codigos, sort=False).agg(operacao)
+              .reindex(range(k), fill_value=-1).to_numpy())
+
+
+def deduplicar_processos(df, politica='ultimo_arquivo'):
+    """
+    Reconcilia processos presentes em mais de um CSV anual (mesma chave_processo): cada
+    processo mantém apenas as linhas de um arquivo, escolhido pela política (POLITICAS_DEDUP).
+    Linhas repetidas dentro do mesmo arquivo (ex.: um registro por advogado) são preservadas, assim
+    como as de número nulo ou inválido (_identificaveis), que não indicam o mesmo processo.
+    Tempo linear: fatoração por hash da chave e agregações por código.
+
+    Retorna (df deduplicado, conflitos): uma linha por processo presente em mais de um arquivo,
+    com os arquivos, o arquivo mantido e se data_distribuicao / is_segredo_justica divergem.
+    """
+    if politica not in POLITICAS_DEDUP:
+        raise ValueError(f"Política de deduplicação inválida: '{politica}' "
+                         f"(opções: {', '.join(POLITICAS_DEDUP)})")
+
+    with etapa('deduplicacao', df) as e:
+        codigos, k = _codigos_processo(df)
+        arquivos = df['ano_arquivo'].to_numpy(dtype=np.int64)
+        primeiro = _por_processo(arquivos, codigos, k, 'min')
+        ultimo = _por_processo(arquivos, codigos, k, 'max')
+
+        # Só os processos (identificáveis) em mais de um arquivo passam pela política
+        repetidos = primeiro != ultimo
+        linhas = np.flatnonzero(repetidos[codigos] & _identificaveis(df))
+        if not linhas.size:
+            return e.saida(df), pd.DataFrame(columns=COLUNAS_CONFLITOS)
+
+        sub = df.iloc[linhas]
+        sub_codigos = codigos[linhas]
+        sub_arquivos = arquivos[linhas]
+        mantido = POLITICAS_DEDUP[politica](sub, sub_codigos, sub_arquivos, ultimo, k)
+
+        descartar = np.zeros(len(df), dtype=bool)
+        descartar[linhas] = sub_arquivos != mantido[sub_codigos]
+
+        conflitos = _relatorio_conflitos(sub, sub_codigos, sub_arquivos, mantido)
+        return e.saida(df[~descartar].reset_index(drop=True)), conflitos
+
+
+def _manter_ultimo_arquivo(sub, codigos, arquivos, ultimo, k):
+    """Arquivo mantido por processo: o mais recente."""
+    return ultimo
+
+
+def _manter_primeira_distribuicao(sub, codigos, arquivos, ultimo, k):
+    """
+    Arquivo mantido por processo: o da data_distribuicao mais antiga (datas ausentes por último;
+    empate -> arquivo mais antigo).
+    """
+    datas = _datas_int(sub['data_distribuicao'])
+    menor = _por_processo(datas, codigos, k, 'min')
+    candidatas = datas == menor[codigos]
+    return _por_processo(arquivos[candidatas], codigos[candidatas], k, 'min')
+
+
+def _datas_int(serie):
+    """Datas como int64 (ns) ordenáveis, com NaT no fim."""
+    datas = serie.to_numpy(dtype='datetime64[ns]').view(np.int64)
+    return np.where(datas == np.iinfo(np.int64).min, np.iinfo(np.int64).max, datas)
+
+
+POLITICAS_DEDUP = {
+    'ultimo_arquivo': _manter_ultimo_arquivo,
+    'primeira_distribuicao': _manter_primeira_distribuicao,
+}
+
+COLUNAS_CONFLITOS = ['processo', 'arquivos', 'arquivo_mantido', 'datas_distribuicao',
+                     'conflito_data', 'conflito_sigilo', 'linhas_removidas']
+
+
+def _relatorio_conflitos(sub, codigos, arquivos, mantido):
+    """Uma linha por processo repetido entre arquivos, com as divergências entre eles."""
+    grupos = pd.DataFrame({
+        'codigo': codigos,
+        'processo': sub['processo'].to_numpy() if 'processo' in sub.columns else sub[COLUNA_CHAVE].to_numpy(),
+        'ano_arquivo': arquivos,
+        'data': sub['data_distribuicao'].to_numpy(),
+        'data_int': _datas_int(sub['data_distribuicao']),  # NaT também conta como valor distinto
+        'sigilo': sub['is_segredo_justica'].to_numpy(),
+        'removida': arquivos != mantido[codigos],
+    }).groupby('codigo', sort=False)
+
+    conflitos = grupos.agg(processo=('processo', 'first'),
+                           datas=('data_int', 'nunique'),
+                           sigilos=('sigilo', 'nunique'),
+                           linhas_removidas=('removida', 'sum'))
+    conflitos['arquivos'] = grupos['ano_arquivo'].unique().map(
+        lambda anos: ';'.join(str(ano) for ano in sorted(anos)))
+    conflitos['arquivo_mantido'] = mantido[conflitos.index.to_numpy()]
+    conflitos['datas_distribuicao'] = grupos['data'].unique().map(
+        lambda datas: ';'.join(sorted(pd.DatetimeIndex(datas).dropna().strftime('%Y-%m-%d'))))
+    conflitos['conflito_data'] = conflitos['datas'] > 1
+    conflitos['conflito_sigilo'] = conflitos['sigilos'] > 1
+    return conflitos[COLUNAS_CONFLITOS].reset_index(drop=True)
+
+
+def resumir_conflitos(conflitos, politica):
+    """Resumo de uma linha da deduplicação."""
+    def n(valor):
+        return f"{int(valor):,}".replace(',', '.')
+
+    return (f"Deduplicação ({politica}): {n(len(conflitos))} processos em mais de um arquivo, "
+            f"{n(conflitos['conflito_data'].sum())} com datas divergentes, "
+            f"{n(conflitos['conflito_sigilo'].sum())} com sigilo divergente; "
+            f"{n(conflitos['linhas_removidas'].sum())} linhas removidas")
+
+
+def filtrar_anos(df, anos):
+    """Mantém apenas os registros distribuídos nos anos informados."""
+    return df[df['ano_distribuicao'].isin(anos)]
+
+
+# 3) Advogados (OAB)
+def is_oab_valida(oab):
+    """
+    Verifica se um número de OAB é válido seguindo o formato:
+    NÚMEROS + LETRA + ESPAÇO + UF. Ex: '2153421N GO'
+    """
+    if not isinstance(oab, str) or not oab.strip():
+        return False
+    return bool(PADRAO_OAB.match(oab.upper().strip()))
+
+
+def validar_oabs(serie):
+    """Versão vetorizada de is_oab_valida para uma coluna inteira."""
+    return (serie.astype('string').str.upper().str.strip()
+                 .str.match(PADRAO_OAB).fillna(False).astype(bool))
+
+
+def filtrar_oabs_validas(df):
+    """Marca oab_valida em df e retorna a cópia apenas com OABs válidas."""
+    with etapa('validacao_oab', df) as e:
+        df['oab_valida'] = validar_oabs(df['oab'])
+        return e.saida(df[df['oab_valida']].copy())
+
+
+def explodir_advogados(df_validos, economizar=False):
+    """
+    Expande múltiplos advogados por processo (campo oab separado por ';').
+    economizar: a coluna oab do resultado é categórica (cada advogado se repete em muitas linhas).
+    """
+    with etapa('explode_advogados', df_validos) as e:
+        df_advogados = df_validos.assign(oab=df_validos['oab'].str.split(';')).explode('oab')
+        df_advogados['oab'] = df_advogados['oab'].str.strip()
+        if economizar:
+            df_advogados['oab'] = df_advogados['oab'].astype('category')
+        return e.saida(df_advogados)
+
+
+def oabs_por_linha(serie):
+    """
+    (posições das linhas, OABs): um par por OAB válida de cada campo, inclusive nos campos com
+    vários advogados separados por ';' (cada parte é validada, não o campo inteiro). Os valores
+    distintos do campo são separados e validados uma vez cada.
+    """
+    codigos, valores = codificar(serie)
+    partes = pd.Series(pd.Index(valores).astype(str), dtype=object).str.split(';').explode().str.strip()
+    partes = partes[(partes != '') & validar_oabs(partes).to_numpy()]
+    pares = (pd.DataFrame({'linha': np.arange(len(serie), dtype=np.int64), 'valor': codigos})
+               .merge(pd.DataFrame({'valor': partes.index.to_numpy(), 'oab': partes.to_numpy()}), on='valor'))
+    return pares['linha'].to_numpy(), pares['oab'].to_numpy(dtype=object)
+
+
+def explodir_oabs_validas(df, economizar=False):
+    """
+    Um registro por (linha de df, OAB válida do campo oab). Diferente de
+    explodir_advogados(filtrar_oabs_validas(df)), não descarta as linhas com vários advogados:
+    filtrar_oabs_validas valida o campo inteiro e PADRAO_OAB aceita uma única OAB.
+    """
+    with etapa('explode_oabs_validas', df) as e:
+        linhas, oabs = oabs_por_linha(df['oab'])
+        df_oabs = df.iloc[linhas].assign(oab=oabs)
+        if economizar:
+            df_oabs['oab'] = df_oabs['oab'].astype('category')
+        return e.saida(df_oabs)
+
+
+def parse_anos(texto, minimo=1):
+    """
+    Interpreta '2022-2024' ou '2022,2024' como lista de anos, com pelo menos minimo anos
+    distintos (as análises de variação e crescimento comparam o primeiro e o último: minimo=2).
+    """
+    anos = []
+    for parte in str(texto).split(','):
+        parte = parte.strip()
+        if not parte:
+            continue
+        if '-' in parte:
+            inicio, fim = (int(x) for x in parte.split('-', 1))
+            if fim < inicio:
+                raise ValueError(f"Intervalo de anos inválido: {parte}")
+            anos.extend(range(inicio, fim + 1))
+        else:
+            anos.append(int(parte))
+    if not anos:
+        raise ValueError(f"Nenhum ano informado em '{texto}'")
+    anos = sorted(set(anos))
+    if len(anos) < minimo:
+        raise ValueError(f"Informe pelo menos {minimo} anos distintos (recebido: '{texto}'); "
+                         f"as análises comparam o primeiro e o último ano do período")
+    return anos
+
+
+# Funções cujo código define o quadro tratado (entram na chave do cache dos estágios)
+ETAPAS_CARGA = (listar_arquivos, carregar_dados, codificar, normalizar_sigilo, parsear_datas, limpar_texto,
+                cnj._parsear_valores, cnj.empacotar, chave_processo, tratar_dados, validar_oabs,
+                deduplicar_processos, _identificaveis, _manter_primeira_distribuicao, _relatorio_conflitos)
@@ -0,0 +1,251 @@
+'''Detalhamento por Comarca (drill-down):
+- As tabelas comarca × serventia (analise3) e comarca × área de ação (analise4) viram uma
+página com um seletor de comarca: dispersão estratégica e tabela mostram só a comarca escolhida
+(ou todas).
+- As fatias não são traces duplicados: as linhas são ordenadas por comarca uma única vez e cada
+comarca é o intervalo [inicio, fim) de um vetor de deslocamentos sobre essas colunas. No
+navegador a troca de comarca é um subarray dos vetores tipados (sem cópia) e um Plotly.react.
+Para "Todas", a tabela usa uma permutação global (as linhas de maior variação no estado todo).
+- As colunas vão no pacote colunar de tjgo.pacote_dados (vetores tipados, textos em dicionário).
+- DetalhamentoHTML imita a parte da interface das figuras Plotly usada pelas análises (show,
+write_html, to_html), como tabela_html.TabelaHTML.'''
+
+# --- BIBLIOTECAS NECESSÁRIAS ---
+import base64
+import gzip
+import html
+import json
+import os
+import re
+import tempfile
+import webbrowser
+
+import numpy as np
+import pandas as pd
+
+from tjgo.pacote_dados import PacoteColunas
+
+# Linhas da fatia desenhadas na tabela (a dispersão mostra todas)
+LIMITE_LINHAS_TABELA = 1_000
+
+
+# --- FATIAS ---
+def fatiar(tabela, grupo='comarca', ordem='variacao_total_sigilosos'):
+    """
+    (tabela ordenada por grupo e, dentro do grupo, por ordem decrescente; nomes dos grupos em
+    ordem alfabética; deslocamentos): as linhas do grupo k são [deslocamentos[k], deslocamentos[k + 1]).
+    """
+    codigos, grupos = pd.factorize(tabela[grupo].astype(str), sort=True)
+    posicoes = np.lexsort((-tabela[ordem].to_numpy(dtype=float), codigos))
+    deslocamentos = np.searchsorted(codigos[posicoes], np.arange(len(grupos) + 1))
+    return tabela.iloc[posicoes].reset_index(drop=True), list(grupos), deslocamentos
+
+
+def _formato(serie):
+    """Formatação da coluna na tabela: percentuais como em agregacao.fmt_pct/fmt_pct_sinal."""
+    if not pd.api.types.is_numeric_dtype(serie):
+        return 'texto'
+    if serie.name.startswith('variacao_'):
+        return 'pct_sinal'
+    if serie.name.startswith('proporcao_'):
+        return 'pct'
+    return 'num'
+
+
+def codificar_detalhamento(tabela, grupo, entidade, colunas, anos, titulo=''):
+    """
+    Pacote colunar (bytes) e metadados da página: grupos, deslocamentos e referências das colunas
+    do pacote. colunas: [(coluna, cabeçalho), ...] da tabela.
+    """
+    from tjgo import graficos
+    from tjgo.topn import indices_top
+
+    ordenada, grupos, deslocamentos = fatiar(tabela, grupo)
+    pacote = PacoteColunas()
+
+    def referencia(coluna):
+        serie = ordenada[coluna]
+        valores = serie.to_numpy() if pd.api.types.is_numeric_dtype(serie) else serie.astype(str).to_numpy(dtype=object)
+        return pacote.coluna(valores, minimo=0)
+
+    metadados = {
+        'titulo': titulo,
+        'grupos': grupos,
+        'deslocamentos': deslocamentos.tolist(),
+        'entidade': referencia(entidade),
+        'x': referencia('proporcao_media_sigilosos'),
+        'y': referencia('variacao_total_sigilosos'),
+        'sigilosos': [referencia(f'sigilosos_{ano}') for ano in anos],
+        'nao_sigilosos': [referencia(f'nao_sigilosos_{ano}') for ano in anos],
+        'anos': [int(ano) for ano in anos],
+        'colunas': [{'ref': referencia(coluna), 'cabecalho': cabecalho, 'formato': _formato(ordenada[coluna])}
+                    for coluna, cabecalho in colunas],
+        # Tabela de "Todas": posições das linhas de maior variação (ordenada está por comarca)
+        'ordem_global': pacote.coluna(
+            indices_top(ordenada['variacao_total_sigilosos'], LIMITE_LINHAS_TABELA).astype(np.int64), minimo=0),
+        'limite_tabela': LIMITE_LINHAS_TABELA,
+        'limite_webgl': graficos.LIMITE_WEBGL,
+    }
+    return pacote.serializar(), metadados
+
+
+# --- PÁGINA ---
+_MODELO = '''<!DOCTYPE html>
+<html lang="pt-BR">
+<head>
+<meta charset="utf-8">
+<title>__TITULO_TEXTO__</title>
+__PLOTLYJS__
+<style>
+body { font-family: Arial, sans-serif; margin: 16px; color: #222; }
+h2 { text-align: center; font-weight: normal; }
+#controles { display: flex; gap: 12px; align-items: center; margin-bottom: 8px; }
+#rolagem { max-height: 60vh; overflow: auto; border: 1px solid darkslategray; }
+table { border-collapse: collapse; font-size: 11px; width: max-content; min-width: 100%; }
+th { position: sticky; top: 0; background: #203864; color: white; font-size: 12px;
+     padding: 4px 6px; border: 1px solid darkslategray; text-align: left; }
+td { padding: 2px 6px; border: 1px solid darkslategray; white-space: nowrap; }
+tr:nth-child(even) td { background: lavender; }
+</style>
+</head>
+<body>
+<h2>__TITULO__</h2>
+<div id="controles">
+  <label>Comarca <select id="grupo"></select></label>
+  <span id="contagem"></span>
+</div>
+<div id="dispersao" style="height: 700px"></div>
+<div id="rolagem"><table><thead><tr id="cabecalho"></tr></thead><tbody id="corpo"></tbody></table></div>
+<script id="pacote" type="application/octet-stream">__PACOTE__</script>
+<script id="metadados" type="application/json">__METADADOS__</script>
+<script>
+(async function () {
+  const bytes = Uint8Array.from(atob(document.getElementById('pacote').textContent.trim()), c => c.charCodeAt(0));
+  const fluxo = new Blob([bytes]).stream().pipeThrough(new DecompressionStream('gzip'));
+  const buf = await new Response(fluxo).arrayBuffer();
+  const tamanho = new DataView(buf).getUint32(0, true);
+  const M = JSON.parse(new TextDecoder().decode(new Uint8Array(buf, 4, tamanho)));
+  const TIPOS = {u1: Uint8Array, i1: Int8Array, u2: Uint16Array, i2: Int16Array,
+                 u4: Uint32Array, i4: Int32Array, f8: Float64Array};
+  // Textos ficam como códigos (vetor tipado) + dicionário: a fatia também é um subarray
+  const colunas = M.colunas.map(c => ({v: new TIPOS[c.dtype](buf, 4 + tamanho + c.inicio, c.n), d: c.distintos}));
+  const D = JSON.parse(document.getElementById('metadados').textContent);
+  const off = D.deslocamentos, N = off[off.length - 1];
+
+  const fatia = (r, i0, i1) => colunas[r.$col].v.subarray(i0, i1);
+  const textos = (r, i0, i1) => { const c = colunas[r.$col]; return Array.from(c.v.subarray(i0, i1), k => k < 0 ? '' : c.d[k]); };
+  // Valores nas posições indicadas (tabela de "Todas", pela permutação global)
+  const pegar = (r, posicoes, texto) => {
+    const c = colunas[r.$col];
+    return Array.from(posicoes, i => texto ? (c.v[i] < 0 ? '' : c.d[c.v[i]]) : c.v[i]);
+  };
+  const pct = (v, sinal) => {
+    if (Number.isNaN(v)) return '';
+    const s = v.toFixed(2).replace('.', ',') + '%';
+    return sinal && v >= 0 ? '+' + s : s;
+  };
+  const fmt = (c, v) => c.formato === 'texto' ? v : c.formato === 'pct' ? pct(v, false)
+    : c.formato === 'pct_sinal' ? pct(v, true) : (Number.isNaN(v) ? '' : String(v).replace('.', ','));
+
+  const sel = document.getElementById('grupo');
+  sel.add(new Option('Todas (' + N.toLocaleString('pt-BR') + ')', -1));
+  D.grupos.forEach((g, k) => sel.add(new Option(g + ' (' + (off[k + 1] - off[k]) + ')', k)));
+  const cab = document.getElementById('cabecalho');
+  D.colunas.forEach(c => { const th = document.createElement('th'); th.textContent = c.cabecalho; cab.appendChild(th); });
+
+  function mostrar(k) {
+    const i0 = k < 0 ? 0 : off[k], i1 = k < 0 ? N : off[k + 1], n = i1 - i0;
+    const x = fatia(D.x, i0, i1), y = fatia(D.y, i0, i1);
+    const contagens = D.sigilosos.concat(D.nao_sigilosos).map(r => fatia(r, i0, i1));
+    const customdata = Array.from({length: n}, (_, i) => contagens.map(c => c[i]));
+    let media = 0;
+    for (let i = 0; i < n; i++) media += x[i] / n;
+    const linhas = D.anos.map((a, j) => '<b>Sigilosos ' + a + ':</b> %{customdata[' + j + ']}')
+      .concat(D.anos.map((a, j) => '<b>Não Sigilosos ' + a + ':</b> %{customdata[' + (j + D.anos.length) + ']}'));
+    const trace = {
+      type: n > D.limite_webgl ? 'scattergl' : 'scatter', mode: 'markers', x: x, y: y, customdata: customdata,
+      hovertext: textos(D.entidade, i0, i1), marker: {size: 10, color: '#203864'},
+      hovertemplate: ['<b>%{hovertext}</b>', '<b>Variação Total de Sigilosos:</b> %{y:.2f}%',
+                      '<b>--- <b>Contagem de Casos</b> ---'].concat(linhas).join('<br>') + '<extra></extra>'
+    };
+    const linha = {type: 'line', line: {dash: 'dash', color: 'grey'}};
+    Plotly.react('dispersao', [trace], {
+      title: {text: D.titulo + (k < 0 ? '' : ' — ' + D.grupos[k]), x: 0.5}, showlegend: false,
+      xaxis: {title: {text: 'Proporção Média de Casos Sigilosos (%)'}, ticksuffix: '%'},
+      yaxis: {title: {text: 'Variação da Proporção (' + D.anos[D.anos.length - 1] + ' - ' + D.anos[0] + ')'}, ticksuffix: '%'},
+      shapes: [Object.assign({xref: 'paper', x0: 0, x1: 1, y0: 0, y1: 0}, linha),
+               Object.assign({yref: 'paper', y0: 0, y1: 1, x0: media, x1: media}, linha)],
+      annotations: [{x: media, y: 1, yref: 'paper', text: 'Média: ' + pct(media, false), showarrow: false, yanchor: 'bottom'}]
+    }, {responsive: true});
+
+    const m = Math.min(n, D.limite_tabela);
+    const posicoes = k < 0 ? fatia(D.ordem_global, 0, m) : null;
+    const valores = D.colunas.map(c => posicoes ? pegar(c.ref, posicoes, c.formato === 'texto')
+      : c.formato === 'texto' ? textos(c.ref, i0, i0 + m) : fatia(c.ref, i0, i0 + m));
+    const frag = document.createDocumentFragment();
+    for (let i = 0; i < m; i++) {
+      const tr = document.createElement('tr');
+      D.colunas.forEach((c, j) => { const td = document.createElement('td'); td.textContent = fmt(c, valores[j][i]); tr.appendChild(td); });
+      frag.appendChild(tr);
+    }
+    document.getElementById('corpo').replaceChildren(frag);
+    document.getElementById('contagem').textContent = n.toLocaleString('pt-BR') + ' linhas' +
+      (m < n ? ' (tabela: as ' + m.toLocaleString('pt-BR') + ' de maior variação)' : '');
+  }
+  sel.onchange = () => mostrar(Number(sel.value));
+  mostrar(-1);
+})();
+</script>
+</body>
+</html>
+'''
+
+
+def _script_plotlyjs(include_plotlyjs):
+    """<script> do plotly.js como em Figure.write_html: True (embutido), 'cdn' ou caminho do arquivo."""
+    if include_plotlyjs is True:
+        from plotly.offline import get_plotlyjs
+
+        return f'<script type="text/javascript">{get_plotlyjs()}</script>'
+    if include_plotlyjs == 'cdn':
+        import plotly
+
+        return f'<script charset="utf-8" src="https://cdn.plot.ly/plotly-{plotly.__version__}.min.js"></script>'
+    if isinstance(include_plotlyjs, str) and include_plotlyjs.endswith('.js'):
+        return f'<script charset="utf-8" src="{html.escape(include_plotlyjs)}"></script>'
+    return ''
+
+
+class DetalhamentoHTML:
+    """Página de detalhamento por comarca: seletor, dispersão e tabela da fatia escolhida."""
+
+    def __init__(self, tabela, grupo, entidade, colunas, anos, titulo=''):
+        self.titulo = titulo
+        self.linhas = len(tabela)
+        self.pacote, self.metadados = codificar_detalhamento(tabela, grupo, entidade, colunas, anos, titulo)
+
+    def __len__(self):
+        return self.linhas
+
+    def to_html(self, include_plotlyjs=True, **_):
+        dados = base64.b64encode(gzip.compress(self.pacote, compresslevel=6)).decode('ascii')
+        metadados = json.dumps(self.metadados, ensure_ascii=False, separators=(',', ':')).replace('</', '<\\/')
+        return (_MODELO.replace('__TITULO_TEXTO__', html.escape(re.sub(r'<[^>]+>', ' ', self.titulo).strip()))
+                       .replace('__PLOTLYJS__', _script_plotlyjs(include_plotlyjs))
+                       .replace('__TITULO__', self.titulo)
+                       .replace('__PACOTE__', dados)
+                       .replace('__METADADOS__', metadados))
+
+    def write_html(self, caminho, include_plotlyjs=True, **_):
+        """Grava o HTML; include_plotlyjs como em Figure.write_html (True, 'cdn' ou caminho .js)."""
+        with open(caminho, 'w', encoding='utf-8') as f:
+            f.write(self.to_html(include_plotlyjs=include_plotlyjs))
+        return caminho
+
+    def show(self, **_):
+        """Grava em um arquivo temporário (plotly.js embutido) e abre no navegador, como fig.show()."""
+        fd, caminho = tempfile.mkstemp(prefix='tjgo_detalhamento_', suffix='.html')
+        os.close(fd)
+        self.write_html(caminho)
+        webbrowser.open('file://' + caminho)
+        return caminho
@@ -0,0 +1,434 @@
+'''Funções Estatísticas Compartilhadas:
+- Estimadores vetorizados usados pelas análises de processos sigilosos. Todas as funções
+operam sobre arrays/Series inteiros (uma chamada por nível de entidade), sem laços por entidade.'''
+
+# --- BIBLIOTECAS NECESSÁRIAS ---
+from itertools import combinations
+from typing import NamedTuple
+
+import numpy as np
+import pandas as pd
+
+from tjgo.cnj import coluna_processo
+# scipy é importado dentro das funções que o utilizam (importação sob demanda)
+
+
+# --- ENCOLHIMENTO EMPÍRICO-BAYESIANO (BETA-BINOMIAL) ---
+def ajustar_beta_binomial(sigilosos, totais, metodo='momentos'):
+    """
+    Ajusta a priori Beta(alfa, beta) comum a todas as entidades de um nível.
+    - metodo='momentos': estimador de momentos ponderado (Kleinman), forma fechada
+    - metodo='verossimilhanca': máxima verossimilhança marginal beta-binomial,
+      partindo da estimativa de momentos
+    Entidades com total zero não contribuem para o ajuste.
+    """
+    from scipy import optimize, special
+    k = np.asarray(sigilosos, dtype=float)
+    n = np.asarray(totais, dtype=float)
+    validos = n > 0
+    k, n = k[validos], n[validos]
+    if len(n) == 0:
+        return 1.0, 1.0
+
+    N = n.sum()
+    mu = k.sum() / N
+    if mu <= 0 or mu >= 1 or len(n) < 2:
+        # Sem variação observável: priori fraca centrada na média
+        mu = min(max(mu, 0.5 / N), 1 - 0.5 / N)
+        return mu * 2.0, (1 - mu) * 2.0
+
+    # Correlação intra-entidade (rho) pelo método dos momentos
+    S = np.sum(n * (k / n - mu) ** 2)
+    denominador = N - len(n) + 1 - np.sum(n ** 2) / N
+    if denominador > 0:
+        rho = (S / (mu * (1 - mu)) - (len(n) - 1)) / denominador
+    else:
+        rho = np.nan
+    rho = float(np.clip(np.nan_to_num(rho, nan=1e-6), 1e-6, 1 - 1e-6))
+    soma = (1 - rho) / rho
+    alfa, beta = mu * soma, (1 - mu) * soma
+
+    if metodo == 'momentos':
+        return float(alfa), float(beta)
+    if metodo != 'verossimilhanca':
+        raise ValueError(f"Método de ajuste desconhecido: {metodo}")
+
+    # Agrupar pares (k, n) repetidos: a verossimilhança só depende das frequências
+    pares, freq = np.unique(np.column_stack([k, n]), axis=0, return_counts=True)
+    kk, nn = pares[:, 0], pares[:, 1]
+
+    def nlv(log_params):
+        a, b = np.exp(log_params)
+        return -np.sum(freq * (special.betaln(kk + a, nn - kk + b) - special.betaln(a, b)))
+
+    ajuste = optimize.minimize(nlv, np.log([alfa, beta]), method='L-BFGS-B',
+                               bounds=[(-10, 15), (-10, 15)])
+    if ajuste.success:
+        alfa, beta = np.exp(ajuste.x)
+    return float(alfa), float(beta)
+
+
+def encolher_proporcoes(sigilosos, totais, metodo='momentos', nivel=0.95):
+    """
+    Proporção de sigilosos encolhida (média a posteriori) e intervalo de credibilidade
+    para cada entidade. A posteriori é Beta(alfa + k, beta + n - k), em forma fechada.
+    Retorna DataFrame com proporções em % e os parâmetros da priori como atributos.
+    """
+    from scipy import stats
+    k = np.asarray(sigilosos, dtype=float)
+    n = np.asarray(totais, dtype=float)
+    alfa, beta = ajustar_beta_binomial(k, n, metodo=metodo)
+
+    a_post = alfa + k
+    b_post = beta + (n - k)
+    cauda = (1 - nivel) / 2
+
+    out = pd.DataFrame({
+        'proporcao_bruta': np.divide(k, n, out=np.zeros_like(k), where=n > 0) * 100,
+        'proporcao_eb': a_post / (a_post + b_post) * 100,
+        'ic_inf_eb': stats.beta.ppf(cauda, a_post, b_post) * 100,
+        'ic_sup_eb': stats.beta.ppf(1 - cauda, a_post, b_post) * 100,
+        'peso_dados': n / (n + alfa + beta),  # fração da estimativa vinda da própria entidade
+    })
+    out.attrs['alfa_priori'] = alfa
+    out.attrs['beta_priori'] = beta
+    return out
+
+
+def contar_sigilosos_por_entidade(df, chave, anos=None):
+    """
+    Conta processos únicos (total e sigilosos) por entidade.
+    Um processo é sigiloso para a entidade se qualquer registro dele estiver sob sigilo.
+    """
+    chaves = [chave] if isinstance(chave, str) else list(chave)
+    base = df
+    if anos is not None:
+        base = base[base['ano_distribuicao'].isin(anos)]
+    base = base.dropna(subset=chaves)
+
+    por_processo = (base.groupby(chaves + [coluna_processo(base)], observed=True, sort=False)['is_segredo_justica']
+                        .max()
+                        .reset_index())
+    contagem = (por_processo.groupby(chaves, observed=True)['is_segredo_justica']
+                            .agg(sigilosos='sum', total='size')
+                            .reset_index())
+    contagem['sigilosos'] = contagem['sigilosos'].astype(int)
+    return contagem
+
+
+def encolhimento_por_entidade(df, chave, anos=None, metodo='momentos', nivel=0.95):
+    """
+    Ajuste empírico-bayesiano único para um nível de entidade (advogado, serventia, área...).
+    Nenhuma entidade é descartada: as de baixo volume são puxadas para a média do nível.
+    """
+    contagem = contar_sigilosos_por_entidade(df, chave, anos=anos)
+    eb = encolher_proporcoes(contagem['sigilosos'], contagem['total'], metodo=metodo, nivel=nivel)
+    out = pd.concat([contagem, eb], axis=1)
+    out.attrs.update(eb.attrs)
+    return out
+
+
+# --- TESTES 2x2 ENTRE PARES DE ANOS ---
+class ResultadoTestes(NamedTuple):
+    """Matrizes densas (entidades × pares de anos) de um nível de entidade."""
+    entidades: pd.DataFrame
+    pares: list
+    p_valores: np.ndarray
+    p_ajustados: np.ndarray
+    exato: np.ndarray
+
+    def para_dataframe(self):
+        """Formato longo: uma linha por entidade e par de anos."""
+        n_ent, n_pares = self.p_valores.shape
+        out = self.entidades.loc[np.repeat(np.arange(n_ent), n_pares)].reset_index(drop=True)
+        out['ano_inicial'] = np.tile([p[0] for p in self.pares], n_ent)
+        out['ano_final'] = np.tile([p[1] for p in self.pares], n_ent)
+        out['p_valor'] = self.p_valores.ravel()
+        out['p_ajustado_bh'] = self.p_ajustados.ravel()
+        out['teste_exato'] = self.exato.ravel()
+        return out
+
+
+def _qui_quadrado_2x2(a, b, c, d, correcao=True):
+    """Qui-quadrado 2x2 em forma fechada (com correção de Yates, como scipy.stats.chi2_contingency)."""
+    from scipy import stats
+    N = a + b + c + d
+    produto_margens = (a + b) * (c + d) * (a + c) * (b + d)
+    desvio = np.abs(a * d - b * c) / N
+    if correcao:
+        desvio = np.maximum(desvio - 0.5, 0.0)
+    with np.errstate(divide='ignore', invalid='ignore'):
+        estatistica = desvio ** 2 * N ** 3 / produto_margens
+    return stats.chi2.sf(estatistica, 1)
+
+
+def _fisher_exato_2x2(a, b, c, d, tamanho_bloco=2_000_000):
+    """
+    Teste exato de Fisher bilateral vetorizado.
+    As tabelas são ordenadas pelo tamanho do suporte hipergeométrico e processadas em
+    blocos retangulares (tabelas × suporte) limitados a `tamanho_bloco` células.
+    """
+    from scipy import special
+    r1, r2, c1 = a + b, c + d, a + c
+    N = r1 + r2
+    inicio = np.maximum(0, c1 - r2)
+    largura = np.minimum(r1, c1) - inicio + 1
+
+    def termo(x, r1, r2, c1):
+        # Parte da log-pmf hipergeométrica que depende de x
+        return -(special.gammaln(x + 1) + special.gammaln(r1 - x + 1)
+                 + special.gammaln(c1 - x + 1) + special.gammaln(r2 - c1 + x + 1))
+
+    p = np.empty(len(a), dtype=float)
+    ordem = np.argsort(largura, kind='stable')
+    larguras_ordenadas = largura[ordem]
+    pos = 0
+    while pos < len(ordem):
+        # Maior bloco cujo retângulo (linhas × maior largura) cabe no limite
+        janela = larguras_ordenadas[pos:pos + tamanho_bloco]
+        cabe = (np.arange(1, len(janela) + 1) * janela) <= tamanho_bloco
+        n_linhas = max(1, int(cabe.sum()))
+        idx = ordem[pos:pos + n_linhas]
+        w = int(largura[idx].max())
+
+        r1_b, r2_b, c1_b = r1[idx][:, None], r2[idx][:, None], c1[idx][:, None]
+        x = inicio[idx][:, None] + np.arange(w)[None, :]
+        suporte = x <= np.minimum(r1_b, c1_b)
+        x = np.where(suporte, x, inicio[idx][:, None])
+
+        obs = termo(a[idx][:, None], r1_b, r2_b, c1_b)
+        rel = np.where(suporte, termo(x, r1_b, r2_b, c1_b) - obs, -np.inf)
+        massa = np.where(rel <= np.log1p(1e-7), np.exp(rel), 0.0).sum(axis=1)
+
+        log_obs = (special.gammaln(r1[idx] + 1) + special.gammaln(r2[idx] + 1)
+                   + special.gammaln(c1[idx] + 1) + special.gammaln(N[idx] - c1[idx] + 1)
+                   - special.gammaln(N[idx] + 1) + obs[:, 0])
+        p[idx] = np.minimum(np.exp(log_obs) * massa, 1.0)
+        pos += len(idx)
+    return p
+
+
+def testes_2x2(a, b, c, d, minimo_esperado=5, tamanho_bloco=2_000_000):
+    """
+    p-valores para tabelas 2x2 [[a, b], [c, d]] empilhadas em arrays.
+    Usa qui-quadrado quando todas as contagens esperadas são >= minimo_esperado e
+    Fisher exato caso contrário. Retorna (p_valores, mascara_exato).
+    Tabelas com linha vazia ficam NaN; com coluna vazia (proporções idênticas) p = 1.
+    """
+    a, b, c, d = (np.asarray(v, dtype=np.int64).ravel() for v in (a, b, c, d))
+    r1, r2, c1, c2 = a + b, c + d, a + c, b + d
+    N = r1 + r2
+
+    p = np.full(len(a), np.nan)
+    linha_vazia = (r1 == 0) | (r2 == 0)
+    coluna_vazia = ~linha_vazia & ((c1 == 0) | (c2 == 0))
+    p[coluna_vazia] = 1.0
+
+    testaveis = ~linha_vazia & ~coluna_vazia
+    with np.errstate(divide='ignore', invalid='ignore'):
+        esperado_min = np.minimum(r1, r2) * np.minimum(c1, c2) / N
+    exato = testaveis & (esperado_min < minimo_esperado)
+    assintotico = testaveis & ~exato
+
+    if assintotico.any():
+        p[assintotico] = _qui_quadrado_2x2(*(v[assintotico].astype(float) for v in (a, b, c, d)))
+    if exato.any():
+        p[exato] = _fisher_exato_2x2(*(v[exato] for v in (a, b, c, d)), tamanho_bloco=tamanho_bloco)
+    return p, exato
+
+
+def benjamini_hochberg(p_valores):
+    """Correção de Benjamini–Hochberg (FDR) sobre todos os p-valores não nulos, em qualquer formato."""
+    p = np.asarray(p_valores, dtype=float)
+    plano = p.ravel()
+    validos = np.flatnonzero(~np.isnan(plano))
+    ajustado = np.full_like(plano, np.nan)
+    m = len(validos)
+    if m == 0:
+        return ajustado.reshape(p.shape)
+
+    ordem = validos[np.argsort(plano[validos], kind='stable')]
+    q = plano[ordem] * m / np.arange(1, m + 1)
+    q = np.minimum.accumulate(q[::-1])[::-1]
+    ajustado[ordem] = np.minimum(q, 1.0)
+    return ajustado.reshape(p.shape)
+
+
+def contagens_por_ano(df, chave, anos):
+    """Matrizes (entidades × anos) de processos sigilosos e totais, a partir de processos únicos."""
+    chaves = [chave] if isinstance(chave, str) else list(chave)
+    contagem = contar_sigilosos_por_entidade(df, chaves + ['ano_distribuicao'], anos=anos)
+    tabela = contagem.pivot_table(index=chaves, columns='ano_distribuicao',
+                                  values=['sigilosos', 'total'], aggfunc='sum', fill_value=0,
+                                  observed=True)
+    tabela = tabela.reindex(columns=pd.MultiIndex.from_product([['sigilosos', 'total'], anos]), fill_value=0)
+    entidades = tabela.index.to_frame(index=False)
+    return entidades, tabela['sigilosos'].to_numpy(np.int64), tabela['total'].to_numpy(np.int64)
+
+
+def matriz_testes_anos(df, chave, anos, minimo_esperado=5):
+    """
+    p-valores (sem correção) de todos os pares de anos para todas as entidades de um nível.
+    A correção BH é aplicada por `testes_por_niveis`, sobre o conjunto completo de testes.
+    """
+    anos = list(anos)
+    entidades, sig, tot = contagens_por_ano(df, chave, anos)
+    pares = list(combinations(range(len(anos)), 2))
+    i = np.array([p[0] for p in pares], dtype=int)
+    j = np.array([p[1] for p in pares], dtype=int)
+
+    a, c = sig[:, i], sig[:, j]
+    b, d = tot[:, i] - a, tot[:, j] - c
+    p, exato = testes_2x2(a, b, c, d, minimo_esperado=minimo_esperado)
+    forma = a.shape
+    return ResultadoTestes(
+        entidades=entidades,
+        pares=[(anos[x], anos[y]) for x, y in pares],
+        p_valores=p.reshape(forma),
+        p_ajustados=np.full(forma, np.nan),
+        exato=exato.reshape(forma),
+    )
+
+
+def testes_por_niveis(bases, anos, minimo_esperado=5):
+    """
+    Matrizes de teste para vários níveis de entidade ({nivel: DataFrame base}).
+    A correção de Benjamini–Hochberg é aplicada uma única vez sobre todos os testes de todos os níveis.
+    """
+    resultados = {
+        nivel: matriz_testes_anos(base, nivel, anos, minimo_esperado=minimo_esperado)
+        for nivel, base in bases.items()
+        if nivel in base.columns
+    }
+    if not resultados:
+        return resultados
+
+    todos = np.concatenate([r.p_valores.ravel() for r in resultados.values()])
+    ajustados = benjamini_hochberg(todos)
+    pos = 0
+    for nivel, r in resultados.items():
+        tamanho = r.p_valores.size
+        resultados[nivel] = r._replace(p_ajustados=ajustados[pos:pos + tamanho].reshape(r.p_valores.shape))
+        pos += tamanho
+    return resultados
+
+
+# --- MÉTRICAS DE CRESCIMENTO E BOOTSTRAP ---
+def calcular_crescimento(totais, anos):
+    """
+    Crescimento total (%) e CAGR (%/ano) do volume, vetorizado sobre o último eixo (anos).
+    Usa como base o primeiro ano (exceto o último) com total > 0, como em analise6:
+    - sem base válida: crescimento = CAGR = 0 e ano_base = NaN
+    - volume final zerado: CAGR = -100 (queda total)
+    """
+    totais = np.asarray(totais, dtype=float)
+    anos = np.asarray(list(anos))
+    candidatos = totais[..., :-1] > 0
+    tem_base = candidatos.any(axis=-1)
+    idx_base = np.argmax(candidatos, axis=-1)
+
+    base = np.take_along_axis(totais, idx_base[..., None], axis=-1)[..., 0]
+    final = totais[..., -1]
+    periodos = (anos[-1] - anos[idx_base]).astype(float)
+
+    with np.errstate(divide='ignore', invalid='ignore'):
+        razao = final / base
+        crescimento = (razao - 1.0) * 100.0
+        cagr = np.where(final > 0, (razao ** (1.0 / periodos) - 1.0) * 100.0, -100.0)
+
+    crescimento = np.where(tem_base, crescimento, 0.0)
+    cagr = np.where(tem_base, cagr, 0.0)
+    ano_base = np.where(tem_base, anos[idx_base], np.nan)
+    return crescimento, cagr, ano_base
+
+
+def _metricas_bootstrap(sig, nao, anos):
+    """Métricas das tabelas de proporções a partir de contagens (... × anos)."""
+    tot = sig + nao
+    prop = np.divide(sig, tot, out=np.zeros_like(sig, dtype=float), where=tot > 0) * 100
+    crescimento, cagr, _ = calcular_crescimento(tot, anos)
+    return {
+        'variacao_total_sigilosos': prop[..., -1] - prop[..., 0],
+        'crescimento_percentual_volume': crescimento,
+        'cagr_volume': cagr,
+    }
+
+
+def bootstrap_metricas(df_base, chaves, anos, n_replicas=1000, metodo='poisson',
+                       semente=42, nivel=0.95, limite_celulas=20_000_000):
+    """
+    Intervalos de confiança bootstrap para variacao_total_sigilosos, crescimento_percentual_volume
+    e cagr_volume de cada entidade.
+    - Reamostra processos dentro de cada entidade (todas as entidades de uma vez):
+      metodo='poisson' usa pesos Poisson(1); metodo='multinomial' sorteia n processos
+      com reposição dentro da própria entidade.
+    - Os pesos são matrizes NumPy (réplicas × processos) geradas em blocos de entidades
+      com no máximo `limite_celulas` elementos, o que limita a memória.
+    """
+    chaves = [chaves] if isinstance(chaves, str) else list(chaves)
+    anos = list(anos)
+    if metodo not in ('poisson', 'multinomial'):
+        raise ValueError(f"Método de bootstrap desconhecido: {metodo}")
+
+    # Unidades de reamostragem: processo único por entidade, ano e tipo (como em processar_dados)
+    colunas = chaves + [coluna_processo(df_base), 'ano_distribuicao', 'is_segredo_justica']
+    base = df_base.loc[df_base['ano_distribuicao'].isin(anos), colunas]
+    base = base.drop_duplicates(subset=colunas)
+
+    entidade = base.groupby(chaves, sort=True, observed=True).ngroup().to_numpy()
+    entidades = (base[chaves].assign(_e=entidade).drop_duplicates('_e')
+                               .sort_values('_e').drop(columns='_e').reset_index(drop=True))
+    n_ent, n_anos = len(entidades), len(anos)
+    ano_idx = pd.Index(anos).get_indexer(base['ano_distribuicao'])
+    sigilo = base['is_segredo_justica'].to_numpy(bool).astype(np.int64)
+
+    # Ordenar por célula (entidade, ano, tipo) para agregar com reduceat
+    celula = (entidade.astype(np.int64) * n_anos + ano_idx) * 2 + sigilo
+    ordem = np.argsort(celula, kind='stable')
+    celula, entidade = celula[ordem], entidade[ordem]
+    inicio_ent = np.searchsorted(entidade, np.arange(n_ent + 1))
+
+    rng = np.random.default_rng(semente)
+    cauda = (1 - nivel) / 2 * 100
+    metricas_nomes = ['variacao_total_sigilosos', 'crescimento_percentual_volume', 'cagr_volume']
+    ic = {f'{m}_{lado}': np.full(n_ent, np.nan) for m in metricas_nomes for lado in ('ic_inf', 'ic_sup')}
+
+    linhas_por_bloco = max(1, limite_celulas // max(n_replicas, 1))
+    e0 = 0
+    while e0 < n_ent:
+        # Maior bloco de entidades inteiras que cabe no limite de linhas
+        e1 = int(np.searchsorted(inicio_ent, inicio_ent[e0] + linhas_por_bloco, side='right')) - 1
+        e1 = min(max(e1, e0 + 1), n_ent)
+        r0, r1 = inicio_ent[e0], inicio_ent[e1]
+        n_linhas = r1 - r0
+
+        if metodo == 'poisson':
+            pesos = rng.poisson(1.0, size=(n_replicas, n_linhas)).astype(np.float32)
+        else:
+            # Cada linha sorteia uma linha da mesma entidade: n sorteios com reposição por entidade
+            ent_local = entidade[r0:r1]
+            ini = inicio_ent[ent_local] - r0
+            tam = inicio_ent[ent_local + 1] - inicio_ent[ent_local]
+            sorteio = ini + (rng.random((n_replicas, n_linhas)) * tam).astype(np.int64)
+            sorteio += np.arange(n_replicas, dtype=np.int64)[:, None] * n_linhas
+            pesos = np.bincount(sorteio.ravel(), minlength=n_replicas * n_linhas)
+            pesos = pesos.reshape(n_replicas, n_linhas).astype(np.float32)
+            del sorteio
+
+        # Soma dos pesos por célula presente e espalhamento para a grade completa
+        cel = celula[r0:r1]
+        inicio_cel = np.flatnonzero(np.r_[True, cel[1:] != cel[:-1]])
+        somas = np.add.reduceat(pesos, inicio_cel, axis=1)
+        grade = np.zeros((n_replicas, (e1 - e0) * n_anos * 2), dtype=np.float64)
+        grade[:, cel[inicio_cel] - e0 * n_anos * 2] = somas
+        grade = grade.reshape(n_replicas, e1 - e0, n_anos, 2)
+        del pesos, somas
+
+        metricas = _metricas_bootstrap(grade[..., 1], grade[..., 0], anos)
+        for m in metricas_nomes:
+            inf, sup = np.nanpercentile(metricas[m], [cauda, 100 - cauda], axis=0)
+            ic[f'{m}_ic_inf'][e0:e1] = inf
+            ic[f'{m}_ic_sup'][e0:e1] = sup
+        e0 = e1
+
+    return pd.concat([entidades, pd.DataFrame(ic)], axis=1)
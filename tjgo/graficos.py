@@ -0,0 +1,266 @@
+'''Gráficos Compartilhados:
+- Tabela Plotly de proporções e gráfico de dispersão estratégico (quadrantes) usados pelas
+análises. O Plotly é importado dentro das funções, apenas quando um gráfico é construído.
+- dispersao: px.scatter com modo de renderização pelo número de pontos. Até LIMITE_WEBGL, SVG;
+até LIMITE_DENSIDADE, WebGL (Scattergl); acima, mapa de densidade 2-D pré-agregado
+(np.histogram2d) com apenas os destaques (maiores pesos e pontos extremos) como marcadores.'''
+
+import threading
+
+import numpy as np
+
+# O plotly.express lê o template padrão (objeto compartilhado) de forma não segura entre threads:
+# as chamadas px.* das análises executadas em paralelo pelo pipeline passam por esta trava.
+TRAVA_PLOTLY = threading.Lock()
+
+# Pontos a partir dos quais a dispersão usa WebGL e, depois, o mapa de densidade
+LIMITE_WEBGL = 2_000
+LIMITE_DENSIDADE = 50_000
+
+# Modo densidade: células por eixo, marcadores de maior peso e de pontos extremos
+CELULAS_DENSIDADE = 200
+DESTAQUES_PESO = 500
+DESTAQUES_EXTREMOS = 2_000
+Z_EXTREMO = 3.5  # desvio robusto (mediana/MAD) a partir do qual o ponto é extremo
+
+# update_traces(selector=...) só nos marcadores (o mapa de densidade não tem marker)
+SELETOR_PONTOS = {'mode': 'markers'}
+
+
+# Função para cores alternadas (zebrado)
+def get_row_colors(n):
+    return ['lavender' if i % 2 == 0 else 'white' for i in range(n)]
+
+
+def colunas_tabela_proporcoes(colunas_chave, anos):
+    """Pares (coluna, cabeçalho) na ordem de exibição da tabela de proporções."""
+    colunas = list(colunas_chave)
+    colunas += [(f'sigilosos_{ano}', f'Sigilosos {ano}') for ano in anos]
+    colunas += [('total_sigilosos', 'Total Sigilosos')]
+    colunas += [(f'proporcao_sigilosos_{ano}', f'Proporção de Sigilosos {ano}') for ano in anos]
+    colunas += [('variacao_total_sigilosos', 'Variação Total de Sigilosos'),
+                ('proporcao_media_sigilosos', 'Proporção Média de Sigilosos')]
+    colunas += [(f'nao_sigilosos_{ano}', f'Não Sigilosos {ano}') for ano in anos]
+    colunas += [('total_nao_sigilosos', 'Total Não Sigilosos')]
+    colunas += [(f'proporcao_nao_sigilosos_{ano}', f'Proporção de Não Sigilosos {ano}') for ano in anos]
+    colunas += [('variacao_total_nao_sigilosos', 'Variação Total de Não Sigilosos'),
+                ('proporcao_media_nao_sigilosos', 'Proporção Média de Não Sigilosos'),
+                ('total_processos', 'Total de Processos')]
+    return colunas
+
+
+def figura_tabela(tabela_formatada, colunas, titulo):
+    """
+    Tabela Plotly (go.Table) zebrada com as colunas [(coluna, cabeçalho), ...]. Acima de
+    tabela_html.LIMITE_LINHAS_PLOTLY linhas, devolve uma tabela_html.TabelaHTML (paginada,
+    renderizada no navegador), que também tem show() e write_html().
+    """
+    import plotly.graph_objects as go
+
+    from tjgo import tabela_html
+
+    if len(tabela_formatada) > tabela_html.LIMITE_LINHAS_PLOTLY:
+        return tabela_html.TabelaHTML(tabela_formatada, colunas, titulo)
+
+    row_colors = get_row_colors(len(tabela_formatada))
+    fig = go.Figure(data=[go.Table(
+        header=dict(
+            values=[cabecalho for _, cabecalho in colunas],
+            fill_color='#203864',
+            font=dict(color='white', size=12),
+            align='left',
+            line_color='darkslategray'
+        ),
+        cells=dict(
+            values=[tabela_formatada[coluna] for coluna, _ in colunas],
+            fill_color=[row_colors] * len(colunas),
+            align='left',
+            font=dict(color='black', size=11),
+            line_color='darkslategray'
+        )
+    )])
+
+    fig.update_layout(
+        title=titulo,
+        title_x=0.5,
+        margin=dict(l=20, r=20, t=100, b=20),
+        height=900,
+        paper_bgcolor='white',
+        plot_bgcolor='white'
+    )
+    return fig
+
+
+def adicionar_quadrantes(fig, x_ref, y_min, y_max, rotulos, rotulo_x=None, rotulo_y=None):
+    """
+    Linhas de referência (y = 0 e x = x_ref) e anotações dos quadrantes.
+    rotulos: textos na ordem (direita-cima, esquerda-cima, esquerda-baixo, direita-baixo).
+    """
+    fig.add_hline(y=0, line_dash="dash", line_color="grey",
+                  annotation_text=rotulo_y, annotation_position="right")
+    fig.add_vline(x=x_ref, line_dash="dash", line_color="grey",
+                  annotation_text=rotulo_x, annotation_position="top")
+
+    cores = ["#e3f2fd", "#e8f5e9", "#ffebee", "#fff3e0"]
+    posicoes = [(95, y_max, 'right'), (5, y_max, 'left'), (5, y_min, 'left'), (95, y_min, 'right')]
+    for texto, cor, (x, y, ancora) in zip(rotulos, cores, posicoes):
+        fig.add_annotation(x=x, y=y * 0.9, text=f"<b>{texto}</b>", showarrow=False,
+                           bgcolor=cor, xanchor=ancora)
+    return fig
+
+
+# --- DISPERSÃO ADAPTATIVA ---
+def modo_renderizacao(n, limite_webgl=LIMITE_WEBGL, limite_densidade=LIMITE_DENSIDADE):
+    """'svg', 'webgl' ou 'densidade' para n pontos."""
+    if n > limite_densidade:
+        return 'densidade'
+    return 'webgl' if n > limite_webgl else 'svg'
+
+
+def _desvio_robusto(valores):
+    """|valor - mediana| / (1,4826 · MAD); 0 quando o MAD é nulo."""
+    mediana = np.nanmedian(valores)
+    mad = 1.4826 * np.nanmedian(np.abs(valores - mediana))
+    if not mad:
+        return np.zeros_like(valores)
+    return np.nan_to_num(np.abs(valores - mediana) / mad)
+
+
+def _maiores(valores, k):
+    """Posições dos k maiores valores (argpartition, sem ordenar tudo)."""
+    if k >= valores.size:
+        return np.arange(valores.size)
+    return np.argpartition(valores, valores.size - k)[valores.size - k:]
+
+
+def selecionar_destaques(tabela, x, y, peso=None, n_peso=DESTAQUES_PESO, n_extremos=DESTAQUES_EXTREMOS):
+    """
+    Posições (ordenadas) das linhas desenhadas como marcadores no modo densidade: as n_peso de
+    maior peso e até n_extremos pontos extremos (desvio robusto > Z_EXTREMO em x ou y).
+    """
+    vx = tabela[x].to_numpy(dtype=float)
+    vy = tabela[y].to_numpy(dtype=float)
+    desvio = np.maximum(_desvio_robusto(vx), _desvio_robusto(vy))
+    extremos = np.flatnonzero(desvio > Z_EXTREMO)
+    extremos = extremos[_maiores(desvio[extremos], n_extremos)]
+    partes = [extremos]
+    if peso is not None:
+        partes.append(_maiores(np.nan_to_num(tabela[peso].to_numpy(dtype=float), nan=-np.inf), n_peso))
+    return np.unique(np.concatenate(partes))
+
+
+def mapa_densidade(vx, vy, celulas=CELULAS_DENSIDADE):
+    """go.Heatmap com a contagem de pontos por célula (np.histogram2d), em escala log."""
+    import plotly.graph_objects as go
+
+    finitos = np.isfinite(vx) & np.isfinite(vy)
+    contagens, bordas_x, bordas_y = np.histogram2d(vx[finitos], vy[finitos], bins=celulas)
+    contagens = contagens.T  # linhas = y
+    z = np.where(contagens > 0, np.log10(np.maximum(contagens, 1)) + 1, np.nan)  # células vazias transparentes
+    return go.Heatmap(
+        x=(bordas_x[:-1] + bordas_x[1:]) / 2,
+        y=(bordas_y[:-1] + bordas_y[1:]) / 2,
+        z=z,
+        text=contagens.astype(np.int64),
+        colorscale='Blues',
+        showscale=False,
+        hovertemplate='%{text} pontos na célula<extra></extra>',
+        name='densidade',
+    )
+
+
+def _linha_ols(vx, vy):
+    """Reta de mínimos quadrados (y ~ x) sobre todos os pontos, como a trendline='ols' do px."""
+    import plotly.graph_objects as go
+
+    finitos = np.isfinite(vx) & np.isfinite(vy)
+    inclinacao, intercepto = np.polyfit(vx[finitos], vy[finitos], 1)
+    extremos_x = np.array([vx[finitos].min(), vx[finitos].max()])
+    return go.Scattergl(
+        x=extremos_x, y=intercepto + inclinacao * extremos_x, mode='lines', name='OLS',
+        line=dict(color='black'), showlegend=False,
+        hovertemplate=f'y = {inclinacao:.3f}·x + {intercepto:.3f}<extra>OLS</extra>',
+    )
+
+
+def dispersao(tabela, x, y, peso=None, modo=None, **kwargs_px):
+    """
+    px.scatter(tabela, x, y, **kwargs_px) com o modo de renderização de modo_renderizacao(len(tabela)),
+    ou o modo informado. No modo 'densidade', só os destaques (selecionar_destaques, pelo peso)
+    viram marcadores sobre o mapa de densidade de todos os pontos, e trendline='ols' é ajustada
+    com todos os pontos. Use SELETOR_PONTOS em fig.update_traces.
+    """
+    import plotly.express as px
+
+    modo = modo or modo_renderizacao(len(tabela))
+    pontos, tendencia = tabela, None
+    if modo == 'densidade':
+        if kwargs_px.get('trendline') == 'ols':
+            tendencia = kwargs_px.pop('trendline')
+        pontos = tabela.iloc[selecionar_destaques(tabela, x, y, peso)]
+
+    with TRAVA_PLOTLY:
+        fig = px.scatter(pontos, x=x, y=y, render_mode='svg' if modo == 'svg' else 'webgl', **kwargs_px)
+
+    if modo == 'densidade':
+        vx, vy = tabela[x].to_numpy(dtype=float), tabela[y].to_numpy(dtype=float)
+        camadas = [mapa_densidade(vx, vy)]
+        if tendencia:
+            camadas.append(_linha_ols(vx, vy))
+        # Mapa por baixo dos marcadores
+        fig.add_traces(camadas)
+        fig.data = fig.data[-len(camadas):] + fig.data[:-len(camadas)]
+        fig.update_layout(annotations=[dict(
+            text=f"{len(tabela):,} pontos: densidade + {len(pontos):,} destaques".replace(',', '.'),
+            xref='paper', yref='paper', x=0, y=1.02, showarrow=False, font=dict(size=11, color='grey'),
+        )])
+    return fig
+
+
+def dispersao_estrategica(tabela, hover_name, custom_data, hovertemplate, anos, peso='total_processos'):
+    """
+    Gráfico de dispersão estratégico: proporção média de sigilosos (x) vs variação total (y),
+    com quadrantes de especialização. Muitos pontos: WebGL ou densidade (dispersao), com os
+    destaques escolhidos pela coluna peso.
+    """
+    periodo = f"({anos[-1]} - {anos[0]})"
+    fig = dispersao(
+        tabela,
+        x='proporcao_media_sigilosos',
+        y='variacao_total_sigilosos',
+        peso=peso if peso in tabela.columns else None,
+        title='<b>Análise Estratégica Comparativa: Casos Sigilosos</b>',
+        labels={
+            'proporcao_media_sigilosos': 'Proporção Média de Casos Sigilosos (%)',
+            'variacao_total_sigilosos': f'Variação da Proporção de Casos Sigilosos {periodo}'
+        },
+        hover_name=hover_name,
+        custom_data=custom_data
+    )
+
+    media_proporcao_sigilosos = tabela['proporcao_media_sigilosos'].mean()
+    adicionar_quadrantes(
+        fig,
+        x_ref=media_proporcao_sigilosos,
+        y_min=tabela['variacao_total_sigilosos'].min(),
+        y_max=tabela['variacao_total_sigilosos'].max(),
+        rotulos=['Especialistas em Expansão', 'Novos Focos de Atuação',
+                 'Fora do Foco', 'Especialistas em Transição'],
+        rotulo_x=f"Média: {media_proporcao_sigilosos:.2f}%".replace('.', ','),
+        rotulo_y="Variação = 0",
+    )
+
+    fig.update_xaxes(title_text="Proporção Média de Casos Sigilosos (%)", ticksuffix="%")
+    fig.update_yaxes(title_text=f"Variação da Proporção {periodo}", ticksuffix="%")
+    fig.update_traces(
+        marker=dict(size=10, color='#203864'),
+        hovertemplate="<br>".join(hovertemplate + ["<extra></extra>"]),
+        selector=SELETOR_PONTOS
+    )
+    fig.update_layout(
+        title_text='<b>Análise Estratégica Comparativa: Foco em Casos Sigilosos VS Não Sigilosos</b>',
+        title_x=0.5,
+        height=900,
+        showlegend=False
+    )
+    return fig
@@ -0,0 +1,151 @@
+'''Hierarquia Comarca → Serventia → Área de Ação:
+- Volumes de processos e proporção de sigilosos em todos os níveis da hierarquia, com contagens
+exatas de processos distintos em cada nível (um processo em duas serventias conta uma vez na
+comarca), numa única agregação por conjuntos de agrupamento (GROUPING SETS): as linhas de cada
+nível são empilhadas com o código do nó e um único groupby conta os processos distintos de todos
+os nós de uma vez, em vez de um groupby por nível.
+- A hierarquia é codificada como vetores ids/parents (o id de cada nó é a sua posição na tabela)
+e desenhada numa única figura (sunburst ou treemap) para o estado inteiro.'''
+
+# --- BIBLIOTECAS NECESSÁRIAS ---
+import numpy as np
+import pandas as pd
+
+from tjgo.agregacao import base_entidades
+from tjgo.cnj import coluna_processo
+from tjgo.dados import ANOS_PADRAO, codificar
+from tjgo.instrumentacao import etapa
+
+NIVEIS_PADRAO = ['comarca', 'serventia', 'nome_area_acao']
+COLUNAS_HIERARQUIA = ['id', 'pai', 'nivel', 'rotulo', 'caminho', 'processos', 'sigilosos',
+                      'nao_sigilosos', 'proporcao_sigilosos', 'tamanho']
+
+# Níveis desenhados de início (os demais aparecem ao clicar em um setor)
+PROFUNDIDADE_INICIAL = 2
+
+
+# --- AGREGAÇÃO POR CONJUNTOS DE AGRUPAMENTO ---
+def contar_niveis(df, niveis=NIVEIS_PADRAO, anos=ANOS_PADRAO):
+    """
+    Uma linha por nó da hierarquia (todos os níveis): nivel, códigos dos níveis até ele,
+    processos distintos, sigilosos e não sigilosos distintos (como em agregacao.processar_dados).
+    """
+    niveis = list(niveis)
+    base = base_entidades(df, niveis)
+    base = base[base['ano_distribuicao'].isin(anos)]
+    processos, _ = codificar(base[coluna_processo(base)])
+    sigilo = base['is_segredo_justica'].to_numpy(dtype=bool)
+    codigos, valores = zip(*(codificar(base[nivel]) for nivel in niveis))
+    tamanhos = [len(v) for v in valores]
+
+    # Nulos (código -1) em qualquer nível ou no processo ficam de fora
+    validos = (processos >= 0) & np.logical_and.reduce([c >= 0 for c in codigos])
+    folha = np.ravel_multi_index([c[validos] for c in codigos], tamanhos)
+
+    # Folhas distintas primeiro: (nó folha, processo, sigilo) se repetem entre advogados/arquivos
+    folhas = pd.DataFrame({'folha': folha, 'processo': processos[validos], 'sigilo': sigilo[validos]}).drop_duplicates()
+    codigos_folha = np.unravel_index(folhas['folha'].to_numpy(), tamanhos)
+
+    # GROUPING SETS: cada nível empilhado com o seu código de nó (deslocado para ser único)
+    deslocamentos = np.concatenate([[0], np.cumsum([np.prod(tamanhos[:k + 1]) for k in range(len(niveis))])])
+    nos = np.concatenate([deslocamentos[k] + np.ravel_multi_index(codigos_folha[:k + 1], tamanhos[:k + 1])
+                          for k in range(len(niveis))])
+    empilhado = pd.DataFrame({
+        'no': nos,
+        'processo': np.tile(folhas['processo'].to_numpy(), len(niveis)),
+        'sigilo': np.tile(folhas['sigilo'].to_numpy(), len(niveis)),
+    })
+
+    # Processo distinto por nó (com e sem sigilo), depois contagens por nó: um único groupby de cada
+    por_processo = empilhado.groupby(['no', 'processo'], sort=False)['sigilo'].agg(['max', 'min'])
+    contagens = pd.DataFrame({
+        'processos': 1,
+        'sigilosos': por_processo['max'].astype(np.int64),
+        'nao_sigilosos': (~por_processo['min']).astype(np.int64),
+    }).groupby(level='no').sum()
+
+    no = contagens.index.to_numpy()
+    nivel = np.searchsorted(deslocamentos, no, side='right') - 1
+    contagens.insert(0, 'nivel', nivel)
+    for k in range(len(niveis)):
+        # Código do nível k de cada nó (-1 abaixo da profundidade do nó)
+        local = no - deslocamentos[nivel]
+        codigo = np.full(len(no), -1, dtype=np.int64)
+        for profundidade in range(k, len(niveis)):
+            alvo = nivel == profundidade
+            codigo[alvo] = np.unravel_index(local[alvo], tamanhos[:profundidade + 1])[k]
+        contagens.insert(1 + k, f'codigo_{k}', codigo)
+    return contagens.reset_index(drop=True), valores
+
+
+def montar_hierarquia(contagens, valores):
+    """
+    Tabela COLUNAS_HIERARQUIA: id (posição), pai (id do nó do nível de cima, -1 na raiz),
+    rótulo e caminho ('Comarca / Serventia / Área'). tamanho: processos distintos, ou a soma dos
+    filhos quando maior (processos em mais de um filho), para o desenho com branchvalues='total'.
+    """
+    n_niveis = len(valores)
+    colunas_codigo = [f'codigo_{k}' for k in range(n_niveis)]
+    tabela = contagens.sort_values(colunas_codigo).reset_index(drop=True)
+    tabela['id'] = np.arange(len(tabela))
+
+    # Pai: o nó de nível - 1 com os mesmos códigos até lá
+    chave = pd.MultiIndex.from_frame(tabela[colunas_codigo])
+    pai = np.full(len(tabela), -1, dtype=np.int64)
+    for k in range(1, n_niveis):
+        alvo = np.flatnonzero(tabela['nivel'].to_numpy() == k)
+        codigos_pai = tabela.loc[alvo, colunas_codigo].to_numpy().copy()
+        codigos_pai[:, k:] = -1
+        pai[alvo] = chave.get_indexer(pd.MultiIndex.from_arrays(codigos_pai.T))
+    tabela['pai'] = pai
+
+    rotulos = [np.asarray(pd.Index(v).astype(str), dtype=object) for v in valores]
+    nivel = tabela['nivel'].to_numpy()
+    # Posição extra no fim: código -1 (abaixo da profundidade do nó) -> ''
+    partes = [np.append(rotulos[k], '')[tabela[f'codigo_{k}'].to_numpy()] for k in range(n_niveis)]
+    tabela['rotulo'] = np.choose(nivel, partes)
+    tabela['caminho'] = [' / '.join(p for p in linha if p) for linha in zip(*partes)]
+
+    tabela['proporcao_sigilosos'] = (tabela['sigilosos'] / tabela['processos'] * 100).round(4)
+
+    # Tamanho dos setores: de baixo para cima, nunca menor que a soma dos filhos
+    tamanho = tabela['processos'].to_numpy(dtype=np.int64).copy()
+    for k in range(n_niveis - 1, 0, -1):
+        alvo = nivel == k
+        soma = np.bincount(pai[alvo], weights=tamanho[alvo], minlength=len(tabela)).astype(np.int64)
+        tamanho = np.maximum(tamanho, soma)
+    tabela['tamanho'] = tamanho
+    return tabela[COLUNAS_HIERARQUIA]
+
+
+def agregar_hierarquia(df, niveis=NIVEIS_PADRAO, anos=ANOS_PADRAO):
+    """Tabela da hierarquia (montar_hierarquia) de df nos anos informados."""
+    with etapa('hierarquia', df) as e:
+        contagens, valores = contar_niveis(df, niveis, anos)
+        return e.saida(montar_hierarquia(contagens, valores))
+
+
+# --- FIGURA ---
+def figura_hierarquia(tabela, tipo='sunburst', titulo='', profundidade=PROFUNDIDADE_INICIAL):
+    """Sunburst ou treemap da tabela da hierarquia: área = processos, cor = proporção de sigilosos."""
+    import plotly.graph_objects as go
+
+    classe = {'sunburst': go.Sunburst, 'treemap': go.Treemap}[tipo]
+    pais = tabela['pai'].to_numpy()
+    fig = go.Figure(classe(
+        ids=tabela['id'].astype(str),
+        parents=np.where(pais >= 0, pais.astype(str), ''),
+        labels=tabela['rotulo'],
+        values=tabela['tamanho'],
+        branchvalues='total',
+        maxdepth=profundidade,
+        customdata=tabela[['processos', 'sigilosos', 'proporcao_sigilosos']].to_numpy(),
+        hovertext=tabela['caminho'],
+        hovertemplate=('<b>%{hovertext}</b><br>Processos: %{customdata[0]}<br>'
+                       'Sigilosos: %{customdata[1]}<br>Proporção de sigilosos: %{customdata[2]:.2f}%'
+                       '<extra></extra>'),
+        marker=dict(colors=tabela['proporcao_sigilosos'], colorscale='Blues', showscale=True,
+                    colorbar=dict(title='Sigilosos (%)', ticksuffix='%')),
+    ))
+    fig.update_layout(title=titulo, title_x=0.5, height=900, margin=dict(l=20, r=20, t=80, b=20))
+    return fig
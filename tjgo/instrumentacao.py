@@ -0,0 +1,211 @@
+'''Instrumentação das Execuções:
+- etapa(nome) mede uma etapa: tempo de relógio, CPU da thread, linhas de entrada/saída, RSS e
+pico de RSS (e do tracemalloc, quando ativo). Sem registro ativo, etapa() não custa nada.
+- registrar_execucao() ativa o registro de uma execução; gravar_registro() salva o log JSON.
+- perfilar() envolve a execução com cProfile e grava o relatório (.prof e texto).
+
+Com várias análises em paralelo, RSS e tracemalloc são do processo inteiro: os picos por etapa
+só são isolados em execução sequencial (--workers 1 ou --profile).'''
+
+# --- BIBLIOTECAS NECESSÁRIAS ---
+import contextlib
+import json
+import os
+import platform
+import sys
+import threading
+import time
+from datetime import datetime
+
+from tjgo.memoria import pico_rss, pico_rss_processo, rss_atual, zerar_pico_rss
+
+_registro = None
+_local = threading.local()
+
+
+def _linhas(objeto):
+    """Linhas de um DataFrame/Series/array (ou o próprio inteiro); None para outros objetos."""
+    if objeto is None or isinstance(objeto, int):
+        return objeto
+    return len(objeto) if hasattr(objeto, 'shape') else None
+
+
+class Etapa:
+    """Medição de uma etapa; use saida(obj) para informar as linhas produzidas."""
+
+    def __init__(self, nome, entrada=None):
+        self.dados = {'etapa': nome, 'linhas_entrada': _linhas(entrada), 'linhas_saida': None}
+        self.pico = 0  # pico já observado quando uma etapa interna reinicia o pico de RSS
+
+    def saida(self, objeto):
+        self.dados['linhas_saida'] = _linhas(objeto)
+        return objeto
+
+
+class RegistroExecucao:
+    """Etapas medidas durante uma execução (seguro para várias threads)."""
+
+    def __init__(self, isolar_picos=False, tracemalloc_ativo=False):
+        self.isolar_picos = isolar_picos
+        self.tracemalloc_ativo = tracemalloc_ativo
+        self.inicio = time.perf_counter()
+        self.inicio_iso = datetime.now().isoformat(timespec='seconds')
+        self.etapas = []
+        self._trava = threading.Lock()
+
+    @contextlib.contextmanager
+    def medir(self, nome, entrada=None):
+        import tracemalloc
+
+        etapa = Etapa(nome, entrada)
+        pilha = getattr(_local, 'pilha', None)
+        if pilha is None:
+            pilha = _local.pilha = []
+        etapa.dados['pai'] = pilha[-1].dados['etapa'] if pilha else None
+        etapa.dados['thread'] = threading.current_thread().name
+
+        if self.isolar_picos:
+            # O pico até aqui ainda conta para as etapas externas abertas
+            pico = pico_rss() or 0
+            for externa in pilha:
+                externa.pico = max(externa.pico, pico)
+            zerar_pico_rss()
+            if self.tracemalloc_ativo:
+                tracemalloc.reset_peak()
+        pilha.append(etapa)
+        rss_inicio = rss_atual()
+        cpu, relogio = time.thread_time(), time.perf_counter()
+        status = 'ok'
+        try:
+            yield etapa
+        except BaseException:
+            status = 'erro'
+            raise
+        finally:
+            pilha.pop()
+            etapa.dados.update({
+                'status': status,
+                'inicio_s': relogio - self.inicio,
+                'tempo_s': time.perf_counter() - relogio,
+                'cpu_s': time.thread_time() - cpu,
+                'rss_inicio_bytes': rss_inicio,
+                'rss_fim_bytes': rss_atual(),
+                'pico_rss_bytes': max(pico_rss() or 0, etapa.pico) or None,
+                'pico_tracemalloc_bytes': (tracemalloc.get_traced_memory()[1]
+                                           if self.tracemalloc_ativo and tracemalloc.is_tracing() else None),
+            })
+            with self._trava:
+                self.etapas.append(etapa.dados)
+
+    def resumo(self, **extras):
+        return {
+            'inicio': self.inicio_iso,
+            'duracao_s': time.perf_counter() - self.inicio,
+            'pico_rss_bytes': pico_rss_processo(),
+            'picos_isolados_por_etapa': self.isolar_picos,
+            'ambiente': ambiente(),
+            **extras,
+            'etapas': sorted(self.etapas, key=lambda e: e['inicio_s']),
+        }
+
+
+def etapa(nome, entrada=None):
+    """Context manager de medição; nulo quando nenhuma execução está sendo registrada."""
+    if _registro is None:
+        return contextlib.nullcontext(Etapa(nome, entrada))
+    return _registro.medir(nome, entrada)
+
+
+@contextlib.contextmanager
+def registrar_execucao(isolar_picos=False, tracemalloc_ativo=False):
+    """Ativa o registro global de etapas durante o bloco."""
+    import tracemalloc
+
+    global _registro
+    anterior = _registro
+    _registro = RegistroExecucao(isolar_picos=isolar_picos, tracemalloc_ativo=tracemalloc_ativo)
+    if tracemalloc_ativo:
+        tracemalloc.start()
+    try:
+        yield _registro
+    finally:
+        if tracemalloc_ativo:
+            tracemalloc.stop()
+        _registro = anterior
+
+
+def _versao_git():
+    import subprocess
+
+    try:
+        raiz = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+        return subprocess.run(['git', 'rev-parse', '--short', 'HEAD'], cwd=raiz, capture_output=True,
+                              text=True, timeout=10).stdout.strip() or None
+    except (OSError, subprocess.SubprocessError):
+        return None
+
+
+def ambiente():
+    """Versões e máquina, para comparar execuções."""
+    import numpy as np
+    import pandas as pd
+
+    return {
+        'python': platform.python_version(),
+        'plataforma': platform.platform(),
+        'cpus': os.cpu_count(),
+        'numpy': np.__version__,
+        'pandas': pd.__version__,
+        'git': _versao_git(),
+    }
+
+
+def gravar_registro(registro, pasta, prefixo='execucao', **extras):
+    """Grava <pasta>/<prefixo>_AAAAMMDD_HHMMSS.json e retorna o caminho."""
+    os.makedirs(pasta, exist_ok=True)
+    caminho = os.path.join(pasta, f"{prefixo}_{datetime.now():%Y%m%d_%H%M%S}.json")
+    with open(caminho, 'w', encoding='utf-8') as f:
+        json.dump(registro.resumo(**extras), f, indent=2, ensure_ascii=False, default=str)
+    return caminho
+
+
+def imprimir_resumo(registro, limite=15):
+    """As etapas mais lentas da execução, em texto (stderr)."""
+    from tjgo.memoria import formatar_bytes
+
+    etapas = sorted(registro.etapas, key=lambda e: e['tempo_s'], reverse=True)[:limite]
+    print("\n--- ETAPAS MAIS LENTAS ---", file=sys.stderr)
+    for e in etapas:
+        linhas = f"{e['linhas_entrada'] if e['linhas_entrada'] is not None else '-'} -> " \
+                 f"{e['linhas_saida'] if e['linhas_saida'] is not None else '-'}"
+        print(f"{e['etapa']:<40} {e['tempo_s']:>8.2f}s  cpu {e['cpu_s']:>8.2f}s  "
+              f"pico RSS {formatar_bytes(e['pico_rss_bytes']):>10}  linhas {linhas}", file=sys.stderr)
+
+
+@contextlib.contextmanager
+def perfilar(pasta, ativo=True, linhas_relatorio=40):
+    """cProfile do bloco (apenas a thread atual); grava perfil_*.prof e perfil_*.txt na pasta."""
+    if not ativo:
+        yield None
+        return
+    import cProfile
+    import io
+    import pstats
+
+    perfil = cProfile.Profile()
+    caminhos = {}
+    perfil.enable()
+    try:
+        yield caminhos
+    finally:
+        perfil.disable()
+        os.makedirs(pasta, exist_ok=True)
+        base = os.path.join(pasta, f"perfil_{datetime.now():%Y%m%d_%H%M%S}")
+        perfil.dump_stats(base + '.prof')
+        texto = io.StringIO()
+        estatisticas = pstats.Stats(perfil, stream=texto).strip_dirs()
+        estatisticas.sort_stats('cumulative').print_stats(linhas_relatorio)
+        estatisticas.sort_stats('tottime').print_stats(linhas_relatorio)
+        with open(base + '.txt', 'w', encoding='utf-8') as f:
+            f.write(texto.getvalue())
+        caminhos.update(prof=base + '.prof', relatorio=base + '.txt')
@@ -0,0 +1,130 @@
+'''Memória do Processo:
+- Leitura do RSS atual e do pico de RSS (VmHWM em /proc/self/status, no Linux), com
+reinício do pico por etapa via /proc/self/clear_refs. Fora do Linux, usa getrusage.
+- Modo de economia de memória: contagens no menor tipo inteiro, textos repetidos como
+categóricos e verificação do pico de RSS contra um limite informado pelo usuário.'''
+
+# --- BIBLIOTECAS NECESSÁRIAS ---
+import sys
+
+# Maior pico observado antes do último zerar_pico_rss() (para o pico do processo inteiro)
+_pico_anterior = 0
+
+
+def _status_kb(campo):
+    """Valor (em bytes) de um campo de /proc/self/status, ou None fora do Linux."""
+    try:
+        with open('/proc/self/status') as f:
+            for linha in f:
+                if linha.startswith(campo + ':'):
+                    return int(linha.split()[1]) * 1024
+    except OSError:
+        return None
+    return None
+
+
+def _maxrss():
+    try:
+        import resource
+    except ImportError:
+        return None
+    pico = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+    # Linux informa em KB; macOS em bytes
+    return pico if sys.platform == 'darwin' else pico * 1024
+
+
+def rss_atual():
+    """RSS atual do processo em bytes (None se indisponível)."""
+    return _status_kb('VmRSS')
+
+
+def pico_rss():
+    """Maior RSS do processo em bytes desde o início ou desde o último zerar_pico_rss()."""
+    pico = _status_kb('VmHWM')
+    return pico if pico is not None else _maxrss()
+
+
+def pico_rss_processo():
+    """Maior RSS desde o início do processo, mesmo depois de zerar_pico_rss()."""
+    pico = pico_rss()
+    return None if pico is None else max(pico, _pico_anterior)
+
+
+def zerar_pico_rss():
+    """Reinicia o pico de RSS (Linux >= 4.0). Retorna False quando não é possível."""
+    global _pico_anterior
+    _pico_anterior = max(_pico_anterior, pico_rss() or 0)
+    try:
+        with open('/proc/self/clear_refs', 'w') as f:
+            f.write('5')
+        return True
+    except OSError:
+        return False
+
+
+def formatar_bytes(n):
+    if n is None:
+        return '-'
+    for unidade in ('B', 'KB', 'MB', 'GB'):
+        if abs(n) < 1024 or unidade == 'GB':
+            return f"{n:,.0f} {unidade}" if unidade == 'B' else f"{n:,.1f} {unidade}"
+        n /= 1024
+
+
+# --- MODO DE ECONOMIA ---
+# Colunas de texto só viram categóricas quando há repetição suficiente (valores únicos / linhas)
+FRACAO_UNICOS_CATEGORIA = 0.5
+
+
+class LimiteMemoriaExcedido(MemoryError):
+    """Pico de RSS acima do limite informado (--limite-memoria)."""
+
+
+def verificar_limite(limite_bytes, etapa):
+    """Falha com LimiteMemoriaExcedido se o pico de RSS já passou do limite (None = sem limite)."""
+    if not limite_bytes:
+        return
+    pico = pico_rss_processo()
+    if pico is not None and pico > limite_bytes:
+        raise LimiteMemoriaExcedido(
+            f"Pico de RSS de {formatar_bytes(pico)} após '{etapa}' excede o limite de "
+            f"{formatar_bytes(limite_bytes)}")
+
+
+def reduzir_inteiros(df, colunas=None):
+    """Converte as colunas inteiras (todas ou as informadas) para o menor tipo que comporta os valores."""
+    import pandas as pd
+
+    colunas = df.select_dtypes('integer').columns if colunas is None else colunas
+    for col in colunas:
+        df[col] = pd.to_numeric(df[col], downcast='integer')
+    return df
+
+
+def categorizar(df, colunas=None, fracao_unicos=FRACAO_UNICOS_CATEGORIA):
+    """Colunas de texto (todas ou as informadas) como categóricas, quando há repetição suficiente."""
+    colunas = df.select_dtypes('object').columns if colunas is None else colunas
+    for col in colunas:
+        if col in df.columns and df[col].dtype == object and len(df):
+            if df[col].nunique(dropna=False) <= fracao_unicos * len(df):
+                df[col] = df[col].astype('category')
+    return df
+
+
+def concatenar(dfs):
+    """
+    pd.concat que preserva colunas categóricas com categorias diferentes em cada parte
+    (união ordenada das categorias) em vez de convertê-las para object.
+    """
+    import pandas as pd
+    from pandas.api.types import union_categoricals
+
+    categoricas = [col for col in dfs[0].columns
+                   if all(isinstance(df[col].dtype, pd.CategoricalDtype) for df in dfs if col in df.columns)]
+    if len(dfs) > 1 and categoricas:
+        uniao = {col: union_categoricals([df[col] for df in dfs], sort_categories=True).categories
+                 for col in categoricas}
+        for df in dfs:
+            for col in categoricas:
+                df[col] = df[col].cat.set_categories(uniao[col])
+    return pd.concat(dfs, ignore_index=True)
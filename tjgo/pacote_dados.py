@@ -0,0 +1,247 @@
+'''Pacote de Dados Compartilhado entre Figuras:
+- As figuras de uma análise repetem os mesmos dados: a dispersão leva x, y, hovertext e customdata
+(que repete y e as contagens), a tabela leva as mesmas entidades e uma lista de cores por coluna.
+Em write_html cada figura serializa tudo de novo.
+- Aqui as figuras de uma página são percorridas uma vez: cada vetor (1-D, ou cada coluna de um
+2-D como customdata) vira uma coluna de um pacote colunar único, sem repetição (colunas iguais,
+por conteúdo, são gravadas uma vez). As figuras guardam só referências ({'$col': i}).
+- Os vetores numéricos que o plotly (>= 6) já entrega codificados ({'dtype', 'bdata'}) são
+decodificados antes, para também entrarem no pacote.
+- Números vão como vetores tipados (o menor inteiro que comporta a coluna, ou float64), textos
+como dicionário (valores distintos + códigos). O pacote (manifesto JSON + bytes das colunas) vai
+comprimido (gzip + base64) e é descomprimido e referenciado pelo navegador antes do Plotly.newPlot.'''
+
+# --- BIBLIOTECAS NECESSÁRIAS ---
+import base64
+import gzip
+import hashlib
+import html
+import json
+import re
+import struct
+
+import numpy as np
+import pandas as pd
+
+# Vetores menores que isso ficam no próprio JSON da figura
+MINIMO_ELEMENTOS = 16
+
+ALINHAMENTO = 8
+
+_TIPOS_INTEIROS = [np.uint8, np.int8, np.uint16, np.int16, np.uint32, np.int32]
+_CODIGOS_DTYPE = {np.dtype(t): codigo for t, codigo in
+                  [(np.uint8, 'u1'), (np.int8, 'i1'), (np.uint16, 'u2'), (np.int16, 'i2'),
+                   (np.uint32, 'u4'), (np.int32, 'i4'), (np.float64, 'f8')]}
+
+
+# --- CODIFICAÇÃO DAS COLUNAS ---
+def menor_inteiro(valores):
+    """Menor tipo inteiro que comporta valores (vetor de inteiros), ou None."""
+    if len(valores) == 0:
+        return np.uint8
+    minimo, maximo = valores.min(), valores.max()
+    for tipo in _TIPOS_INTEIROS:
+        info = np.iinfo(tipo)
+        if info.min <= minimo and maximo <= info.max:
+            return tipo
+    return None
+
+
+def compactar_numeros(valores):
+    """Vetor numérico no menor tipo sem perda: inteiros (inclusive floats inteiros) ou float64."""
+    valores = np.asarray(valores)
+    if valores.dtype.kind == 'b':
+        return valores.astype(np.uint8)
+    if valores.dtype.kind in 'iu':
+        tipo = menor_inteiro(valores)
+        return valores.astype(tipo) if tipo else valores.astype(np.float64)
+    valores = valores.astype(np.float64)
+    if np.isfinite(valores).all() and (valores == np.round(valores)).all():
+        tipo = menor_inteiro(valores)
+        if tipo:
+            return valores.astype(tipo)
+    return valores
+
+
+def _eh_texto(valores):
+    return all(v is None or isinstance(v, str) for v in valores)
+
+
+def _eh_vetor_tipado(valor):
+    """Vetor numérico já codificado pelo plotly (>= 6): {'dtype': 'f8', 'bdata': '...', 'shape': ...}."""
+    return isinstance(valor, dict) and 'bdata' in valor and 'dtype' in valor
+
+
+def decodificar_vetor_tipado(valor):
+    """ndarray de um vetor tipado do plotly (base64 little-endian; shape '100, 2' nos 2-D)."""
+    valores = np.frombuffer(base64.b64decode(valor['bdata']), dtype=np.dtype(valor['dtype']).newbyteorder('<'))
+    forma = valor.get('shape')
+    if forma:
+        valores = valores.reshape([int(n) for n in str(forma).split(',')])
+    return valores
+
+
+class PacoteColunas:
+    """Colunas únicas (por conteúdo) das figuras de uma página e as figuras com referências."""
+
+    def __init__(self):
+        self.colunas = []   # [(descritor, bytes)]
+        self._indices = {}  # hash do conteúdo -> índice
+
+    def _registrar(self, descritor, dados):
+        resumo = hashlib.sha1(json.dumps(descritor, sort_keys=True).encode('utf-8') + dados).hexdigest()
+        if resumo not in self._indices:
+            self._indices[resumo] = len(self.colunas)
+            self.colunas.append((descritor, dados))
+        return {'$col': self._indices[resumo]}
+
+    def coluna(self, valores, minimo=MINIMO_ELEMENTOS):
+        """Referência da coluna (vetor 1-D), ou None se for curta demais ou não for número/texto."""
+        valores = np.asarray(valores) if not isinstance(valores, np.ndarray) else valores
+        if len(valores) < minimo or valores.dtype.kind not in 'biufOU':
+            return None
+        if valores.dtype.kind in 'biuf':
+            compactos = compactar_numeros(valores)
+            return self._registrar({'dtype': _CODIGOS_DTYPE[compactos.dtype], 'n': len(compactos)},
+                                   compactos.tobytes())
+        valores = valores.astype(object)
+        if not _eh_texto(valores):
+            return None
+        codigos, distintos = pd.factorize(valores)
+        codigos = compactar_numeros(codigos)
+        return self._registrar({'dtype': _CODIGOS_DTYPE[codigos.dtype], 'n': len(codigos),
+                                'distintos': list(distintos)}, codigos.tobytes())
+
+    def substituir(self, valor):
+        """Percorre a figura (dict de to_plotly_json) trocando vetores por referências."""
+        if _eh_vetor_tipado(valor):
+            # x, y, customdata... numéricos: volta a ndarray para entrar no pacote (e ser deduplicado)
+            valor = decodificar_vetor_tipado(valor)
+        elif isinstance(valor, dict):
+            return {chave: self.substituir(v) for chave, v in valor.items()}
+        if isinstance(valor, (pd.Series, pd.Index)):
+            valor = valor.to_numpy()
+        if isinstance(valor, (list, tuple)):
+            if valor and all(isinstance(v, (str, bool, int, float, np.generic)) or v is None for v in valor):
+                valor = np.asarray(valor, dtype=object if any(isinstance(v, str) or v is None for v in valor)
+                                   else None)
+            else:
+                return [self.substituir(v) for v in valor]
+        if isinstance(valor, np.ndarray):
+            if valor.dtype.kind not in 'biufOU':
+                # Datas, durações etc.: ficam para o PlotlyJSONEncoder, como em write_html
+                return valor
+            if valor.ndim == 2 and valor.dtype.kind in 'biufO':
+                # customdata: uma coluna por campo, remontada em linhas no navegador
+                colunas = [self.coluna(valor[:, j]) for j in range(valor.shape[1])]
+                if len(valor) >= MINIMO_ELEMENTOS and all(colunas):
+                    return {'$linhas': colunas}
+            elif valor.ndim == 1:
+                referencia = self.coluna(valor)
+                if referencia:
+                    return referencia
+            return valor.tolist()
+        return valor
+
+    def serializar(self):
+        """Bytes do pacote: tamanho do manifesto (uint32), manifesto JSON e colunas alinhadas."""
+        manifesto, blocos, inicio = [], [], 0
+        for descritor, dados in self.colunas:
+            manifesto.append(dict(descritor, inicio=inicio))
+            folga = -len(dados) % ALINHAMENTO
+            blocos.append(dados + b'\0' * folga)
+            inicio += len(dados) + folga
+        cabecalho = json.dumps({'colunas': manifesto}, ensure_ascii=False, separators=(',', ':')).encode('utf-8')
+        cabecalho += b' ' * (-(len(cabecalho) + 4) % ALINHAMENTO)
+        return struct.pack('<I', len(cabecalho)) + cabecalho + b''.join(blocos)
+
+
+# --- PÁGINA ---
+_MODELO = '''<!DOCTYPE html>
+<html lang="pt-BR">
+<head>
+<meta charset="utf-8">
+<title>__TITULO__</title>
+<script charset="utf-8" src="__PLOTLYJS__"></script>
+<style>body { font-family: Arial, sans-serif; margin: 16px; } .figura { margin-bottom: 32px; }</style>
+</head>
+<body>
+<h1>__TITULO__</h1>
+__EXTRAS__
+__DIVS__
+<script id="pacote" type="application/octet-stream">__PACOTE__</script>
+<script id="figuras" type="application/json">__FIGURAS__</script>
+<script>
+(async function () {
+  // Pacote (gzip + base64) -> ArrayBuffer: [tamanho do manifesto][manifesto JSON][colunas]
+  const bytes = Uint8Array.from(atob(document.getElementById('pacote').textContent.trim()), c => c.charCodeAt(0));
+  const fluxo = new Blob([bytes]).stream().pipeThrough(new DecompressionStream('gzip'));
+  const buf = await new Response(fluxo).arrayBuffer();
+  const tamanho = new DataView(buf).getUint32(0, true);
+  const M = JSON.parse(new TextDecoder().decode(new Uint8Array(buf, 4, tamanho)));
+  const base = 4 + tamanho;
+  const TIPOS = {u1: Uint8Array, i1: Int8Array, u2: Uint16Array, i2: Int16Array,
+                 u4: Uint32Array, i4: Int32Array, f8: Float64Array};
+
+  // Cada coluna é decodificada uma vez; as figuras recebem o mesmo vetor
+  const colunas = M.colunas.map(c => {
+    const v = new TIPOS[c.dtype](buf, base + c.inicio, c.n);
+    return c.distintos ? Array.from(v, k => k < 0 ? null : c.distintos[k]) : v;
+  });
+  function resolver(o) {
+    if (Array.isArray(o)) return o.map(resolver);
+    if (o === null || typeof o !== 'object') return o;
+    if ('$col' in o) return colunas[o.$col];
+    if ('$linhas' in o) {
+      const cs = o.$linhas.map(resolver);
+      return Array.from({length: cs[0].length}, (_, i) => cs.map(c => c[i]));
+    }
+    const r = {};
+    for (const k in o) r[k] = resolver(o[k]);
+    return r;
+  }
+
+  const figuras = JSON.parse(document.getElementById('figuras').textContent);
+  for (const f of figuras) {
+    const fig = resolver(f.figura);
+    await Plotly.newPlot(f.div, fig.data, fig.layout || {}, {responsive: true});
+  }
+})();
+</script>
+</body>
+</html>
+'''
+
+
+def _json_html(objeto):
+    """JSON seguro dentro de <script> (sem '</' literal)."""
+    from plotly.utils import PlotlyJSONEncoder
+
+    return json.dumps(objeto, cls=PlotlyJSONEncoder, ensure_ascii=False,
+                      separators=(',', ':')).replace('</', '<\\/')
+
+
+def id_figura(nome):
+    """id do <div> da figura na página (âncora #id)."""
+    return 'figura-' + re.sub(r'[^0-9A-Za-z_-]+', '_', nome)
+
+
+def pagina_html(figuras, titulo, plotlyjs='plotly.min.js', extras=''):
+    """
+    HTML com as figuras Plotly ({nome: fig}) de uma página e um único pacote de dados.
+    plotlyjs: caminho do plotly.js referenciado; extras: HTML inserido antes das figuras.
+    """
+    pacote = PacoteColunas()
+    especificacoes, divs = [], []
+    for nome, fig in figuras.items():
+        div = id_figura(nome)
+        especificacoes.append({'div': div, 'nome': nome, 'figura': pacote.substituir(fig.to_plotly_json())})
+        divs.append(f'<div class="figura" id="{div}" title="{html.escape(nome)}"></div>')
+
+    dados = base64.b64encode(gzip.compress(pacote.serializar(), compresslevel=6)).decode('ascii')
+    return (_MODELO.replace('__TITULO__', html.escape(titulo))
+                   .replace('__PLOTLYJS__', html.escape(plotlyjs))
+                   .replace('__EXTRAS__', extras)
+                   .replace('__DIVS__', '\n'.join(divs))
+                   .replace('__PACOTE__', dados)
+                   .replace('__FIGURAS__', _json_html(especificacoes)))
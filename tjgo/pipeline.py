@@ -0,0 +1,302 @@
+'''Pipeline de Análises:
+- Executa várias análises sobre uma única leitura dos CSVs. Os dados tratados e os intermediários
+compartilhados (OABs válidas, advogados explodidos, contagens anuais por entidade) são nós de um
+DAG calculados uma única vez; as análises independentes rodam em paralelo (threads).
+
+Cada análise recebe apenas os intermediários que aceita em executar(...):
+    df_validos   -> nó 'validos'      (registros com OAB válida)
+    df_advogados -> nó 'advogados'    (um registro por advogado dos registros com OAB válida)
+    df_oabs      -> nó 'oabs'         (um registro por OAB válida de cada campo, inclusive os com
+                                       vários advogados, descartados em 'validos')
+    contagens    -> nó 'contagens:<chaves>' (agregacao.contagens_anuais, chaves = CHAVES do módulo)
+Com um cache (tjgo.cache.CacheDisco), o quadro tratado e as tabelas dos estágios vêm do disco
+quando entradas, código e parâmetros não mudaram.
+Cada intermediário é liberado assim que seu último consumidor termina; no modo de economia de
+memória (economizar / limite_memoria_mb) os nós rodam um por vez, com tipos compactos.'''
+
+# --- BIBLIOTECAS NECESSÁRIAS ---
+import inspect
+import io
+import sys
+import threading
+from concurrent.futures import FIRST_COMPLETED, ThreadPoolExecutor, wait
+from typing import Callable, NamedTuple, Tuple
+
+from tjgo.analises import ANALISES, carregar_analise
+from tjgo.dados import ANOS_PADRAO, PASTA_PADRAO
+from tjgo.instrumentacao import etapa
+
+
+class No(NamedTuple):
+    """Nó do DAG: funcao recebe os resultados das dependências, na ordem declarada."""
+    funcao: Callable
+    dependencias: Tuple[str, ...] = ()
+    paralelo: bool = True
+
+
+# --- SAÍDA POR THREAD ---
+class _SaidaPorThread(io.TextIOBase):
+    """Substitui sys.stdout e separa o que cada análise imprime, para não intercalar as saídas."""
+
+    def __init__(self, original):
+        self.original = original
+        self.local = threading.local()
+
+    def write(self, texto):
+        return getattr(self.local, 'buffer', self.original).write(texto)
+
+    def flush(self):
+        getattr(self.local, 'buffer', self.original).flush()
+
+    def capturar(self, nome, funcao, *args):
+        self.local.buffer = io.StringIO()
+        try:
+            with etapa(nome, *args[:1]) as e:
+                resultado = e.saida(funcao(*args))
+        finally:
+            saida = self.local.buffer.getvalue()
+            del self.local.buffer
+        return resultado, saida
+
+
+class Pipeline:
+    """
+    DAG de nós nomeados; cada nó é calculado no máximo uma vez por execução e seu resultado é
+    descartado assim que o último nó que o consome termina (exceto os alvos).
+    sequencial=True roda um nó por vez, na thread principal e na ordem topológica dos alvos
+    (perfilamento, picos de memória isolados, menos intermediários vivos ao mesmo tempo).
+    limite_bytes: falha com LimiteMemoriaExcedido se o pico de RSS passar do limite após um nó.
+    """
+
+    def __init__(self, max_workers=None, sequencial=False, limite_bytes=None):
+        self.nos = {}
+        self.max_workers = max_workers
+        self.sequencial = sequencial
+        self.limite_bytes = limite_bytes
+
+    def adicionar(self, nome, funcao, dependencias=(), paralelo=True):
+        self.nos[nome] = No(funcao, tuple(dependencias), paralelo)
+
+    def _fechamento(self, alvos):
+        """Nós necessários para os alvos, em ordem topológica."""
+        ordem, visitados, em_curso = [], set(), set()
+
+        def visitar(nome):
+            if nome in visitados:
+                return
+            if nome in em_curso:
+                raise ValueError(f"Ciclo no pipeline envolvendo '{nome}'")
+            if nome not in self.nos:
+                raise KeyError(f"Nó desconhecido no pipeline: {nome}")
+            em_curso.add(nome)
+            for dep in self.nos[nome].dependencias:
+                visitar(dep)
+            em_curso.discard(nome)
+            visitados.add(nome)
+            ordem.append(nome)
+
+        for alvo in alvos:
+            visitar(alvo)
+        return ordem
+
+    def executar(self, alvos, ao_concluir=None):
+        """
+        Calcula os alvos e suas dependências. Nós prontos rodam em paralelo; nós com
+        paralelo=False rodam na thread principal. ao_concluir(nome, resultado, saida) é chamado
+        na thread principal assim que cada nó termina, com o texto que ele imprimiu.
+        """
+        from tjgo.memoria import verificar_limite
+
+        pendentes = self._fechamento(alvos)
+        resultados, feitos = {}, set()
+        consumidores = {nome: 0 for nome in pendentes}
+        for nome in pendentes:
+            for dep in self.nos[nome].dependencias:
+                consumidores[dep] += 1
+
+        def concluir(nome, resultado, texto):
+            resultados[nome] = resultado
+            feitos.add(nome)
+            # Libera os intermediários que nenhum nó pendente ainda vai consumir
+            for dep in self.nos[nome].dependencias:
+                consumidores[dep] -= 1
+                if consumidores[dep] == 0 and dep not in alvos:
+                    del resultados[dep]
+            verificar_limite(self.limite_bytes, nome)
+            if ao_concluir:
+                ao_concluir(nome, resultado, texto)
+
+        saida = _SaidaPorThread(sys.stdout)
+        sys.stdout = saida
+        try:
+            with ThreadPoolExecutor(max_workers=self.max_workers) as executor:
+                em_execucao = {}
+                while pendentes or em_execucao:
+                    prontos = [nome for nome in pendentes
+                               if all(dep in feitos for dep in self.nos[nome].dependencias)]
+                    if self.sequencial:
+                        prontos = prontos[:1]
+                    for nome in prontos:
+                        pendentes.remove(nome)
+                        no = self.nos[nome]
+                        if no.paralelo and not self.sequencial:
+                            args = [resultados[dep] for dep in no.dependencias]
+                            em_execucao[executor.submit(saida.capturar, nome, no.funcao, *args)] = nome
+
+                    # Nós restritos à thread principal rodam enquanto o pool trabalha
+                    for nome in prontos:
+                        no = self.nos[nome]
+                        if not no.paralelo or self.sequencial:
+                            concluir(nome, *saida.capturar(
+                                nome, no.funcao, *[resultados[dep] for dep in no.dependencias]))
+                    if not em_execucao:
+                        continue
+
+                    concluidos, _ = wait(em_execucao, return_when=FIRST_COMPLETED)
+                    for futuro in concluidos:
+                        concluir(em_execucao.pop(futuro), *futuro.result())
+        finally:
+            sys.stdout = saida.original
+        return {alvo: resultados[alvo] for alvo in alvos}
+
+
+# --- NÓS DAS ANÁLISES ---
+def _carregar(pasta, economizar=False, deduplicar=None, canonicos=None):
+    """(quadro tratado, relatório de conflitos da deduplicação ou None)."""
+    from tjgo.canonicalizacao import ler_mapeamento
+    from tjgo.dados import carregar_dados, deduplicar_processos, tratar_dados, validar_oabs
+
+    df = tratar_dados(carregar_dados(pasta, economizar=economizar), economizar=economizar,
+                      canonicos=canonicos and ler_mapeamento(canonicos))
+    conflitos = None
+    if deduplicar:
+        df, conflitos = deduplicar_processos(df, deduplicar)
+    with etapa('validacao_oab', df):
+        df['oab_valida'] = validar_oabs(df['oab'])
+    return df, conflitos
+
+
+def _carregar_com_cache(pasta, cache, economizar=False, deduplicar=None, relatorio_conflitos=None,
+                        canonicos=None):
+    """
+    Quadro tratado (do cache, quando disponível). deduplicar: política de
+    dados.deduplicar_processos; o resumo vai para stderr e o relatório para relatorio_conflitos (CSV).
+    canonicos: CSV de mapeamento de nomes (tjgo.canonicalizacao) aplicado na carga.
+    """
+    from tjgo import canonicalizacao
+    from tjgo.cache import impressao_arquivos, memorizar
+    from tjgo.dados import ETAPAS_CARGA, resumir_conflitos
+
+    parametros = {'economizar': economizar, 'deduplicar': deduplicar,
+                  'canonicos': canonicos and impressao_arquivos([canonicos])}
+    fontes = ETAPAS_CARGA + (_carregar, canonicalizacao.remapear, canonicalizacao.ler_mapeamento)
+    calculado = {}
+
+    def calcular():
+        df, calculado['conflitos'] = _carregar(pasta, economizar, deduplicar, canonicos)
+        return df
+
+    df = memorizar(cache, 'dados', calcular, parametros=parametros, fontes=fontes)
+    if deduplicar:
+        # O relatório é uma entrada própria do cache (um DataFrame por estágio); a carga só é
+        # refeita se 'dados' veio do cache e 'conflitos' já foi despejado
+        def calcular_conflitos():
+            if 'conflitos' in calculado:
+                return calculado['conflitos']
+            return _carregar(pasta, economizar, deduplicar, canonicos)[1]
+
+        conflitos = memorizar(cache, 'conflitos', calcular_conflitos, parametros=parametros, fontes=fontes)
+        print(resumir_conflitos(conflitos, deduplicar), file=sys.stderr)
+        if relatorio_conflitos:
+            conflitos.to_csv(relatorio_conflitos, index=False, encoding='utf-8')
+    return df
+
+
+def _validos(df):
+    return df[df['oab_valida']].copy()
+
+
+def _no_contagens(chaves):
+    return 'contagens:' + ','.join(chaves)
+
+
+def montar_pipeline(nomes, anos=ANOS_PADRAO, pasta=PASTA_PADRAO, max_workers=None, cache=None,
+                    sequencial=False, economizar=False, limite_memoria_mb=None, deduplicar=None,
+                    relatorio_conflitos=None, canonicos=None, **opcoes):
+    """
+    Monta o DAG para as análises pedidas: 'dados' -> 'validos' -> 'advogados', 'dados' -> 'oabs',
+    um nó 'contagens:<chaves>' por conjunto de chaves e um nó 'analise:<nome>' por análise.
+    economizar (implícito com limite_memoria_mb): tipos compactos e execução sequencial.
+    deduplicar: política de deduplicação entre arquivos aplicada em 'dados', antes das agregações.
+    canonicos: CSV de mapeamento de nomes aplicado em 'dados'. Com cache, inclua o CSV nas
+    entradas do CacheDisco e deduplicar na sua carga, para que as tabelas dos estágios também
+    sejam invalidadas por eles.
+    """
+    from tjgo import agregacao
+    from tjgo.dados import explodir_advogados, explodir_oabs_validas
+
+    if cache is not None and cache.carga.get('deduplicar') != deduplicar:
+        raise ValueError(f"O cache foi criado com deduplicar={cache.carga.get('deduplicar')!r}, "
+                         f"mas a carga usa deduplicar={deduplicar!r}")
+    economizar = economizar or bool(limite_memoria_mb)
+    opcoes['cache'] = cache
+    pipeline = Pipeline(max_workers=max_workers, sequencial=sequencial or economizar,
+                        limite_bytes=limite_memoria_mb and int(limite_memoria_mb * 2**20))
+    pipeline.adicionar('dados', lambda: _carregar_com_cache(pasta, cache, economizar, deduplicar,
+                                                            relatorio_conflitos, canonicos))
+    pipeline.adicionar('validos', _validos, ['dados'])
+    pipeline.adicionar('advogados', lambda df: explodir_advogados(df, economizar=economizar), ['validos'])
+    pipeline.adicionar('oabs', lambda df: explodir_oabs_validas(df, economizar=economizar), ['dados'])
+
+    for nome in nomes:
+        modulo = carregar_analise(nome)
+        parametros = inspect.signature(modulo.executar).parameters
+        kwargs = {chave: valor for chave, valor in opcoes.items() if chave in parametros}
+
+        intermediarios = {}
+        if 'df_validos' in parametros:
+            intermediarios['df_validos'] = 'validos'
+        if 'df_advogados' in parametros:
+            intermediarios['df_advogados'] = 'advogados'
+        if 'df_oabs' in parametros:
+            intermediarios['df_oabs'] = 'oabs'
+        if 'contagens' in parametros:
+            chaves = list(modulo.CHAVES)
+            no_contagens = _no_contagens(chaves)
+            if no_contagens not in pipeline.nos:
+                pipeline.adicionar(no_contagens,
+                                   lambda df, chaves=chaves: agregacao.contagens_anuais(
+                                       df, chaves, anos, cache=cache, economizar=economizar),
+                                   ['dados'])
+            intermediarios['contagens'] = no_contagens
+
+        def rodar(df, *deps, modulo=modulo, kwargs=kwargs, nomes_deps=list(intermediarios)):
+            return modulo.executar(df, anos=anos, **kwargs, **dict(zip(nomes_deps, deps)))
+
+        pipeline.adicionar(f'analise:{nome}', rodar, ['dados'] + list(intermediarios.values()),
+                           paralelo=not getattr(modulo, 'THREAD_PRINCIPAL', False))
+    return pipeline
+
+
+def executar_analises(nomes, anos=ANOS_PADRAO, pasta=PASTA_PADRAO, max_workers=None, cache=None,
+                      sequencial=False, economizar=False, limite_memoria_mb=None, deduplicar=None,
+                      relatorio_conflitos=None, canonicos=None, **opcoes):
+    """
+    Executa as análises com uma única ingestão e devolve {nome: resultado}. O que cada
+    análise imprime é exibido em bloco, na ordem em que as análises terminam.
+    """
+    nomes = list(ANALISES) if 'todas' in nomes else list(dict.fromkeys(nomes))
+    pipeline = montar_pipeline(nomes, anos=anos, pasta=pasta, max_workers=max_workers, cache=cache,
+                               sequencial=sequencial, economizar=economizar,
+                               limite_memoria_mb=limite_memoria_mb, deduplicar=deduplicar,
+                               relatorio_conflitos=relatorio_conflitos, canonicos=canonicos, **opcoes)
+
+    def ao_concluir(no, resultado, texto):
+        if not no.startswith('analise:'):
+            return
+        if len(nomes) > 1:
+            print("\n" + "#" * 100 + f"\n# {no.split(':', 1)[1]}\n" + "#" * 100)
+        print(texto, end='')
+
+    resultados = pipeline.executar([f'analise:{nome}' for nome in nomes], ao_concluir=ao_concluir)
+    return {nome: resultados[f'analise:{nome}'] for nome in nomes}
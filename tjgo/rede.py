@@ -0,0 +1,231 @@
+'''Rede de Coatuação entre Advogados:
+- O campo oab traz vários advogados separados por ';'. Aqui cada OAB válida do campo vira uma
+coluna da matriz esparsa de incidência processo × advogado (B, binária), e a coocorrência
+advogado × advogado é o produto esparso Bᵀ·B (ou Bᵀ·diag(m)·B para um recorte m de processos:
+um ano, só os sigilosos). Nenhuma matriz densa é criada: o custo é o número de pares de
+advogados que dividem processos.
+- Arestas (pares i < j) com peso total, por ano, só sigilosos e sigilosos por ano; por advogado,
+grau (coatuantes distintos), força (soma dos pesos), centralidade de grau, PageRank (iteração
+de potência sobre a matriz esparsa) e componente conexa (scipy.sparse.csgraph).'''
+
+# --- BIBLIOTECAS NECESSÁRIAS ---
+import numpy as np
+import pandas as pd
+
+from tjgo.cnj import coluna_processo
+from tjgo.dados import ANOS_PADRAO, codificar, oabs_por_linha
+from tjgo.instrumentacao import etapa
+
+# PageRank: amortecimento, tolerância (norma L1) e máximo de iterações
+AMORTECIMENTO = 0.85
+TOLERANCIA_PAGERANK = 1e-10
+ITERACOES_PAGERANK = 200
+
+# Advogados desenhados no grafo (os de maior PageRank)
+NOS_FIGURA = 150
+
+
+# --- MATRIZ DE INCIDÊNCIA ---
+def incidencia(df, anos=ANOS_PADRAO):
+    """
+    (B processo × advogado, binária em CSR; OABs das colunas; tabela dos processos das linhas
+    com ano_distribuicao (o menor) e is_segredo_justica (algum registro sigiloso)).
+    Só entram as OABs válidas de cada campo, inclusive nos campos com várias (oabs_por_linha).
+    """
+    from scipy import sparse
+
+    processo = coluna_processo(df)
+    base = df.loc[df['ano_distribuicao'].isin(anos) & df['oab'].notna(),
+                  [processo, 'ano_distribuicao', 'is_segredo_justica', 'oab']]
+
+    # Um registro por (linha, OAB válida do campo)
+    linhas, oabs_linhas = oabs_por_linha(base['oab'])
+
+    codigos_processo, _ = codificar(base[processo])
+    linhas_processo, processos = pd.factorize(codigos_processo[linhas])
+    colunas_oab, oabs = pd.factorize(oabs_linhas, sort=True)
+    matriz = sparse.csr_matrix((np.ones(len(linhas), dtype=np.float64), (linhas_processo, colunas_oab)),
+                               shape=(len(processos), len(oabs)))
+    matriz.sum_duplicates()
+    matriz.data[:] = 1.0  # o mesmo advogado repetido no processo conta uma vez
+
+    atributos = (pd.DataFrame({'processo': linhas_processo,
+                               'ano_distribuicao': base['ano_distribuicao'].to_numpy()[linhas],
+                               'is_segredo_justica': base['is_segredo_justica'].to_numpy(dtype=bool)[linhas]})
+                   .groupby('processo').agg(ano_distribuicao=('ano_distribuicao', 'min'),
+                                            is_segredo_justica=('is_segredo_justica', 'max')))
+    return matriz, pd.Index(oabs, name='oab'), atributos.reset_index(drop=True)
+
+
+def coocorrencia(matriz, mascara=None):
+    """
+    Bᵀ·diag(mascara)·B sem a diagonal (CSR simétrica): processos em comum por par de advogados.
+    O recorte é feito selecionando as linhas de B (equivale ao produto com a diagonal 0/1).
+    """
+    if mascara is not None:
+        matriz = matriz[np.flatnonzero(mascara)]
+    produto = (matriz.T @ matriz).tocsr()
+    produto.setdiag(0)
+    produto.eliminate_zeros()
+    return produto
+
+
+# --- ARESTAS ---
+def _pares(produto):
+    """Triângulo superior (i < j) do produto: (i, j, peso), ordenado por (i, j)."""
+    from scipy import sparse
+
+    triangulo = sparse.triu(produto, k=1).tocoo()
+    i, j = triangulo.row.astype(np.int64), triangulo.col.astype(np.int64)
+    ordem = np.lexsort((j, i))
+    return i[ordem], j[ordem], triangulo.data[ordem]
+
+
+def tabela_arestas(matriz, oabs, processos, anos=ANOS_PADRAO):
+    """
+    Uma linha por par de advogados que dividem processos: oab_a < oab_b, processos (peso total),
+    processos_<ano>, sigilosos e sigilosos_<ano>. Cada variante é um produto esparso com o
+    recorte das linhas; os pares de cada variante são um subconjunto dos pares do total.
+    """
+    total = coocorrencia(matriz)
+    i, j, peso = _pares(total)
+    n = len(oabs)
+    chaves = i * n + j  # ordenadas (_pares)
+    arestas = pd.DataFrame({'oab_a': oabs[i], 'oab_b': oabs[j], 'processos': peso.astype(np.int64)})
+
+    anos_processo = processos['ano_distribuicao'].to_numpy()
+    sigilo = processos['is_segredo_justica'].to_numpy(dtype=bool)
+    variantes = {f'processos_{ano}': anos_processo == ano for ano in anos}
+    variantes['sigilosos'] = sigilo
+    variantes.update({f'sigilosos_{ano}': sigilo & (anos_processo == ano) for ano in anos})
+    for coluna, mascara in variantes.items():
+        vi, vj, vpeso = _pares(coocorrencia(matriz, mascara))
+        valores = np.zeros(len(arestas), dtype=np.int64)
+        valores[np.searchsorted(chaves, vi * n + vj)] = vpeso.astype(np.int64)
+        arestas[coluna] = valores
+    return arestas, total
+
+
+# --- MÉTRICAS DOS NÓS ---
+def pagerank(adjacencia, amortecimento=AMORTECIMENTO, tolerancia=TOLERANCIA_PAGERANK,
+             iteracoes=ITERACOES_PAGERANK):
+    """PageRank ponderado por iteração de potência; nós sem arestas distribuem o peso igualmente."""
+    n = adjacencia.shape[0]
+    if n == 0:
+        return np.zeros(0)
+    forca = np.asarray(adjacencia.sum(axis=1)).ravel()
+    inverso = np.divide(1.0, forca, out=np.zeros(n), where=forca > 0)
+    transposta = adjacencia.T.tocsr()
+    rank = np.full(n, 1.0 / n)
+    for _ in range(iteracoes):
+        novo = amortecimento * (transposta @ (rank * inverso))
+        novo += (1.0 - novo.sum()) / n  # teleporte e massa dos nós isolados
+        if np.abs(novo - rank).sum() < tolerancia:
+            return novo
+        rank = novo
+    return rank
+
+
+def metricas_advogados(matriz, oabs, adjacencia):
+    """
+    Por advogado: processos, processos em coatuação, grau (coatuantes distintos), força (soma
+    dos pesos), centralidade de grau (grau / (n - 1)), PageRank, componente e seu tamanho.
+    """
+    from scipy.sparse.csgraph import connected_components
+
+    n = len(oabs)
+    grau = np.diff(adjacencia.indptr)
+    coatuacao = (matriz.sum(axis=1).A1 > 1).astype(np.float64)
+    n_componentes, componente = connected_components(adjacencia, directed=False)
+    tamanhos = np.bincount(componente, minlength=n_componentes)
+
+    # Componentes numeradas da maior para a menor
+    ordem = np.argsort(-tamanhos, kind='stable')
+    renumeracao = np.empty_like(ordem)
+    renumeracao[ordem] = np.arange(n_componentes)
+    return pd.DataFrame({
+        'oab': oabs,
+        'processos': matriz.sum(axis=0).A1.astype(np.int64),
+        'processos_coatuacao': (coatuacao @ matriz).astype(np.int64),
+        'grau': grau.astype(np.int64),
+        'forca': adjacencia.sum(axis=1).A1.astype(np.int64),
+        'centralidade_grau': grau / max(n - 1, 1),
+        'pagerank': pagerank(adjacencia),
+        'componente': renumeracao[componente],
+        'tamanho_componente': tamanhos[componente],
+    })
+
+
+def resumir_componentes(advogados):
+    """Uma linha por componente conexa: advogados, grau médio e o advogado de maior PageRank."""
+    idx_lider = advogados.groupby('componente')['pagerank'].idxmax()
+    resumo = advogados.groupby('componente').agg(advogados=('oab', 'size'), grau_medio=('grau', 'mean'))
+    resumo['advogado_central'] = advogados.loc[idx_lider.to_numpy(), 'oab'].to_numpy()
+    return resumo.reset_index().sort_values(['advogados', 'componente'], ascending=[False, True])
+
+
+def construir_rede(df, anos=ANOS_PADRAO):
+    """(arestas, advogados, componentes) da rede de coatuação de df nos anos informados."""
+    with etapa('rede.incidencia', df) as e:
+        matriz, oabs, processos = e.saida(incidencia(df, anos))
+    with etapa('rede.coocorrencia', processos) as e:
+        arestas, adjacencia = tabela_arestas(matriz, oabs, processos, anos)
+        e.saida(arestas)
+    with etapa('rede.metricas', oabs) as e:
+        advogados = e.saida(metricas_advogados(matriz, oabs, adjacencia))
+    return arestas, advogados, resumir_componentes(advogados)
+
+
+# --- FIGURAS ---
+def layout_espectral(pesos):
+    """Posições 2-D pelos autovetores 2 e 3 do laplaciano normalizado (subgrafo pequeno, denso)."""
+    forca = pesos.sum(axis=1)
+    inverso = np.divide(1.0, np.sqrt(forca), out=np.zeros_like(forca), where=forca > 0)
+    laplaciano = np.eye(len(pesos)) - inverso[:, None] * pesos * inverso[None, :]
+    _, vetores = np.linalg.eigh(laplaciano)
+    return vetores[:, 1:3] if len(pesos) > 2 else np.zeros((len(pesos), 2))
+
+
+def figura_rede(arestas, advogados, n=NOS_FIGURA, titulo=''):
+    """Subgrafo dos n advogados de maior PageRank: nós por força, cor por componente."""
+    import plotly.graph_objects as go
+
+    nos = advogados.nlargest(n, 'pagerank').reset_index(drop=True)
+    posicao = pd.Series(np.arange(len(nos)), index=nos['oab'])
+    dentro = arestas[arestas['oab_a'].isin(nos['oab']) & arestas['oab_b'].isin(nos['oab'])]
+    a, b = posicao[dentro['oab_a']].to_numpy(), posicao[dentro['oab_b']].to_numpy()
+    pesos = np.zeros((len(nos), len(nos)))
+    pesos[a, b] = pesos[b, a] = dentro['processos'].to_numpy()
+    xy = layout_espectral(pesos)
+
+    # Arestas numa única trace, separadas por None
+    x_arestas = np.column_stack([xy[a, 0], xy[b, 0], np.full(len(a), np.nan)]).ravel()
+    y_arestas = np.column_stack([xy[a, 1], xy[b, 1], np.full(len(a), np.nan)]).ravel()
+    fig = go.Figure([
+        go.Scatter(x=x_arestas, y=y_arestas, mode='lines', line=dict(width=0.5, color='#999'),
+                   hoverinfo='skip'),
+        go.Scatter(x=xy[:, 0], y=xy[:, 1], mode='markers', hovertext=nos['oab'],
+                   customdata=nos[['grau', 'forca', 'pagerank', 'componente']].to_numpy(),
+                   hovertemplate=('<b>%{hovertext}</b><br>Coatuantes: %{customdata[0]}<br>'
+                                  'Processos em comum: %{customdata[1]}<br>PageRank: %{customdata[2]:.2e}<br>'
+                                  'Componente: %{customdata[3]}<extra></extra>'),
+                   marker=dict(size=6 + 14 * np.sqrt(nos['forca'] / max(nos['forca'].max(), 1)),
+                               color=nos['componente'], colorscale='Viridis', line=dict(width=0.5, color='white'))),
+    ])
+    fig.update_layout(title=titulo, title_x=0.5, height=900, showlegend=False,
+                      xaxis=dict(visible=False), yaxis=dict(visible=False), plot_bgcolor='white')
+    return fig
+
+
+def figura_graus(advogados, titulo=''):
+    """Distribuição de graus (log-log): advogados por número de coatuantes distintos."""
+    import plotly.graph_objects as go
+
+    contagem = advogados.loc[advogados['grau'] > 0, 'grau'].value_counts().sort_index()
+    fig = go.Figure(go.Scatter(x=contagem.index, y=contagem.to_numpy(), mode='markers',
+                               marker=dict(color='#203864'),
+                               hovertemplate='Grau %{x}: %{y} advogados<extra></extra>'))
+    fig.update_layout(title=titulo, title_x=0.5, height=600,
+                      xaxis=dict(type='log', title='Coatuantes distintos (grau)'),
+                      yaxis=dict(type='log', title='Advogados'))
+    return fig
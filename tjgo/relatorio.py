@@ -0,0 +1,130 @@
+'''Relatório Estático (sem navegador):
+- Grava todas as figuras de todas as análises como HTML em uma pasta, em vez de fig.show().
+As figuras são independentes: cada uma é serializada (write_html) em um processo do pool.
+- O plotly.js é gravado uma única vez na pasta (plotly.min.js) e referenciado por cada HTML,
+em vez de embutido (~3,5 MB) em cada arquivo. index.html lista as figuras por análise.
+- Formato 'pacote' (padrão): uma página por análise, com as figuras Plotly da análise lendo um
+único pacote de dados colunar (tjgo.pacote_dados), em vez de cada figura repetir os mesmos dados.
+Formato 'figuras': um HTML por figura (Figure.write_html). Páginas que não são figuras Plotly
+(TabelaHTML, DetalhamentoHTML) têm o próprio pacote e são gravadas à parte nos dois formatos.'''
+
+# --- BIBLIOTECAS NECESSÁRIAS ---
+import html
+import os
+import re
+import time
+from concurrent.futures import ProcessPoolExecutor
+
+from tjgo.instrumentacao import etapa
+
+PLOTLY_JS = 'plotly.min.js'
+INDICE = 'index.html'
+FORMATOS = ('pacote', 'figuras')
+
+
+def _nome_arquivo(analise, figura):
+    return re.sub(r'[^0-9A-Za-z_.-]+', '_', f'{analise}__{figura}') + '.html'
+
+
+def gravar_plotlyjs(pasta):
+    """Copia o plotly.js do pacote plotly para a pasta (uma vez por relatório)."""
+    from plotly.offline import get_plotlyjs
+
+    caminho = os.path.join(pasta, PLOTLY_JS)
+    with open(caminho, 'w', encoding='utf-8') as f:
+        f.write(get_plotlyjs())
+    return caminho
+
+
+def _gravar_figura(fig, caminho):
+    """Executada nos processos do pool: serializa a figura referenciando o plotly.js compartilhado."""
+    inicio = time.perf_counter()
+    fig.write_html(caminho, include_plotlyjs=PLOTLY_JS, full_html=True)
+    return caminho, os.path.getsize(caminho), time.perf_counter() - inicio
+
+
+def _gravar_pagina(analise, figuras, caminho, extras):
+    """Executada nos processos do pool: página da análise com um único pacote de dados."""
+    from tjgo.pacote_dados import pagina_html
+
+    inicio = time.perf_counter()
+    with open(caminho, 'w', encoding='utf-8') as f:
+        f.write(pagina_html(figuras, analise, plotlyjs=PLOTLY_JS, extras=extras))
+    return caminho, os.path.getsize(caminho), time.perf_counter() - inicio
+
+
+def _tarefas(resultados, pasta, formato):
+    """[(funcao, argumentos, [(analise, figura, arquivo)])]: um arquivo por figura ou por página."""
+    from plotly.basedatatypes import BaseFigure
+
+    from tjgo.pacote_dados import id_figura
+
+    tarefas = []
+    for analise, resultado in resultados.items():
+        figuras = {nome: fig for nome, fig in resultado['figuras'].items() if fig is not None}
+        agrupadas = {} if formato == 'figuras' else {nome: fig for nome, fig in figuras.items()
+                                                      if isinstance(fig, BaseFigure)}
+        avulsas = [nome for nome in figuras if nome not in agrupadas]
+        for nome in avulsas:
+            arquivo = _nome_arquivo(analise, nome)
+            tarefas.append((_gravar_figura, (figuras[nome], os.path.join(pasta, arquivo)), [(analise, nome, arquivo)]))
+        if agrupadas:
+            arquivo = _nome_arquivo(analise, 'pagina')
+            extras = ''.join(f'<p><a href="{html.escape(_nome_arquivo(analise, nome))}">{html.escape(nome)}</a></p>'
+                             for nome in avulsas)
+            tarefas.append((_gravar_pagina, (analise, agrupadas, os.path.join(pasta, arquivo), extras),
+                            [(analise, nome, f'{arquivo}#{id_figura(nome)}') for nome in agrupadas]))
+    return tarefas
+
+
+def _executar(funcao, argumentos):
+    return funcao(*argumentos)
+
+
+def _gravar_indice(pasta, arquivos):
+    """index.html com um link por figura, agrupados por análise."""
+    secoes = []
+    for analise, figuras in arquivos.items():
+        itens = ''.join(f'<li><a href="{html.escape(arquivo)}">{html.escape(figura)}</a></li>'
+                        for figura, arquivo in figuras.items())
+        secoes.append(f'<h2>{html.escape(analise)}</h2><ul>{itens}</ul>')
+    caminho = os.path.join(pasta, INDICE)
+    with open(caminho, 'w', encoding='utf-8') as f:
+        f.write('<!DOCTYPE html><html lang="pt-BR"><head><meta charset="utf-8">'
+                '<title>Relatório TJGO</title></head><body style="font-family: Arial, sans-serif">'
+                f'<h1>Relatório TJGO</h1>{"".join(secoes)}</body></html>')
+    return caminho
+
+
+def gerar_relatorio(resultados, pasta, max_workers=None, formato='pacote'):
+    """
+    Grava as figuras de {análise: {'figuras': {...}}} em pasta (uma página por análise no
+    formato 'pacote', um HTML por figura em 'figuras'), com o plotly.js compartilhado e um
+    index.html. max_workers: processos do pool (1 = no processo atual).
+    Retorna {análise: {figura: caminho}}.
+    """
+    if formato not in FORMATOS:
+        raise ValueError(f"Formato de relatório desconhecido: {formato!r} (use {', '.join(FORMATOS)})")
+    os.makedirs(pasta, exist_ok=True)
+    tarefas = _tarefas(resultados, pasta, formato)
+
+    with etapa('relatorio', tarefas) as e:
+        gravar_plotlyjs(pasta)
+        if max_workers == 1 or len(tarefas) <= 1:
+            gravados = [funcao(*argumentos) for funcao, argumentos, _ in tarefas]
+        else:
+            with ProcessPoolExecutor(max_workers=max_workers) as executor:
+                gravados = list(executor.map(_executar, *zip(*[(f, a) for f, a, _ in tarefas])))
+
+        arquivos = {}
+        for _, _, destinos in tarefas:
+            for analise, nome, arquivo in destinos:
+                arquivos.setdefault(analise, {})[nome] = arquivo
+        _gravar_indice(pasta, arquivos)
+        e.saida(gravados)
+
+    total = sum(tamanho for _, tamanho, _ in gravados)
+    print(f"Relatório: {len(gravados)} arquivos ({total / 2**20:.1f} MB + {PLOTLY_JS}) em "
+          f"{os.path.join(pasta, INDICE)}")
+    return {analise: {nome: os.path.join(pasta, arquivo) for nome, arquivo in figuras.items()}
+            for analise, figuras in arquivos.items()}
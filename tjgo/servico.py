@@ -0,0 +1,239 @@
+'''Serviço de Consultas Agregadas (HTTP, apenas localhost):
+- Na inicialização, monta um cubo com as contagens de processos únicos sigilosos e não sigilosos
+por (ano, comarca, serventia, área de ação). As consultas filtram e agregam esse cubo em memória
+(arrays NumPy de códigos), sem reler os CSVs; consultas repetidas saem de um cache LRU.
+
+Rotas:
+    GET /dimensoes                       valores disponíveis de cada dimensão
+    GET /consulta?comarca=X&nome_area_acao=Y&anos=2019-2024&agrupar=ano[,comarca...]&formato=json|arrow
+Filtros repetidos são combinados com OU (comarca=A&comarca=B); 'area' é sinônimo de 'nome_area_acao'.
+Exemplo: curl 'http://127.0.0.1:8765/consulta?comarca=GOIÂNIA&anos=2022-2024&agrupar=ano' '''
+
+# --- BIBLIOTECAS NECESSÁRIAS ---
+import asyncio
+import functools
+import ipaddress
+import json
+from urllib.parse import parse_qs, urlsplit
+
+import numpy as np
+import pandas as pd
+
+from tjgo.cnj import coluna_processo
+from tjgo.dados import parse_anos
+
+DIMENSOES = ['ano', 'comarca', 'serventia', 'nome_area_acao']
+APELIDOS = {'area': 'nome_area_acao', 'anos': 'ano'}
+
+PORTA_PADRAO = 8765
+TAMANHO_CACHE_PADRAO = 1024
+
+
+# --- CUBO ---
+def construir_cubo(df):
+    """
+    Contagens de processos únicos por célula (ano, comarca, serventia, área, sigilo).
+    Cada processo conta uma vez por célula; as agregações somam as células.
+    """
+    base = (df.dropna(subset=['ano_distribuicao'])
+              .drop_duplicates(subset=[coluna_processo(df), 'ano_distribuicao'] + DIMENSOES[1:] + ['is_segredo_justica']))
+    cubo = (base.groupby(['ano_distribuicao'] + DIMENSOES[1:] + ['is_segredo_justica'], observed=True)
+                .size()
+                .unstack('is_segredo_justica', fill_value=0)
+                .reindex(columns=[True, False], fill_value=0))
+    cubo.columns = ['sigilosos', 'nao_sigilosos']
+    cubo = cubo.reset_index().rename(columns={'ano_distribuicao': 'ano'})
+    cubo['ano'] = cubo['ano'].astype(int)
+    return cubo
+
+
+class Cubo:
+    """Cubo em memória: um array de códigos por dimensão e os arrays de contagens."""
+
+    def __init__(self, tabela_cubo):
+        self.codigos, self.valores = {}, {}
+        for dim in DIMENSOES:
+            categorias = pd.Categorical(tabela_cubo[dim])
+            self.codigos[dim] = categorias.codes.astype(np.int32)
+            self.valores[dim] = categorias.categories
+        self.sigilosos = tabela_cubo['sigilosos'].to_numpy(np.int64)
+        self.nao_sigilosos = tabela_cubo['nao_sigilosos'].to_numpy(np.int64)
+
+    def dimensoes(self):
+        return {dim: [v.item() if hasattr(v, 'item') else v for v in valores]
+                for dim, valores in self.valores.items()}
+
+    def consultar(self, filtros=(), agrupar=()):
+        """
+        filtros: pares (dimensão, valores aceitos); agrupar: dimensões do resultado.
+        Retorna um DataFrame com as dimensões agrupadas, contagens e proporção de sigilosos.
+        """
+        mascara = np.ones(self.sigilosos.size, dtype=bool)
+        for dim, aceitos in filtros:
+            codigos = self.valores[dim].get_indexer(list(aceitos))
+            mascara &= np.isin(self.codigos[dim], codigos[codigos >= 0])
+
+        sig, nao = self.sigilosos[mascara], self.nao_sigilosos[mascara]
+        if agrupar:
+            dims = list(agrupar)
+            chave = np.ravel_multi_index([self.codigos[dim][mascara] for dim in dims],
+                                         [len(self.valores[dim]) for dim in dims])
+            grupos, inverso = np.unique(chave, return_inverse=True)
+            sig = np.bincount(inverso, weights=sig, minlength=grupos.size).astype(np.int64)
+            nao = np.bincount(inverso, weights=nao, minlength=grupos.size).astype(np.int64)
+            indices = np.unravel_index(grupos, [len(self.valores[dim]) for dim in dims])
+            resultado = pd.DataFrame({dim: self.valores[dim].take(idx) for dim, idx in zip(dims, indices)})
+        else:
+            sig, nao = np.array([sig.sum()]), np.array([nao.sum()])
+            resultado = pd.DataFrame(index=range(1))
+
+        resultado['sigilosos'] = sig
+        resultado['nao_sigilosos'] = nao
+        resultado['total'] = sig + nao
+        total = resultado['total'].replace(0, np.nan)
+        resultado['proporcao_sigilosos'] = (resultado['sigilosos'] / total * 100).fillna(0.0).round(4)
+        return resultado
+
+
+# --- CONSULTAS ---
+class ErroConsulta(ValueError):
+    """Parâmetro de consulta inválido (responde 400)."""
+
+
+def interpretar_consulta(query):
+    """Converte a query string em (filtros, agrupar, formato) normalizados e hasheáveis."""
+    parametros = parse_qs(query, keep_blank_values=False)
+    formato = parametros.pop('formato', ['json'])[-1]
+    if formato not in ('json', 'arrow'):
+        raise ErroConsulta(f"Formato inválido: {formato} (use json ou arrow)")
+
+    agrupar = []
+    for texto in parametros.pop('agrupar', []):
+        for dim in texto.split(','):
+            dim = APELIDOS.get(dim.strip(), dim.strip())
+            if dim not in DIMENSOES:
+                raise ErroConsulta(f"Dimensão inválida em agrupar: {dim}")
+            if dim not in agrupar:
+                agrupar.append(dim)
+
+    filtros = {}
+    for nome, valores in parametros.items():
+        dim = APELIDOS.get(nome, nome)
+        if dim not in DIMENSOES:
+            raise ErroConsulta(f"Filtro desconhecido: {nome}")
+        if dim == 'ano':
+            try:
+                valores = [ano for texto in valores for ano in parse_anos(texto)]
+            except ValueError as e:
+                raise ErroConsulta(str(e)) from None
+        filtros.setdefault(dim, set()).update(v.strip() if isinstance(v, str) else v for v in valores)
+
+    filtros = tuple(sorted((dim, tuple(sorted(valores))) for dim, valores in filtros.items()))
+    return filtros, tuple(agrupar), formato
+
+
+def serializar(resultado, formato):
+    """JSON (registros) ou Arrow IPC stream."""
+    if formato == 'arrow':
+        import pyarrow as pa
+
+        tabela = pa.Table.from_pandas(resultado, preserve_index=False)
+        sink = pa.BufferOutputStream()
+        with pa.ipc.new_stream(sink, tabela.schema) as escritor:
+            escritor.write_table(tabela)
+        return sink.getvalue().to_pybytes(), 'application/vnd.apache.arrow.stream'
+    corpo = resultado.to_json(orient='records', force_ascii=False)
+    return corpo.encode('utf-8'), 'application/json; charset=utf-8'
+
+
+def criar_respondedor(cubo, tamanho_cache=TAMANHO_CACHE_PADRAO):
+    """Função (filtros, agrupar, formato) -> (corpo, content-type), com cache LRU."""
+    @functools.lru_cache(maxsize=tamanho_cache)
+    def responder(filtros, agrupar, formato):
+        return serializar(cubo.consultar(filtros, agrupar), formato)
+    return responder
+
+
+# --- HTTP ---
+STATUS = {200: 'OK', 400: 'Bad Request', 404: 'Not Found', 405: 'Method Not Allowed',
+          500: 'Internal Server Error'}
+
+
+def _resposta(status, corpo, tipo='application/json; charset=utf-8'):
+    cabecalho = (f"HTTP/1.1 {status} {STATUS[status]}\r\n"
+                 f"Content-Type: {tipo}\r\n"
+                 f"Content-Length: {len(corpo)}\r\n"
+                 "Connection: close\r\n\r\n")
+    return cabecalho.encode('ascii') + corpo
+
+
+def _erro(status, mensagem):
+    return _resposta(status, json.dumps({'erro': mensagem}, ensure_ascii=False).encode('utf-8'))
+
+
+def tratar_requisicao(cubo, responder, linha):
+    """Resposta HTTP completa (bytes) para a linha de requisição 'GET /rota?query HTTP/1.1'."""
+    partes = linha.split()
+    if len(partes) < 2:
+        return _erro(400, 'Requisição malformada')
+    if partes[0] != 'GET':
+        return _erro(405, 'Apenas GET é suportado')
+
+    url = urlsplit(partes[1])
+    if url.path == '/dimensoes':
+        return _resposta(200, json.dumps(cubo.dimensoes(), ensure_ascii=False).encode('utf-8'))
+    if url.path == '/consulta':
+        try:
+            corpo, tipo = responder(*interpretar_consulta(url.query))
+        except ErroConsulta as e:
+            return _erro(400, str(e))
+        except ImportError:
+            return _erro(400, 'Formato arrow requer pyarrow instalado')
+        return _resposta(200, corpo, tipo)
+    return _erro(404, f"Rota desconhecida: {url.path}")
+
+
+async def _atender(cubo, responder, reader, writer):
+    try:
+        linha = (await reader.readline()).decode('latin-1')
+        # Descarta os cabeçalhos
+        while (await reader.readline()) not in (b'\r\n', b'\n', b''):
+            pass
+        try:
+            resposta = tratar_requisicao(cubo, responder, linha)
+        except Exception as e:
+            resposta = _erro(500, str(e))
+        writer.write(resposta)
+        await writer.drain()
+    finally:
+        writer.close()
+
+
+async def _servir(cubo, host, porta, tamanho_cache):
+    responder = criar_respondedor(cubo, tamanho_cache)
+    servidor = await asyncio.start_server(
+        functools.partial(_atender, cubo, responder), host=host, port=porta)
+    print(f"Servindo consultas em http://{host}:{porta} (Ctrl+C para encerrar)")
+    async with servidor:
+        await servidor.serve_forever()
+
+
+def validar_host_local(host):
+    """O serviço só escuta em endereços de loopback."""
+    if host == 'localhost':
+        return host
+    try:
+        if ipaddress.ip_address(host).is_loopback:
+            return host
+    except ValueError:
+        pass
+    raise ValueError(f"O serviço aceita apenas endereços locais (127.0.0.1, ::1, localhost), não '{host}'")
+
+
+def servir(cubo, host='127.0.0.1', porta=PORTA_PADRAO, tamanho_cache=TAMANHO_CACHE_PADRAO):
+    """Inicia o servidor asyncio e bloqueia até Ctrl+C."""
+    host = validar_host_local(host)
+    try:
+        asyncio.run(_servir(cubo, host, porta, tamanho_cache))
+    except KeyboardInterrupt:
+        pass
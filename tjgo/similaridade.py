@@ -0,0 +1,167 @@
+'''Similaridade de Carteiras de Advogados:
+- Cada advogado vira um vetor esparso com três blocos: áreas de ação e comarcas (processos
+distintos por termo, ponderados por TF-IDF: termos que quase todo advogado tem pesam pouco) e a
+participação de sigilosos (vetor [p, 1 - p] normalizado). Cada bloco é normalizado (L2) e
+ponderado por PESOS_BLOCOS; a linha inteira é normalizada de novo, então o produto escalar entre
+duas linhas é o cosseno entre as carteiras.
+- Consulta de um advogado: um produto matriz esparsa × vetor denso (X·xᵀ) e np.argpartition
+para os k maiores, em milissegundos mesmo com centenas de milhares de advogados. Consultas em
+lote são feitas em blocos (X·X[bloco]ᵀ denso com no máximo ELEMENTOS_BLOCO elementos).'''
+
+# --- BIBLIOTECAS NECESSÁRIAS ---
+import numpy as np
+import pandas as pd
+
+from tjgo.cnj import coluna_processo
+from tjgo.dados import ANOS_PADRAO
+from tjgo.instrumentacao import etapa
+
+# Blocos do vetor de cada advogado e seus pesos na similaridade
+BLOCOS = {'area': 'nome_area_acao', 'comarca': 'comarca'}
+PESOS_BLOCOS = {'area': 1.0, 'comarca': 0.5, 'sigilo': 0.5}
+
+K_PADRAO = 10
+
+# Elementos (consultas × advogados) de cada bloco denso das consultas em lote (~256 MB em float32)
+ELEMENTOS_BLOCO = 64_000_000
+
+COLUNAS_PERFIS = ['oab', 'bloco', 'termo', 'processos']
+
+
+# --- PERFIS ---
+def perfis_advogados(df_advogados, anos=ANOS_PADRAO):
+    """
+    Tabela longa COLUNAS_PERFIS: processos distintos de cada advogado por termo de cada bloco
+    (área, comarca), mais os termos 'total' e 'sigilosos' do bloco 'sigilo'.
+    """
+    processo = coluna_processo(df_advogados)
+    base = df_advogados.loc[df_advogados['ano_distribuicao'].isin(anos),
+                            ['oab', processo, 'is_segredo_justica'] + list(BLOCOS.values())]
+    partes = []
+    for bloco, coluna in BLOCOS.items():
+        contagem = (base.drop_duplicates(['oab', processo, coluna])
+                        .groupby(['oab', coluna], observed=True).size())
+        partes.append(pd.DataFrame({'oab': contagem.index.get_level_values('oab').astype(str),
+                                    'bloco': bloco,
+                                    'termo': contagem.index.get_level_values(coluna).astype(str),
+                                    'processos': contagem.to_numpy()}))
+
+    por_processo = base.groupby(['oab', processo], observed=True)['is_segredo_justica'].max()
+    sigilo = por_processo.groupby(level='oab', observed=True).agg(['size', 'sum'])
+    for termo, serie in [('total', sigilo['size']), ('sigilosos', sigilo['sum'])]:
+        partes.append(pd.DataFrame({'oab': serie.index.astype(str), 'bloco': 'sigilo', 'termo': termo,
+                                    'processos': serie.to_numpy()}))
+    perfis = pd.concat(partes, ignore_index=True)
+    perfis['processos'] = perfis['processos'].astype(np.int64)
+    return perfis[COLUNAS_PERFIS]
+
+
+def _normalizar_linhas(matriz):
+    """Cada linha com norma L2 = 1 (linhas nulas ficam nulas)."""
+    from scipy import sparse
+
+    normas = np.sqrt(np.asarray(matriz.multiply(matriz).sum(axis=1)).ravel())
+    return sparse.diags(np.divide(1.0, normas, out=np.zeros_like(normas), where=normas > 0)) @ matriz
+
+
+def tfidf(linhas, colunas, contagens, forma):
+    """TF-IDF esparso: tf = contagem / total da linha, idf = log((1 + n) / (1 + df)) + 1."""
+    from scipy import sparse
+
+    matriz = sparse.csr_matrix((contagens.astype(np.float64), (linhas, colunas)), shape=forma)
+    totais = np.asarray(matriz.sum(axis=1)).ravel()
+    frequencia = np.bincount(colunas, minlength=forma[1])
+    idf = np.log((1.0 + forma[0]) / (1.0 + frequencia)) + 1.0
+    tf = sparse.diags(np.divide(1.0, totais, out=np.zeros_like(totais), where=totais > 0)) @ matriz
+    return tf @ sparse.diags(idf)
+
+
+# --- ÍNDICE ---
+class IndiceSimilaridade:
+    """Matriz advogado × termo normalizada (CSR float32) e consultas de vizinhos mais próximos."""
+
+    def __init__(self, perfis, pesos=PESOS_BLOCOS):
+        from scipy import sparse
+
+        self.oabs = pd.Index(np.sort(perfis['oab'].unique()), name='oab')
+        n = len(self.oabs)
+        blocos, self.termos = [], []
+        for bloco in BLOCOS:
+            parte = perfis[perfis['bloco'] == bloco]
+            linhas = self.oabs.get_indexer(parte['oab'])
+            colunas, termos = pd.factorize(parte['termo'], sort=True)
+            matriz = tfidf(linhas, colunas, parte['processos'].to_numpy(), (n, len(termos)))
+            blocos.append(pesos[bloco] * _normalizar_linhas(matriz))
+            self.termos += [f'{bloco}:{termo}' for termo in termos]
+
+        # Bloco sigilo: [p, 1 - p] com norma 1 (cosseno entre participações de sigilosos)
+        sigilo = (perfis[perfis['bloco'] == 'sigilo']
+                      .pivot_table(index='oab', columns='termo', values='processos', aggfunc='sum', fill_value=0)
+                      .reindex(index=self.oabs, columns=['total', 'sigilosos'], fill_value=0))
+        self.participacao_sigilo = np.divide(sigilo['sigilosos'].to_numpy(float), sigilo['total'].to_numpy(float),
+                                             out=np.zeros(n), where=sigilo['total'].to_numpy() > 0)
+        self.processos = sigilo['total'].to_numpy()
+        par = np.column_stack([self.participacao_sigilo, 1.0 - self.participacao_sigilo])
+        par /= np.linalg.norm(par, axis=1, keepdims=True)
+        blocos.append(sparse.csr_matrix(pesos['sigilo'] * par))
+        self.termos += ['sigilo:sigilosos', 'sigilo:nao_sigilosos']
+
+        self.matriz = _normalizar_linhas(sparse.hstack(blocos).tocsr()).astype(np.float32).tocsr()
+
+    def __len__(self):
+        return len(self.oabs)
+
+    def _posicoes(self, oabs):
+        posicoes = self.oabs.get_indexer(pd.Index([str(o).strip() for o in oabs]))
+        if (posicoes < 0).any():
+            faltantes = [o for o, p in zip(oabs, posicoes) if p < 0]
+            raise KeyError(f"OAB sem processos no período: {', '.join(map(str, faltantes))}")
+        return posicoes
+
+    def _resultado(self, origem, vizinhos, escores):
+        return pd.DataFrame({
+            'oab': origem,
+            'posto': np.tile(np.arange(1, vizinhos.shape[1] + 1), len(vizinhos)),
+            'oab_similar': self.oabs[vizinhos.ravel()],
+            'similaridade': escores.ravel().astype(np.float64).round(4),
+            'processos': self.processos[vizinhos.ravel()],
+            'participacao_sigilo': (100 * self.participacao_sigilo[vizinhos.ravel()]).round(2),
+        })
+
+    @staticmethod
+    def _maiores(escores, k):
+        """(posições, escores) dos k maiores de cada linha, em ordem: argpartition + ordenação dos k."""
+        k = min(k, escores.shape[1])
+        primeiros = np.argpartition(-escores, k - 1, axis=1)[:, :k]
+        valores = np.take_along_axis(escores, primeiros, axis=1)
+        ordem = np.argsort(-valores, axis=1, kind='stable')
+        return np.take_along_axis(primeiros, ordem, axis=1), np.take_along_axis(valores, ordem, axis=1)
+
+    def similares(self, oab, k=K_PADRAO):
+        """Os k advogados de carteira mais parecida com a de oab (cosseno), do mais ao menos similar."""
+        return self.similares_lote([oab], k)
+
+    def similares_lote(self, oabs, k=K_PADRAO, elementos_bloco=ELEMENTOS_BLOCO):
+        """Vizinhos de várias OABs, em blocos de consultas (X·X[bloco]ᵀ denso por bloco)."""
+        posicoes = self._posicoes(list(oabs))
+        k = min(k, len(self) - 1)
+        tamanho_bloco = max(1, elementos_bloco // max(len(self), 1))
+        resultados = []
+        for inicio in range(0, len(posicoes), tamanho_bloco):
+            bloco = posicoes[inicio:inicio + tamanho_bloco]
+            # Consultas densas (poucos termos) e um produto matriz esparsa × matriz densa
+            escores = np.ascontiguousarray((self.matriz @ self.matriz[bloco].toarray().T).T)
+            escores[np.arange(len(bloco)), bloco] = -np.inf  # o próprio advogado
+            vizinhos, valores = self._maiores(escores, k)
+            resultados.append(self._resultado(np.repeat(self.oabs[bloco], k), vizinhos, valores))
+        return pd.concat(resultados, ignore_index=True)
+
+
+def construir_indice(df_advogados, anos=ANOS_PADRAO, perfis=None):
+    """IndiceSimilaridade dos advogados de df_advogados (perfis: tabela já calculada, ex.: do cache)."""
+    with etapa('similaridade.indice', df_advogados) as e:
+        if perfis is None:
+            perfis = perfis_advogados(df_advogados, anos)
+        indice = IndiceSimilaridade(perfis)
+        e.saida(indice.oabs)
+        return indice
@@ -0,0 +1,253 @@
+'''Gerador de Dados Sintéticos:
+- Escreve processo(s)_AAAA.csv com o mesmo esquema das extrações do TJGO, para exercitar as
+análises sem os dados reais: número CNJ com dígito verificador válido, datas de distribuição e
+baixa, is_segredo_justica nas grafias mistas (True/False, 1/0, Sim/Não...), OABs unidas por ';',
+comarca, serventia e área de ação.
+- Distribuições assimétricas: advogados com popularidade Zipf, comarcas com cauda pesada e
+variantes de grafia (caixa, acentos, espaços) em uma fração dos nomes.
+- Gera de 10 mil a 100 milhões de linhas em lotes, gravando cada lote direto no CSV.'''
+
+# --- BIBLIOTECAS NECESSÁRIAS ---
+import os
+import unicodedata
+
+import numpy as np
+import pandas as pd
+
+from tjgo.dados import ANOS_PADRAO
+
+COLUNAS = ['processo', 'data_distribuicao', 'data_baixa', 'is_segredo_justica',
+           'oab', 'comarca', 'serventia', 'nome_area_acao']
+
+TAMANHO_LOTE_PADRAO = 1_000_000
+
+# Segmento J (Justiça Estadual) e TR (TJGO) do número CNJ
+SEGMENTO_JUSTICA, TRIBUNAL = 8, 9
+
+COMARCAS = [
+    'Goiânia', 'Aparecida de Goiânia', 'Anápolis', 'Rio Verde', 'Águas Lindas de Goiás',
+    'Luziânia', 'Valparaíso de Goiás', 'Trindade', 'Formosa', 'Novo Gama', 'Senador Canedo',
+    'Catalão', 'Itumbiara', 'Jataí', 'Planaltina', 'Caldas Novas', 'Santo Antônio do Descoberto',
+    'Goianésia', 'Cidade Ocidental', 'Mineiros', 'Cristalina', 'Inhumas', 'Jaraguá', 'Quirinópolis',
+    'Morrinhos', 'Porangatu', 'Goiatuba', 'Niquelândia', 'Itaberaí', 'Uruaçu', 'Santa Helena de Goiás',
+    'Iporá', 'Pires do Rio', 'Posse', 'Ceres', 'Goiás', 'Pirenópolis', 'Alexânia', 'Bela Vista de Goiás',
+    'São Luís de Montes Belos',
+]
+
+# Área de ação: (peso, probabilidade de sigilo, serventias típicas)
+AREAS = {
+    'Cível': (0.34, 0.08, ['1ª Vara Cível', '2ª Vara Cível', '3ª Vara Cível', 'Vara Cível']),
+    'Criminal': (0.18, 0.30, ['1ª Vara Criminal', '2ª Vara Criminal', 'Vara Criminal']),
+    'Família': (0.16, 0.65, ['Vara de Família', '1ª Vara de Família', '2ª Vara de Família']),
+    'Fazenda Pública': (0.10, 0.04, ['Vara da Fazenda Pública', 'Vara da Fazenda Pública Municipal']),
+    'Infância e Juventude': (0.07, 0.80, ['Vara da Infância e Juventude']),
+    'Juizado Especial': (0.15, 0.03, ['Juizado Especial Cível', 'Juizado Especial Criminal']),
+}
+
+# Grafias observadas para a flag de sigilo (normalizadas por dados.MAPA_SIGILO)
+GRAFIAS_SIGILO = {
+    True: (['True', 'true', '1', 'Sim', 'SIM'], [0.45, 0.2, 0.2, 0.1, 0.05]),
+    False: (['False', 'false', '0', 'Não', 'NAO'], [0.45, 0.2, 0.2, 0.1, 0.05]),
+}
+
+# Sequenciais CNJ (7 dígitos) por origem e origens de cada comarca (código 10·k + 1 a 10·k + 9):
+# passados 10^7 processos no (ano, comarca), a numeração continua na origem seguinte da comarca
+SEQUENCIAIS_ORIGEM = 10**7
+ORIGENS_POR_COMARCA = 9
+
+UFS_OAB = (['GO', 'DF', 'SP', 'MG', 'TO', 'MT', 'BA'], [0.86, 0.05, 0.03, 0.02, 0.02, 0.01, 0.01])
+
+
+# --- NÚMERO CNJ ---
+def digito_verificador_cnj(sequencial, ano, origem):
+    """DV do número CNJ (Res. CNJ 65/2008): 98 - (NNNNNNN AAAA J TR OOOO 00 mod 97), em etapas int64."""
+    sequencial = np.asarray(sequencial, dtype=np.int64)
+    resto = sequencial % 97
+    resto = (resto * 10**7 + np.int64(ano) * 1000 + SEGMENTO_JUSTICA * 100 + TRIBUNAL) % 97
+    resto = (resto * 10**6 + np.asarray(origem, dtype=np.int64) * 100) % 97
+    return 98 - resto
+
+
+def _digitos(valores, largura):
+    """Matriz (n × largura) com os códigos ASCII dos dígitos, com zeros à esquerda."""
+    potencias = 10 ** np.arange(largura - 1, -1, -1, dtype=np.int64)
+    return (np.asarray(valores, dtype=np.int64)[:, None] // potencias % 10 + ord('0')).astype(np.uint8)
+
+
+def formatar_cnj(sequencial, ano, origem):
+    """NNNNNNN-DD.AAAA.8.09.OOOO como Series de strings (montadas byte a byte, sem laço Python)."""
+    sequencial = np.asarray(sequencial, dtype=np.int64)
+    dv = digito_verificador_cnj(sequencial, ano, origem)
+    fixo = np.frombuffer(f'.{ano}.{SEGMENTO_JUSTICA}.{TRIBUNAL:02d}.'.encode('ascii'), dtype=np.uint8)
+    matriz = np.hstack([
+        _digitos(sequencial, 7), np.full((sequencial.size, 1), ord('-'), dtype=np.uint8),
+        _digitos(dv, 2), np.broadcast_to(fixo, (sequencial.size, fixo.size)),
+        _digitos(np.broadcast_to(origem, sequencial.shape), 4),
+    ])
+    return pd.Series(np.ascontiguousarray(matriz).view('S25').ravel().astype(str), dtype=object)
+
+
+# --- VARIANTES DE GRAFIA ---
+def _sem_acento(texto):
+    return ''.join(c for c in unicodedata.normalize('NFKD', texto) if not unicodedata.combining(c))
+
+
+def _variantes(valores):
+    """Matriz (n_valores × 4): canônico, MAIÚSCULAS, MAIÚSCULAS sem acento, espaços extras."""
+    return np.array([[v, v.upper(), _sem_acento(v).upper(), v.replace(' ', '  ') + ' ']
+                     for v in valores], dtype=object)
+
+
+def _escolher_variante(rng, matriz, codigos, taxa):
+    coluna = np.where(rng.random(codigos.size) < taxa, rng.integers(1, matriz.shape[1], codigos.size), 0)
+    return matriz[codigos, coluna]
+
+
+# --- CONTEXTO DA GERAÇÃO ---
+def _pesos_zipf(n, expoente):
+    pesos = 1.0 / np.arange(1, n + 1) ** expoente
+    return pesos / pesos.sum()
+
+
+class _Contexto:
+    """Tabelas fixas da geração: advogados, comarcas, áreas, serventias e seus pesos."""
+
+    def __init__(self, rng, n_advogados):
+        # Advogados: número de inscrição + letra + UF, popularidade Zipf
+        numeros = rng.choice(np.arange(1, max(10 * n_advogados, 100_000)), size=n_advogados, replace=False)
+        letras = rng.choice(list('NAS'), size=n_advogados, p=[0.9, 0.07, 0.03])
+        ufs = rng.choice(UFS_OAB[0], size=n_advogados, p=UFS_OAB[1])
+        self.oabs = (pd.Series(numeros).astype(str) + letras + ' ' + ufs).to_numpy(dtype=object)
+        self.p_advogados = _pesos_zipf(n_advogados, 1.1)
+
+        # Comarcas com cauda pesada e código de origem (OOOO) fixo por comarca
+        self.comarcas = _variantes(COMARCAS)
+        self.p_comarcas = _pesos_zipf(len(COMARCAS), 1.2)
+        self.origens = np.arange(1, len(COMARCAS) + 1, dtype=np.int64) * 10 + 1
+
+        nomes_areas = list(AREAS)
+        self.areas = _variantes(nomes_areas)
+        self.p_areas = np.array([AREAS[a][0] for a in nomes_areas])
+        self.p_areas /= self.p_areas.sum()
+        self.sigilo_area = np.array([AREAS[a][1] for a in nomes_areas])
+
+        serventias = sorted({s for a in nomes_areas for s in AREAS[a][2]})
+        self.serventias = _variantes(serventias)
+        self.serventias_area = [np.array([serventias.index(s) for s in AREAS[a][2]]) for a in nomes_areas]
+
+        # Contadores do sequencial CNJ por ano (um por comarca); o sequencial é embaralhado
+        # por um multiplicador coprimo com 10^7, o que preserva a unicidade
+        self.sequencial = {}
+
+
+def _juntar_oabs(rng, contexto, n, taxa_invalida):
+    """1 a 3 advogados por processo, unidos por ';'; uma fração recebe formatos inválidos."""
+    qtd = rng.choice([1, 2, 3], size=n, p=[0.6, 0.3, 0.1])
+    escolhidos = [rng.choice(contexto.oabs.size, size=n, p=contexto.p_advogados)]
+    oab = pd.Series(contexto.oabs[escolhidos[0]])
+    for k in (2, 3):
+        extra = rng.choice(contexto.oabs.size, size=n, p=contexto.p_advogados)
+        # Sem repetir o mesmo advogado no processo
+        novo = (qtd >= k) & np.all([extra != anterior for anterior in escolhidos], axis=0)
+        oab = oab.where(~novo, oab + ';' + contexto.oabs[extra])
+        escolhidos.append(extra)
+
+    invalidas = rng.random(n) < taxa_invalida
+    if invalidas.any():
+        formatos = np.array(['', 'SEM OAB', '12345', '0N GO', '123-N GO'], dtype=object)
+        oab[invalidas] = formatos[rng.integers(0, formatos.size, int(invalidas.sum()))]
+    return oab.replace('', np.nan)
+
+
+def _gerar_lote(rng, contexto, ano, n, taxa_duplicados, taxa_variantes, taxa_oab_invalida, tendencia):
+    """DataFrame com n linhas distribuídas em `ano`."""
+    comarca = rng.choice(len(COMARCAS), size=n, p=contexto.p_comarcas)
+    area = rng.choice(len(AREAS), size=n, p=contexto.p_areas)
+    serventia = np.empty(n, dtype=np.int64)
+    for i, opcoes in enumerate(contexto.serventias_area):
+        mascara = area == i
+        serventia[mascara] = opcoes[rng.integers(0, opcoes.size, int(mascara.sum()))]
+
+    # Sigilo depende da área, com deriva leve ao longo dos anos
+    sigilo = rng.random(n) < np.clip(contexto.sigilo_area[area] * tendencia, 0, 1)
+
+    # Número CNJ: sequencial por (ano, comarca), continuando entre lotes
+    contadores = contexto.sequencial.setdefault(ano, np.zeros(len(COMARCAS), dtype=np.int64))
+    tamanhos = np.bincount(comarca, minlength=len(COMARCAS))
+    posicao = np.empty(n, dtype=np.int64)
+    posicao[np.argsort(comarca, kind='stable')] = np.arange(n) - np.repeat(np.cumsum(tamanhos) - tamanhos, tamanhos)
+    numero = contadores[comarca] + posicao
+    bloco, numero = np.divmod(numero, SEQUENCIAIS_ORIGEM)
+    if bloco.size and bloco.max() >= ORIGENS_POR_COMARCA:
+        raise ValueError(f"Mais de {ORIGENS_POR_COMARCA * SEQUENCIAIS_ORIGEM:,} processos em {ano} numa "
+                         "comarca: os números CNJ sintéticos se repetiriam")
+    sequencial = (numero * 7_919 + 1_000_003) % SEQUENCIAIS_ORIGEM
+    contadores += tamanhos
+    processo = formatar_cnj(sequencial, ano, contexto.origens[comarca] + bloco)
+
+    inicio_ano = np.datetime64(f'{ano}-01-01')
+    dias = (np.datetime64(f'{ano + 1}-01-01') - inicio_ano).astype(int)
+    distribuicao = inicio_ano + rng.integers(0, dias, n).astype('timedelta64[D]')
+    baixa = distribuicao + rng.exponential(240, n).astype(np.int64).astype('timedelta64[D]')
+    baixado = rng.random(n) < 0.45
+
+    flag = np.empty(n, dtype=object)
+    for valor, (grafias, pesos) in GRAFIAS_SIGILO.items():
+        mascara = sigilo == valor
+        flag[mascara] = rng.choice(grafias, size=int(mascara.sum()), p=pesos)
+
+    df = pd.DataFrame({
+        'processo': processo,
+        'data_distribuicao': np.datetime_as_string(distribuicao, unit='D').astype(object),
+        'data_baixa': np.where(baixado, np.datetime_as_string(baixa, unit='D').astype(object), None),
+        'is_segredo_justica': flag,
+        'oab': _juntar_oabs(rng, contexto, n, taxa_oab_invalida),
+        'comarca': _escolher_variante(rng, contexto.comarcas, comarca, taxa_variantes),
+        'serventia': _escolher_variante(rng, contexto.serventias, serventia, taxa_variantes),
+        'nome_area_acao': _escolher_variante(rng, contexto.areas, area, taxa_variantes),
+    })
+
+    # Linhas repetidas do mesmo processo (ex.: reextrações), com outro conjunto de advogados
+    n_dup = int(n * taxa_duplicados)
+    if n_dup:
+        origem = rng.integers(0, n, n_dup)
+        destino = rng.choice(n, n_dup, replace=False)
+        colunas = ['processo', 'data_distribuicao', 'data_baixa', 'is_segredo_justica',
+                   'comarca', 'serventia', 'nome_area_acao']
+        df.loc[destino, colunas] = df.loc[origem, colunas].to_numpy()
+    return df
+
+
+def gerar_dados(pasta, linhas=100_000, anos=ANOS_PADRAO, semente=42, tamanho_lote=TAMANHO_LOTE_PADRAO,
+                prefixo='processos', n_advogados=None, taxa_duplicados=0.02, taxa_variantes=0.03,
+                taxa_oab_invalida=0.02, crescimento_anual=0.05):
+    """
+    Gera `linhas` registros distribuídos entre os anos (volume crescendo crescimento_anual ao ano)
+    e grava <pasta>/<prefixo>_AAAA.csv, lote a lote. Retorna a lista de arquivos escritos.
+    """
+    if prefixo not in ('processo', 'processos'):
+        raise ValueError("prefixo deve ser 'processo' ou 'processos'")
+    anos = list(anos)
+    rng = np.random.default_rng(semente)
+    contexto = _Contexto(rng, n_advogados or int(np.clip(linhas // 40, 300, 2_000_000)))
+
+    pesos = (1 + crescimento_anual) ** np.arange(len(anos))
+    linhas_ano = np.floor(linhas * pesos / pesos.sum()).astype(np.int64)
+    linhas_ano[-1] += linhas - linhas_ano.sum()
+
+    os.makedirs(pasta, exist_ok=True)
+    arquivos = []
+    for i, (ano, total) in enumerate(zip(anos, linhas_ano)):
+        arquivo = os.path.join(pasta, f'{prefixo}_{ano}.csv')
+        escritas = 0
+        with open(arquivo, 'w', encoding='utf-8', newline='') as f:
+            f.write(','.join(COLUNAS) + '\n')
+            while escritas < total:
+                n = int(min(tamanho_lote, total - escritas))
+                lote = _gerar_lote(rng, contexto, ano, n, taxa_duplicados, taxa_variantes,
+                                   taxa_oab_invalida, tendencia=1 + 0.03 * i)
+                lote.to_csv(f, header=False, index=False, columns=COLUNAS)
+                escritas += n
+        print(f"{arquivo}: {escritas:,} linhas")
+        arquivos.append(arquivo)
+    return arquivos
@@ -0,0 +1,262 @@
+'''Tabela HTML Paginada:
+- Alternativa ao go.Table para tabelas grandes (todas as serventias × comarcas, todas as OABs):
+os dados vão uma única vez no HTML, em JSON colunar compacto, e a tabela é montada no navegador
+com paginação, ordenação por coluna, filtro de texto e rolagem virtual (só as linhas visíveis
+viram elementos DOM). Sem dependências externas: o HTML abre offline.
+- Codificação por coluna: números como inteiros (percentuais formatados '12,34%' voltam a ser
+centésimos) e textos repetidos como dicionário (valores distintos + códigos). O JSON vai
+comprimido (gzip + base64) e é descomprimido pelo navegador (DecompressionStream).
+- TabelaHTML imita a parte da interface das figuras Plotly usada pelas análises (show,
+write_html, to_html, to_json), então pode ocupar o lugar de uma figura nos resultados.'''
+
+# --- BIBLIOTECAS NECESSÁRIAS ---
+import base64
+import gzip
+import html
+import json
+import os
+import re
+import tempfile
+import webbrowser
+
+import numpy as np
+import pandas as pd
+
+# Acima deste número de linhas, graficos.figura_tabela devolve uma TabelaHTML
+LIMITE_LINHAS_PLOTLY = 1_000
+
+TAMANHOS_PAGINA = [100, 500, 5_000, 0]  # 0 = todas (rolagem virtual)
+TAMANHO_PAGINA_PADRAO = 500
+
+_PERCENTUAL = re.compile(r'^[+-]?\d+(,\d+)?%$')
+
+
+# --- CODIFICAÇÃO ---
+def codificar_coluna(serie):
+    """
+    Coluna em JSON compacto: {'tipo': 'int'|'num'|'pct'|'pct_sinal'|'texto', ...}.
+    Percentuais no formato de agregacao.fmt_pct/fmt_pct_sinal viram centésimos inteiros.
+    """
+    if pd.api.types.is_bool_dtype(serie):
+        serie = serie.astype(str)
+    if pd.api.types.is_integer_dtype(serie):
+        return {'tipo': 'int', 'valores': serie.astype(np.int64).tolist()}
+    if pd.api.types.is_numeric_dtype(serie):
+        valores = serie.astype(float).round(4)
+        return {'tipo': 'num', 'valores': [None if np.isnan(v) else v for v in valores.tolist()]}
+
+    codigos, distintos = pd.factorize(serie.astype(str), sort=True)
+    distintos = list(distintos)
+    if distintos and all(_PERCENTUAL.match(v) for v in distintos):
+        centesimos = np.array([round(float(v[:-1].replace(',', '.')) * 100) for v in distintos], dtype=np.int64)
+        tipo = 'pct_sinal' if any(v[0] in '+-' for v in distintos) else 'pct'
+        return {'tipo': tipo, 'valores': centesimos[codigos].tolist()}
+    return {'tipo': 'texto', 'distintos': distintos, 'codigos': codigos.tolist()}
+
+
+def codificar_tabela(tabela, colunas, titulo=''):
+    """Payload da página: título, cabeçalhos e colunas codificadas."""
+    return {
+        'titulo': titulo,
+        'linhas': len(tabela),
+        'cabecalhos': [cabecalho for _, cabecalho in colunas],
+        'colunas': [codificar_coluna(tabela[coluna]) for coluna, _ in colunas],
+        'tamanhos_pagina': TAMANHOS_PAGINA,
+        'tamanho_pagina': TAMANHO_PAGINA_PADRAO,
+    }
+
+
+# --- PÁGINA ---
+_MODELO = '''<!DOCTYPE html>
+<html lang="pt-BR">
+<head>
+<meta charset="utf-8">
+<title>__TITULO_TEXTO__</title>
+<style>
+body { font-family: Arial, sans-serif; margin: 16px; color: #222; }
+h2 { text-align: center; font-weight: normal; }
+#controles { display: flex; gap: 12px; align-items: center; margin-bottom: 8px; flex-wrap: wrap; }
+#rolagem { height: 70vh; overflow: auto; border: 1px solid darkslategray; position: relative; }
+table { border-collapse: collapse; font-size: 11px; width: max-content; min-width: 100%; }
+th { position: sticky; top: 0; background: #203864; color: white; font-size: 12px; cursor: pointer;
+     padding: 4px 6px; border: 1px solid darkslategray; text-align: left; z-index: 1; }
+td { padding: 0 6px; height: 22px; border: 1px solid darkslategray; white-space: nowrap; }
+tr.par td { background: lavender; }
+tr.espaco td { border: none; padding: 0; background: white; }
+</style>
+</head>
+<body>
+<h2>__TITULO__</h2>
+<div id="controles">
+  <input id="filtro" type="search" placeholder="Filtrar texto..." size="30">
+  <label>Linhas por página <select id="tamanho"></select></label>
+  <button id="anterior">&laquo;</button><span id="pagina"></span><button id="proxima">&raquo;</button>
+  <span id="contagem"></span>
+</div>
+<div id="rolagem"><table><thead><tr id="cabecalho"></tr></thead><tbody id="corpo"></tbody></table></div>
+<script id="dados" type="application/octet-stream">__DADOS__</script>
+<script>
+(async function () {
+  // JSON comprimido (gzip + base64) -> objeto
+  const bytes = Uint8Array.from(atob(document.getElementById('dados').textContent.trim()), c => c.charCodeAt(0));
+  const fluxo = new Blob([bytes]).stream().pipeThrough(new DecompressionStream('gzip'));
+  const P = JSON.parse(await new Response(fluxo).text());
+  const N = P.linhas, ALTURA = 22, FOLGA = 20;
+  const cols = P.colunas;
+
+  // Ordem alfabética dos dicionários (uma vez): ordenar textos = ordenar códigos por posto
+  cols.forEach(c => {
+    if (c.tipo !== 'texto') return;
+    const ordem = c.distintos.map((_, i) => i).sort((a, b) => c.distintos[a].localeCompare(c.distintos[b], 'pt-BR'));
+    c.posto = new Int32Array(c.distintos.length);
+    ordem.forEach((i, p) => { c.posto[i] = p; });
+    c.minusculos = c.distintos.map(v => v.toLowerCase());
+  });
+
+  const fmt = (c, i) => {
+    if (c.tipo === 'texto') { return c.codigos[i] < 0 ? '' : c.distintos[c.codigos[i]]; }
+    const v = c.valores[i];
+    if (v === null) return '';
+    if (c.tipo === 'pct' || c.tipo === 'pct_sinal') {
+      const s = (v / 100).toFixed(2).replace('.', ',') + '%';
+      return c.tipo === 'pct_sinal' && v >= 0 ? '+' + s : s;
+    }
+    return c.tipo === 'num' ? String(v).replace('.', ',') : String(v);
+  };
+  const chave = (c, i) => c.tipo === 'texto' ? c.posto[c.codigos[i]] : (c.valores[i] === null ? -Infinity : c.valores[i]);
+
+  let visao = Int32Array.from({length: N}, (_, i) => i);
+  let ordenacao = null, pagina = 0;
+  let tamanho = P.tamanho_pagina;
+
+  const cab = document.getElementById('cabecalho');
+  P.cabecalhos.forEach((h, j) => {
+    const th = document.createElement('th');
+    th.textContent = h;
+    th.onclick = () => ordenar(j);
+    cab.appendChild(th);
+  });
+  const sel = document.getElementById('tamanho');
+  P.tamanhos_pagina.forEach(t => {
+    const o = document.createElement('option');
+    o.value = t; o.textContent = t === 0 ? 'todas' : t;
+    if (t === tamanho) o.selected = true;
+    sel.appendChild(o);
+  });
+
+  function ordenar(j) {
+    const desc = ordenacao && ordenacao.coluna === j && !ordenacao.desc;
+    ordenacao = {coluna: j, desc: desc};
+    const c = cols[j], s = desc ? -1 : 1;
+    visao.sort((a, b) => s * (chave(c, a) - chave(c, b)) || a - b);
+    Array.from(cab.children).forEach((th, k) => {
+      th.textContent = P.cabecalhos[k] + (k === j ? (desc ? ' \\u25BC' : ' \\u25B2') : '');
+    });
+    pagina = 0; desenhar(true);
+  }
+
+  function filtrar(texto) {
+    texto = texto.trim().toLowerCase();
+    let linhas = Int32Array.from({length: N}, (_, i) => i);
+    if (texto) {
+      // Casa os dicionários uma vez; a linha passa se algum código de texto casou
+      const casam = cols.filter(c => c.tipo === 'texto').map(c => ({c: c, ok: c.minusculos.map(v => v.includes(texto))}));
+      linhas = linhas.filter(i => casam.some(m => m.c.codigos[i] >= 0 && m.ok[m.c.codigos[i]]));
+    }
+    visao = linhas;
+    if (ordenacao) { const o = ordenacao; ordenacao = {coluna: o.coluna, desc: !o.desc}; ordenar(o.coluna); }
+    else { pagina = 0; desenhar(true); }
+  }
+
+  const rolagem = document.getElementById('rolagem'), corpo = document.getElementById('corpo');
+  function intervaloPagina() {
+    if (!tamanho) return [0, visao.length];
+    const inicio = pagina * tamanho;
+    return [inicio, Math.min(inicio + tamanho, visao.length)];
+  }
+  function espaco(altura) {
+    const tr = document.createElement('tr'); tr.className = 'espaco';
+    const td = document.createElement('td'); td.colSpan = cols.length; td.style.height = altura + 'px';
+    tr.appendChild(td); return tr;
+  }
+
+  // Rolagem virtual: só as linhas visíveis da página (mais uma folga) são criadas
+  function desenhar(topo) {
+    if (topo) rolagem.scrollTop = 0;
+    const [inicio, fim] = intervaloPagina(), total = fim - inicio;
+    const primeira = Math.max(0, Math.floor(rolagem.scrollTop / ALTURA) - FOLGA);
+    const ultima = Math.min(total, Math.ceil((rolagem.scrollTop + rolagem.clientHeight) / ALTURA) + FOLGA);
+    const frag = document.createDocumentFragment();
+    frag.appendChild(espaco(primeira * ALTURA));
+    for (let k = primeira; k < ultima; k++) {
+      const i = visao[inicio + k], tr = document.createElement('tr');
+      if ((inicio + k) % 2 === 0) tr.className = 'par';
+      cols.forEach(c => { const td = document.createElement('td'); td.textContent = fmt(c, i); tr.appendChild(td); });
+      frag.appendChild(tr);
+    }
+    frag.appendChild(espaco((total - ultima) * ALTURA));
+    corpo.replaceChildren(frag);
+    const paginas = tamanho ? Math.max(1, Math.ceil(visao.length / tamanho)) : 1;
+    document.getElementById('pagina').textContent = ' ' + (pagina + 1) + ' / ' + paginas + ' ';
+    document.getElementById('contagem').textContent = visao.length.toLocaleString('pt-BR') + ' de ' + N.toLocaleString('pt-BR') + ' linhas';
+  }
+
+  let pendente = false;
+  rolagem.addEventListener('scroll', () => {
+    if (pendente) return;
+    pendente = true;
+    requestAnimationFrame(() => { pendente = false; desenhar(false); });
+  });
+  let espera = null;
+  document.getElementById('filtro').addEventListener('input', e => {
+    clearTimeout(espera); espera = setTimeout(() => filtrar(e.target.value), 200);
+  });
+  sel.onchange = () => { tamanho = Number(sel.value); pagina = 0; desenhar(true); };
+  document.getElementById('anterior').onclick = () => { if (pagina > 0) { pagina--; desenhar(true); } };
+  document.getElementById('proxima').onclick = () => {
+    if (tamanho && (pagina + 1) * tamanho < visao.length) { pagina++; desenhar(true); }
+  };
+  desenhar(true);
+})();
+</script>
+</body>
+</html>
+'''
+
+
+def _json_compacto(objeto):
+    return json.dumps(objeto, ensure_ascii=False, separators=(',', ':'))
+
+
+class TabelaHTML:
+    """Tabela paginada em um HTML autocontido (dados em JSON colunar, renderização no navegador)."""
+
+    def __init__(self, tabela, colunas, titulo=''):
+        self.payload = codificar_tabela(tabela, colunas, titulo)
+
+    def __len__(self):
+        return self.payload['linhas']
+
+    def to_json(self):
+        return _json_compacto(self.payload)
+
+    def to_html(self, **_):
+        titulo = self.payload['titulo']
+        dados = base64.b64encode(gzip.compress(self.to_json().encode('utf-8'), compresslevel=6)).decode('ascii')
+        return (_MODELO.replace('__TITULO_TEXTO__', html.escape(re.sub(r'<[^>]+>', ' ', titulo).strip()))
+                       .replace('__TITULO__', titulo)
+                       .replace('__DADOS__', dados))
+
+    def write_html(self, caminho, **_):
+        """Grava o HTML (os argumentos de Figure.write_html, como include_plotlyjs, são ignorados)."""
+        with open(caminho, 'w', encoding='utf-8') as f:
+            f.write(self.to_html())
+        return caminho
+
+    def show(self, **_):
+        """Grava em um arquivo temporário e abre no navegador, como fig.show()."""
+        fd, caminho = tempfile.mkstemp(prefix='tjgo_tabela_', suffix='.html')
+        os.close(fd)
+        self.write_html(caminho)
+        webbrowser.open('file://' + os.path.abspath(caminho))
+        return caminho
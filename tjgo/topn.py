@@ -0,0 +1,74 @@
+'''Top-N com Linha "Outros":
+- Tabelas por entidade com milhares de linhas (serventias × comarcas, áreas × comarcas) ficam
+com as N maiores entidades por uma métrica, escolhidas com np.argpartition (seleção em tempo
+linear, só as N escolhidas são ordenadas), e uma linha "Outros" com o restante.
+- A linha "Outros" é exata: as contagens vêm da união dos processos das entidades restantes
+(processos distintos recontados no recorte df_base), não da soma das linhas, e as proporções e
+variações são recalculadas a partir delas como para qualquer entidade. Com bootstrap, os ICs da
+linha "Outros" também vêm da reamostragem dos processos dessa união.'''
+
+# --- BIBLIOTECAS NECESSÁRIAS ---
+import numpy as np
+import pandas as pd
+
+from tjgo.agregacao import montar_tabela_final, montar_tabela_proporcoes
+from tjgo.cnj import coluna_processo
+from tjgo.instrumentacao import etapa
+
+TOP_N_PADRAO = 20
+METRICA_PADRAO = 'total_processos'
+METRICAS = ['total_processos', 'total_sigilosos', 'proporcao_media_sigilosos', 'variacao_total_sigilosos']
+ROTULO_OUTROS = 'Outros'
+
+
+def indices_top(valores, n, maiores=True):
+    """
+    Posições dos n maiores (ou menores) valores, em ordem, com np.argpartition: O(len) para
+    separar os n primeiros e O(n log n) para ordená-los. NaN fica por último.
+    """
+    valores = np.asarray(valores, dtype=float)
+    chave = np.where(np.isnan(valores), np.inf, -valores if maiores else valores)
+    if n >= len(chave):
+        return np.argsort(chave, kind='stable')
+    primeiros = np.argpartition(chave, n - 1)[:n]
+    return primeiros[np.argsort(chave[primeiros], kind='stable')]
+
+
+def linha_outros(df_base, chaves, anos, mascara, rotulo=ROTULO_OUTROS, bootstrap=0):
+    """
+    Linha da tabela de proporções das linhas de df_base em mascara, como uma única entidade.
+    bootstrap > 0: com os ICs bootstrap dessa entidade, como em agregacao.analisar_proporcoes.
+    """
+    processo = coluna_processo(df_base)
+    resto = (df_base.loc[mascara, [processo, 'ano_distribuicao', 'is_segredo_justica']]
+                    .assign(**{chave: rotulo for chave in chaves}))
+    outros = montar_tabela_proporcoes(montar_tabela_final(resto, chaves, anos), chaves, anos)
+    if bootstrap:
+        from tjgo.estatisticas import bootstrap_metricas
+        outros = outros.merge(bootstrap_metricas(resto, chaves, anos=anos, n_replicas=bootstrap), on=chaves, how='left')
+    return outros
+
+
+def top_n_com_outros(tabela_proporcoes, df_base, chaves, anos, n=TOP_N_PADRAO, metrica=METRICA_PADRAO,
+                     bootstrap=0):
+    """
+    (tabela com as n entidades de maior metrica, em ordem, e a linha "Outros (k)" no fim;
+    k = entidades agrupadas). Com até n entidades, a tabela volta inteira e k = 0.
+    bootstrap: réplicas usadas nos ICs de tabela_proporcoes, refeitas para a linha "Outros".
+    """
+    chaves = list(chaves)
+    if len(tabela_proporcoes) <= n:
+        return tabela_proporcoes, 0
+
+    with etapa(f"top_n[{','.join(chaves)}]", tabela_proporcoes) as e:
+        top = tabela_proporcoes.iloc[indices_top(tabela_proporcoes[metrica], n)]
+        k = len(tabela_proporcoes) - n
+
+        # Linhas de df_base das entidades fora do top (pelas chaves completas)
+        entidades_top = pd.MultiIndex.from_frame(top[chaves].astype(str))
+        entidades_base = pd.MultiIndex.from_arrays([df_base[chave].astype(str) for chave in chaves])
+        mascara = ~entidades_base.isin(entidades_top)
+
+        outros = linha_outros(df_base, chaves, anos, mascara, f'{ROTULO_OUTROS} ({k})', bootstrap)
+        tabela = pd.concat([top, outros], ignore_index=True)
+        return e.saida(tabela), k